@@ -4,6 +4,12 @@
 import requests
 import json
 
+from api_clients import http_client, response_cache
+
+# 미세먼지 예보 발표 시각 (KST 05, 11, 17, 23시) 및 반영 지연 시간
+AIR_FORECAST_ISSUE_HOURS = [5, 11, 17, 23]
+AIR_FORECAST_RELEASE_DELAY_MINUTES = 15
+
 def get_air_forecast(api_key, search_date, inform_code="PM10"):
     """
     한국환경공단 에어코리아의 '미세먼지 예보통보 조회' API를 호출합니다.
@@ -27,13 +33,23 @@ def get_air_forecast(api_key, search_date, inform_code="PM10"):
         "informCode": inform_code
     }
 
+    # 같은 날짜의 예보는 다음 발표 시각 전까지 바뀌지 않습니다.
+    cached = response_cache.get(api_url, params)
+    if cached is not None:
+        print(f"에어코리아 {inform_code} 예보 캐시 사용")
+        return json.loads(cached)
+
     try:
-        response = requests.get(api_url, params=params, timeout=10)
+        response = http_client.get(api_url, params=params)
         response.raise_for_status()
 
         if response.status_code == 200 and response.text.strip():
             print(f"에어코리아 {inform_code} 예보 API 호출 성공")
-            return response.json()
+            data = response.json()
+            if data.get('response', {}).get('body', {}).get('items'):
+                expires_at = response_cache.next_issuance(AIR_FORECAST_ISSUE_HOURS, AIR_FORECAST_RELEASE_DELAY_MINUTES)
+                response_cache.put(api_url, params, response.text, expires_at)
+            return data
         else:
             print(f"❌ 에어코리아 {inform_code} 예보 API 응답 오류 (상태 코드: {response.status_code})")
             return None
@@ -0,0 +1,102 @@
+# api_clients/fixture_store.py
+# 외부 API 응답을 픽스처 파일로 기록하고, 대역 서버(api_stub_server.py)가 다시 찾아 쓰도록 색인합니다.
+# 인증 정보(serviceKey, access_token 등)는 키 계산과 파일 내용에서 모두 제외합니다.
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+_SECRET_PARAMS = {"servicekey", "access_token", "client_id"}
+
+_write_lock = threading.Lock()
+
+
+def normalize_params(params):
+    """인증 정보를 제외하고 값들을 문자열로 바꾼 뒤 정렬합니다."""
+    return sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if str(k).lower() not in _SECRET_PARAMS
+    )
+
+
+def fixture_key(method, host, path, params):
+    raw = json.dumps([method.upper(), host, path, normalize_params(params)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _fixture_dir(root, host, path):
+    # Windows에서도 사용할 수 있도록 포트 구분자(:)를 디렉토리 이름에서 제외합니다.
+    return Path(root) / host.replace(":", "_") / (path.strip("/").replace("/", "_") or "_root")
+
+
+def record(root, method, url, params, response, body=None):
+    """
+    실제 응답 하나를 픽스처 파일로 저장합니다.
+    같은 요청(메서드, 호스트, 경로, 인자)은 같은 파일을 덮어씁니다.
+    body를 주면 response.text 대신 그 본문을 기록합니다 (스트리밍 응답에서 이미 읽은 본문).
+    """
+    parts = urlsplit(url)
+    fixture = {
+        "method": method.upper(),
+        "host": parts.netloc,
+        "path": parts.path,
+        "params": normalize_params(params),
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type", "application/json"),
+        "body": response.text if body is None else body
+    }
+    key = fixture_key(method, parts.netloc, parts.path, params)
+    fixture_dir = _fixture_dir(root, parts.netloc, parts.path)
+    path = fixture_dir / f"{fixture['method'].lower()}_{key}.json"
+    try:
+        with _write_lock:
+            fixture_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(fixture, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 픽스처 기록 실패 ({parts.netloc}{parts.path}): {e}")
+
+
+def load_fixtures(root):
+    """
+    픽스처 디렉토리 전체를 읽어 (메서드, 호스트, 경로)별 목록으로 색인합니다.
+
+    Returns:
+        dict: {(method, host, path): [fixture, ...]}
+    """
+    index = {}
+    root = Path(root)
+    if not root.exists():
+        return index
+
+    for fixture_path in sorted(root.rglob("*.json")):
+        try:
+            with open(fixture_path, "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ 픽스처 로드 실패: {fixture_path} ({e})")
+            continue
+        fixture["params"] = [tuple(p) for p in fixture.get("params", [])]
+        index.setdefault((fixture["method"], fixture["host"], fixture["path"]), []).append(fixture)
+    return index
+
+
+def find_fixture(index, method, host, path, params):
+    """
+    요청과 인자까지 일치하는 픽스처를 우선 찾고, 없으면 같은 엔드포인트의 첫 픽스처를 반환합니다.
+    (날짜 인자만 다른 재실행도 재생할 수 있도록 하기 위함)
+    """
+    candidates = index.get((method.upper(), host, path))
+    if not candidates:
+        return None
+
+    wanted = normalize_params(params)
+    for fixture in candidates:
+        if fixture["params"] == wanted:
+            return fixture
+    return candidates[0]
@@ -0,0 +1,165 @@
+# api_clients/http_client.py
+# 모든 API 클라이언트가 공유하는 HTTP 세션 계층입니다.
+# 호스트마다 keep-alive 연결 풀을 가진 requests.Session을 하나씩 재사용하여
+# 매 호출마다 TCP/TLS 연결을 새로 맺지 않도록 하고, 호출별 지연 시간을 기록합니다.
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_clients import fixture_store
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT_SECONDS, API_STUB_URL, API_RECORD_DIR
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# 호출별 지연 시간 기록: {"method", "host", "path", "status", "elapsed"} 딕셔너리의 리스트
+_latency_records = []
+_latency_lock = threading.Lock()
+
+
+def _session_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url):
+    """URL의 호스트에 해당하는 공유 세션을 반환합니다 (없으면 생성)."""
+    key = _session_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def resolve_url(url):
+    """
+    대역 서버가 설정되어 있으면 요청 URL을 대역 서버 주소로 바꿉니다.
+    원래 호스트는 경로의 첫 부분으로 옮겨 대역 서버가 어느 API인지 구분할 수 있게 합니다.
+    예: http://apis.data.go.kr/a/b -> http://127.0.0.1:8089/apis.data.go.kr/a/b
+    """
+    if not API_STUB_URL:
+        return url
+    parts = urlsplit(url)
+    resolved = f"{API_STUB_URL.rstrip('/')}/{parts.netloc}{parts.path}"
+    return f"{resolved}?{parts.query}" if parts.query else resolved
+
+
+def _record_when_consumed(response, method, url, params):
+    """
+    stream=True 응답은 호출하는 쪽이 iter_content()로 본문을 읽는 동안 받은 조각을 함께 모아 두었다가,
+    끝까지 읽었을 때 픽스처로 기록합니다. 기록 때문에 본문을 미리 전부 읽지 않으므로 기록 모드에서도
+    스트리밍 경로가 그대로 실행됩니다. (도중에 실패하여 끝까지 읽지 못한 응답은 기록하지 않습니다.)
+    """
+    iter_content = response.iter_content
+
+    def tee(*args, **kwargs):
+        chunks = []
+        for chunk in iter_content(*args, **kwargs):
+            chunks.append(chunk.encode(response.encoding or "utf-8") if isinstance(chunk, str) else chunk)
+            yield chunk
+        body = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+        fixture_store.record(API_RECORD_DIR, method, url, params, response, body)
+
+    response.iter_content = tee
+
+
+def request(method, url, timeout=None, **kwargs):
+    """
+    공유 세션으로 HTTP 요청을 보내고 지연 시간을 기록합니다.
+    예외 처리는 기존과 동일하게 호출하는 쪽(requests.exceptions.*)에 맡깁니다.
+    """
+    if timeout is None:
+        timeout = HTTP_TIMEOUT_SECONDS
+
+    target_url = resolve_url(url)
+    session = get_session(target_url)
+    parts = urlsplit(url)
+    started = time.perf_counter()
+    status = None
+    try:
+        response = session.request(method, target_url, timeout=timeout, **kwargs)
+        status = response.status_code
+        if API_RECORD_DIR and not API_STUB_URL:
+            if kwargs.get("stream"):
+                _record_when_consumed(response, method, url, kwargs.get("params"))
+            else:
+                # 스트리밍이 아니면 requests가 이미 본문을 모두 읽었으므로 바로 기록합니다.
+                fixture_store.record(API_RECORD_DIR, method, url, kwargs.get("params"), response)
+        return response
+    finally:
+        with _latency_lock:
+            _latency_records.append({
+                "method": method.upper(),
+                "host": parts.netloc,
+                "path": parts.path,
+                "status": status,
+                "elapsed": time.perf_counter() - started
+            })
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    return request("GET", url, params=params, timeout=timeout, **kwargs)
+
+
+def post(url, params=None, data=None, timeout=None, **kwargs):
+    return request("POST", url, params=params, data=data, timeout=timeout, **kwargs)
+
+
+def get_latency_records():
+    """기록된 호출별 지연 시간 목록의 사본을 반환합니다."""
+    with _latency_lock:
+        return list(_latency_records)
+
+
+def get_latency_summary():
+    """
+    엔드포인트(호스트 + 경로)별 호출 횟수, 평균/최대 지연 시간을 집계합니다.
+
+    Returns:
+        dict: {"host/path": {"count", "errors", "avg", "max"}} 형태의 딕셔너리
+    """
+    summary = {}
+    for record in get_latency_records():
+        endpoint = f"{record['host']}{record['path']}"
+        stats = summary.setdefault(endpoint, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += record["elapsed"]
+        stats["max"] = max(stats["max"], record["elapsed"])
+        if record["status"] is None or record["status"] >= 400:
+            stats["errors"] += 1
+
+    for stats in summary.values():
+        stats["avg"] = stats.pop("total") / stats["count"]
+    return summary
+
+
+def print_latency_summary():
+    """엔드포인트별 지연 시간 요약을 출력합니다."""
+    summary = get_latency_summary()
+    if not summary:
+        return
+    print(" -> API 호출 지연 시간:")
+    for endpoint, stats in sorted(summary.items()):
+        print(f"    - {endpoint}: {stats['count']}회, 평균 {stats['avg']:.3f}초, 최대 {stats['max']:.3f}초, 오류 {stats['errors']}회")
+
+
+def reset_latency_records():
+    with _latency_lock:
+        _latency_records.clear()
+
+
+def close_sessions():
+    """열려 있는 모든 세션과 연결 풀을 닫습니다."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
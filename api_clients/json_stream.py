@@ -0,0 +1,95 @@
+# api_clients/json_stream.py
+# 큰 JSON 응답을 조각(chunk) 단위로 읽으면서, 지정한 배열의 원소를 하나씩 디코딩하는 도구입니다.
+# 필요한 원소만 남기므로 응답 전체를 딕셔너리 목록으로 만들지 않아도 됩니다.
+
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r,"
+
+
+def decode_filtered_array(chunks, array_key, keep, transform=None):
+    """
+    JSON 응답을 조각 단위로 디코딩하면서 array_key 배열의 원소 중 keep(item)이 참인 것만 남깁니다.
+
+    배열 밖의 부분(헤더, totalCount 등)은 배열을 빈 리스트로 둔 채 그대로 디코딩합니다.
+    응답에 array_key 배열이 없으면(오류 응답 등) 전체를 일반 JSON으로 디코딩합니다.
+
+    Args:
+        chunks (iterable): bytes 또는 str 조각들 (예: response.iter_content())
+        array_key (str): 원소를 걸러낼 배열의 키 (예: "item")
+        keep (callable): 원소(dict)를 받아 남길지 여부를 반환하는 함수
+        transform (callable or None): 남길 원소를 저장 전에 변환하는 함수
+
+    Returns:
+        tuple: (배열이 빈 리스트로 채워진 문서, 남긴 원소 리스트, 전체 원소 수)
+
+    Raises:
+        json.JSONDecodeError: 응답이 JSON이 아니거나 중간에 끊긴 경우
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    marker = f'"{array_key}"'
+
+    prefix = None  # 배열 여는 괄호([)까지의 문서 앞부분
+    buffer = ""
+    in_array = False
+    kept = []
+    total = 0
+
+    def feed(text):
+        nonlocal prefix, buffer, in_array, total
+        buffer += text
+
+        if prefix is None:
+            marker_at = buffer.find(marker)
+            if marker_at < 0:
+                return
+            bracket_at = buffer.find("[", marker_at + len(marker))
+            if bracket_at < 0:
+                return
+            prefix = buffer[:bracket_at + 1]
+            buffer = buffer[bracket_at + 1:]
+            in_array = True
+
+        if not in_array:
+            return
+
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                in_array = False
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 원소가 아직 다 도착하지 않았으므로 다음 조각을 기다립니다.
+                break
+            total += 1
+            if keep(item):
+                kept.append(transform(item) if transform else item)
+            pos = end
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        feed(text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+    feed(text_decoder.decode(b"", final=True))
+
+    if prefix is None:
+        return json.loads(buffer), kept, total
+    if in_array:
+        raise json.JSONDecodeError(f"'{array_key}' 배열이 끝나기 전에 응답이 끊겼습니다", buffer, len(buffer))
+    # buffer는 배열의 닫는 괄호(])부터 문서 끝까지이므로, 앞부분과 이으면 배열이 빈 문서가 됩니다.
+    return json.loads(prefix + buffer), kept, total
+
+
+def iter_text_chunks(text, chunk_size):
+    """캐시된 본문(str)을 스트리밍 응답과 같은 방식으로 처리할 수 있도록 조각으로 나눕니다."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
@@ -5,6 +5,11 @@ import requests
 import json
 import xml.etree.ElementTree as ET
 
+from api_clients import http_client, response_cache
+
+# 생활기상지수(자외선) 발표 시각 (KST 06, 18시)
+UV_INDEX_ISSUE_HOURS = [6, 18]
+
 def get_uv_index(api_key, area_no, target_date):
     """자외선 지수 API를 호출합니다."""
     uv_url = "http://apis.data.go.kr/1360000/LivingWthrIdxServiceV4/getUVIdxV4"
@@ -14,12 +19,20 @@ def get_uv_index(api_key, area_no, target_date):
         "time": f"{target_date}06",
         "dataType": "json"
     }
+    cached = response_cache.get(uv_url, params)
+    if cached is not None:
+        print("자외선 지수 캐시 사용")
+        return json.loads(cached)
+
     try:
-        response = requests.get(uv_url, params=params, timeout=10)
+        response = http_client.get(uv_url, params=params)
         response.raise_for_status()
         if response.status_code == 200 and response.text.strip():
             print("자외선 지수 API 호출 성공")
-            return response.json()
+            data = response.json()
+            if data.get('response', {}).get('body'):
+                response_cache.put(uv_url, params, response.text, response_cache.next_issuance(UV_INDEX_ISSUE_HOURS))
+            return data
     except requests.exceptions.RequestException as e:
         print(f"❌ 자외선 지수 API 오류: {e}")
     except json.JSONDecodeError as e:
@@ -32,12 +45,20 @@ def get_astronomical_info(api_key, location, target_date):
     """일출/일몰, 월출/월몰 정보를 XML 형식으로 가져옵니다."""
     url = "http://apis.data.go.kr/B090041/openapi/service/RiseSetInfoService/getAreaRiseSetInfo"
     params = {"serviceKey": api_key, "location": location, "locdate": target_date}
+    # 특정 날짜의 출몰 시각은 바뀌지 않으므로 만료 없이 캐시합니다.
+    cached = response_cache.get(url, params)
+    if cached is not None:
+        print("일출/일몰 캐시 사용")
+        return cached
+
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         if response.status_code == 200 and response.text.strip():
             print("일출/일몰 API 호출 성공")
             print(f"[DEBUG] KASI 일출/일몰 API 응답: {response.text}")
+            if "<item>" in response.text:
+                response_cache.put(url, params, response.text)
             return response.text
     except requests.exceptions.RequestException as e:
         print(f"❌ 일출/일몰 API 오류: {e}")
@@ -52,11 +73,18 @@ def get_moon_phase_info(api_key, target_date):
         "solMonth": target_date[4:6],
         "solDay": target_date[6:]
     }
+    cached = response_cache.get(url, params)
+    if cached is not None:
+        print("월령 캐시 사용")
+        return cached
+
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         if response.status_code == 200 and response.text.strip():
             print("월령 API 호출 성공")
+            if "<item>" in response.text:
+                response_cache.put(url, params, response.text)
             return response.text
     except requests.exceptions.RequestException as e:
         print(f"❌ 월령 API 오류: {e}")
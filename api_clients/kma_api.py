@@ -2,8 +2,53 @@ import requests
 import json
 import datetime
 
-def get_weather_forecast(api_key, base_date, base_time, nx, ny):
-    """기상청 단기예보 API를 호출하여 원시 데이터를 반환합니다."""
+from api_clients import http_client, json_stream, response_cache
+
+# 단기예보 발표 시각(base_time)과 API 반영 지연 시간
+# 발표 후 약 15분 뒤부터 조회 가능하므로 여유를 두어 20분으로 잡습니다.
+VILAGE_FCST_BASE_HOURS = [2, 5, 8, 11, 14, 17, 20, 23]
+VILAGE_FCST_RELEASE_DELAY_MINUTES = 20
+
+# 기상특보 현황은 수시로 바뀌므로 짧게만 캐시합니다.
+WARNINGS_CACHE_SECONDS = 10 * 60
+
+# 단기예보 중 data_processor.process_weather_data가 사용하는 항목
+# (UUU, VVV, VEC, WAV, SNO 등은 받기만 하고 쓰지 않으므로 디코딩 단계에서 버립니다.)
+VILAGE_FCST_CATEGORIES = frozenset({"TMP", "TMX", "TMN", "POP", "PCP", "PTY", "REH", "WSD", "SKY"})
+VILAGE_FCST_ITEM_FIELDS = ("category", "fcstDate", "fcstTime", "fcstValue")
+VILAGE_FCST_CHUNK_SIZE = 16 * 1024
+
+
+def decode_forecast(chunks, target_date=None, categories=VILAGE_FCST_CATEGORIES):
+    """
+    단기예보 응답을 조각 단위로 디코딩하면서 target_date의 사용 항목만 남깁니다.
+    남긴 항목은 category, fcstDate, fcstTime, fcstValue만 가진 간결한 딕셔너리이며,
+    응답의 나머지 구조(header, body, totalCount 등)는 원래 응답과 같습니다.
+
+    Args:
+        chunks (iterable): 응답 본문 조각 (bytes 또는 str)
+        target_date (str or None): 남길 예보 날짜 (YYYYMMDD). None이면 모든 날짜를 남깁니다.
+        categories (set): 남길 예보 항목 코드
+    """
+    def keep(item):
+        return item.get("category") in categories and (target_date is None or item.get("fcstDate") == target_date)
+
+    def compact(item):
+        return {field: item.get(field) for field in VILAGE_FCST_ITEM_FIELDS}
+
+    data, items, total = json_stream.decode_filtered_array(chunks, "item", keep, compact)
+    body = data.get('response', {}).get('body') if isinstance(data, dict) else None
+    if body:
+        body.setdefault('items', {})['item'] = items
+        print(f" -> 단기예보 {total}개 항목 중 {len(items)}개 사용 (대상 날짜: {target_date or '전체'})")
+    return data
+
+
+def get_weather_forecast(api_key, base_date, base_time, nx, ny, target_date=None):
+    """
+    기상청 단기예보 API를 호출하여 원시 데이터를 반환합니다.
+    target_date를 지정하면 응답을 받는 동안 조각 단위로 디코딩하여 해당 날짜의 사용 항목만 남깁니다.
+    """
     weather_url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
     params = {
         "serviceKey": api_key,
@@ -16,20 +61,62 @@ def get_weather_forecast(api_key, base_date, base_time, nx, ny):
         "dataType": "json"
     }
 
+    def decode_text(text):
+        if target_date is None:
+            return json.loads(text)
+        return decode_forecast(json_stream.iter_text_chunks(text, VILAGE_FCST_CHUNK_SIZE), target_date)
+
     try:
-        response = requests.get(weather_url, params=params, timeout=10)
+        # 같은 base_time의 예보는 다음 발표 시각 전까지 다시 받을 필요가 없습니다.
+        cached = response_cache.get(weather_url, params)
+        if cached is not None:
+            print(f"기상청 단기예보 캐시 사용 ({base_date} {base_time})")
+            return decode_text(cached)
+
+        # 같은 base_time의 항목이 만료된 채 남아 있을 때만, 가벼운 버전 조회로 그 발표의 예보가
+        # 바뀌지 않았음을 확인해 전체 다운로드를 건너뜁니다. 항목이 없으면 비교할 것이 없으므로 바로 받습니다.
+        expires_at = response_cache.next_issuance(VILAGE_FCST_BASE_HOURS, VILAGE_FCST_RELEASE_DELAY_MINUTES)
+        version = None
+        if response_cache.get_entry(weather_url, params) is not None:
+            version = get_forecast_version(api_key, base_date, base_time)
+            revalidated = response_cache.revalidate(weather_url, params, version, expires_at)
+            if revalidated is not None:
+                print(f"기상청 단기예보 변경 없음 (버전 {version}) - 캐시 사용")
+                return decode_text(revalidated)
+
+        response = http_client.get(weather_url, params=params, stream=target_date is not None)
         print(f"Requesting Forecast URL: {response.url}") # Debug print
         response.raise_for_status()
-        
-        if response.status_code == 200 and response.text.strip():
-            print("Requesting KMA API...")
-            data = response.json()
-            # print(f"Forecast API Response Data: {data}") # Debug print
-            return data
-        else:
+
+        if target_date is None:
+            if response.status_code == 200 and response.text.strip():
+                print("Requesting KMA API...")
+                data = response.json()
+                # NO_DATA 등 오류 응답(body 없음)은 캐시하지 않습니다.
+                if data.get('response', {}).get('body'):
+                    response_cache.put(weather_url, params, response.text, expires_at, version)
+                return data
             print(f"❌ 기상청 API 응답 오류 (상태 코드: {response.status_code})")
             return None
 
+        # 스트리밍 경로: 받은 조각을 바로 디코딩하고, 캐시 저장용으로 원본 바이트만 모아 둡니다.
+        print("Requesting KMA API (streaming)...")
+        raw_chunks = []
+
+        def read_chunks():
+            for chunk in response.iter_content(chunk_size=VILAGE_FCST_CHUNK_SIZE):
+                raw_chunks.append(chunk)
+                yield chunk
+
+        try:
+            data = decode_forecast(read_chunks(), target_date)
+        finally:
+            # 디코딩 도중 실패해도 연결이 풀로 돌아가도록 응답을 닫습니다.
+            response.close()
+        if data.get('response', {}).get('body'):
+            response_cache.put(weather_url, params, b"".join(raw_chunks).decode("utf-8"), expires_at, version)
+        return data
+
     except requests.exceptions.Timeout:
         print("❌ 기상청 API 호출 시간 초과 오류.")
         return None
@@ -41,6 +128,47 @@ def get_weather_forecast(api_key, base_date, base_time, nx, ny):
         return None
 
 
+def get_forecast_version(api_key, base_date, base_time, ftype="SHRT"):
+    """
+    기상청 예보 버전 조회 API(getFcstVersion)로 해당 발표 시각 예보의 버전(수정 시각)을 가져옵니다.
+    응답은 항목 한 개뿐이라 단기예보 전체(1000행)를 받기 전 변경 여부 확인용으로 사용합니다.
+
+    Args:
+        api_key (str): 공공데이터포털 서비스 키
+        base_date (str): 발표 날짜 (YYYYMMDD)
+        base_time (str): 발표 시각 (HHMM)
+        ftype (str): 예보 구분 ('SHRT': 단기예보, 'VSRT': 초단기예보, 'ODAM': 초단기실황)
+
+    Returns:
+        str or None: 버전 문자열 (예: '20250801051000'), 조회 실패 시 None
+    """
+    version_url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getFcstVersion"
+    params = {
+        "serviceKey": api_key,
+        "numOfRows": 10,
+        "pageNo": 1,
+        "dataType": "json",
+        "ftype": ftype,
+        "basedatetime": f"{base_date}{base_time}"
+    }
+
+    try:
+        response = http_client.get(version_url, params=params)
+        response.raise_for_status()
+        if response.status_code == 200 and response.text.strip():
+            items = response.json().get('response', {}).get('body', {}).get('items', {}).get('item', [])
+            if items:
+                version = str(items[0].get('version', '')).strip()
+                if version:
+                    print(f"기상청 예보 버전 확인: {version}")
+                    return version
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ 기상청 예보 버전 조회 오류: {e}")
+    except (json.JSONDecodeError, AttributeError) as e:
+        print(f"⚠️ 기상청 예보 버전 파싱 오류: {e}")
+    return None
+
+
 def get_weather_warnings(api_key, target_date):
     """
     기상청 기상속보 현황 API(getPwnStatus)를 호출하여 특정 지역에 '현재' 발효 중인 특보를 가져옵니다.
@@ -61,14 +189,21 @@ def get_weather_warnings(api_key, target_date):
         "stnId": "109"  # 109: 서울
     }
 
+    cached = response_cache.get(warning_url, params)
+    if cached is not None:
+        print("기상특보 캐시 사용")
+        return json.loads(cached)
+
     try:
-        response = requests.get(warning_url, params=params, timeout=10)
+        response = http_client.get(warning_url, params=params)
         print(f"[DEBUG] Requesting Warnings URL: {response.url}") # 디버깅용 URL 출력
         response.raise_for_status()  # 200이 아닌 상태 코드에 대해 예외 발생
 
         if response.status_code == 200 and response.text.strip():
             print("기상특보 API 호출 성공")
             data = response.json()
+            if data.get('response'):
+                response_cache.put(warning_url, params, response.text, response_cache.expires_after(WARNINGS_CACHE_SECONDS))
             print(f"[DEBUG] Raw Warning API Response: {json.dumps(data, indent=2, ensure_ascii=False)}") # 디버깅용 원본 데이터 출력
             
             if not data.get('response', {}).get('body', {}).get('items', {}).get('item'):
@@ -0,0 +1,174 @@
+# api_clients/response_cache.py
+# API 응답을 실행 간에 디스크에 보관하는 캐시입니다.
+# 키는 엔드포인트와 정규화된 요청 인자(serviceKey 제외)로 만들고,
+# 만료 시각은 각 데이터가 실제로 발표되는 시각에 맞춰 클라이언트가 지정합니다.
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from config import RESPONSE_CACHE_DIR, RESPONSE_CACHE_ENABLED
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 키 계산에서 제외할 인자 (인증 정보는 응답 내용과 무관하며 디스크에 남기지 않습니다)
+_EXCLUDED_PARAMS = {"servicekey"}
+
+_stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "revalidated": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def normalize_params(params):
+    """인증 키를 제외하고 값들을 문자열로 바꾼 뒤 키 순서대로 정렬합니다."""
+    return sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if str(k).lower() not in _EXCLUDED_PARAMS
+    )
+
+
+def make_key(endpoint, params):
+    raw = json.dumps([endpoint, normalize_params(params)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key):
+    return Path(RESPONSE_CACHE_DIR) / f"{key}.json"
+
+
+def get_entry(endpoint, params):
+    """
+    만료 여부와 관계없이 저장된 캐시 항목(dict)을 반환합니다. 통계에는 반영되지 않습니다.
+    버전 확인 등으로 만료된 응답을 재검증할 때 사용합니다.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+
+    path = _entry_path(make_key(endpoint, params))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return None
+
+
+def get(endpoint, params):
+    """
+    캐시된 응답 본문(str)을 반환합니다. 없거나 만료되었으면 None을 반환합니다.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+
+    entry = get_entry(endpoint, params)
+    if entry is None:
+        _count("misses")
+        return None
+
+    expires_at = entry.get("expires_at")
+    if expires_at is not None and time.time() >= expires_at:
+        _count("expired")
+        return None
+
+    _count("hits")
+    return entry.get("body")
+
+
+def put(endpoint, params, body, expires_at=None, version=None):
+    """
+    응답 본문을 저장합니다.
+
+    Args:
+        endpoint (str): 요청 URL (쿼리 제외)
+        params (dict): 요청 인자 (serviceKey는 저장되지 않음)
+        body (str): 응답 본문
+        expires_at (float or None): 만료 시각 (epoch 초). None이면 만료되지 않습니다.
+        version (str or None): 응답의 발표 버전 (만료 후 재검증용)
+    """
+    if not RESPONSE_CACHE_ENABLED or not body:
+        return
+
+    path = _entry_path(make_key(endpoint, params))
+    entry = {
+        "endpoint": endpoint,
+        "params": normalize_params(params),
+        "stored_at": time.time(),
+        "expires_at": expires_at,
+        "version": version,
+        "body": body
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _count("stores")
+    except OSError as e:
+        print(f"⚠️ 응답 캐시 저장 실패: {e}")
+
+
+def revalidate(endpoint, params, version, expires_at=None):
+    """
+    만료된 항목이라도 저장된 버전이 version과 같으면 만료 시각을 갱신하고 본문을 반환합니다.
+    버전이 다르거나 항목이 없으면 None을 반환합니다.
+    """
+    entry = get_entry(endpoint, params)
+    if not entry or not version or entry.get("version") != version:
+        return None
+
+    put(endpoint, params, entry["body"], expires_at, version)
+    _count("revalidated")
+    return entry["body"]
+
+
+def next_issuance(issue_hours, delay_minutes=0, now=None):
+    """
+    하루 중 정해진 발표 시각(issue_hours, KST) 가운데 현재 이후 가장 가까운 시각을 계산합니다.
+    발표 후 API에 반영되기까지의 지연(delay_minutes)을 더한 시각을 epoch 초로 반환합니다.
+    """
+    now = now or datetime.datetime.now(KST)
+    delay = datetime.timedelta(minutes=delay_minutes)
+    for day_offset in (0, 1):
+        day = (now + datetime.timedelta(days=day_offset)).date()
+        for hour in sorted(issue_hours):
+            available_at = datetime.datetime(day.year, day.month, day.day, hour, tzinfo=KST) + delay
+            if available_at > now:
+                return available_at.timestamp()
+    # issue_hours가 비어 있는 경우
+    return (now + datetime.timedelta(days=1)).timestamp()
+
+
+def expires_after(seconds):
+    return time.time() + seconds
+
+
+def get_stats():
+    """캐시 적중/미스 통계와 적중률을 반환합니다."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"] + stats["expired"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    if stats["hits"] + stats["misses"] + stats["expired"] == 0:
+        return
+    print(f" -> 응답 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회, 만료 {stats['expired']}회, "
+          f"재검증 {stats['revalidated']}회, 저장 {stats['stores']}회 (적중률 {stats['hit_rate']:.0%})")
+
+
+def reset_stats():
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
@@ -0,0 +1,146 @@
+# api_stub_server.py
+# (개발용) 외부 API 대역 서버
+# 기록된 픽스처(api_clients/fixture_store.py)를 재생하여, 실제 data.go.kr / Imgur / graph.facebook.com을
+# 호출하지 않고도 파이프라인 전체를 실행하거나 성능을 측정할 수 있게 합니다.
+#
+# 사용 방법:
+#   1. 실제 응답 기록:  API_RECORD_DIR=weather_service/fixtures python main.py
+#   2. 대역 서버 실행:  python api_stub_server.py --fixtures weather_service/fixtures --latency 0.2 --error-rate 0.05
+#   3. 대역 서버 사용:  API_STUB_URL=http://127.0.0.1:8089 RESPONSE_CACHE_ENABLED=false python main.py
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl
+
+from api_clients import fixture_store
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "weather_service" / "fixtures"
+
+
+class StubSettings:
+    """재생 시 적용할 지연 시간, 오류율, 응답 크기 설정"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, payload_bytes=0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_bytes = payload_bytes
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"served": 0, "errors": 0, "missing": 0}
+
+    def next_delay(self):
+        with self.lock:
+            return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+
+def make_handler(index, settings):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용 지원
+
+        def _handle(self):
+            parts = urlsplit(self.path)
+            segments = parts.path.lstrip("/").split("/", 1)
+            host = segments[0]
+            path = "/" + segments[1] if len(segments) > 1 else "/"
+            params = dict(parse_qsl(parts.query, keep_blank_values=True))
+
+            # 요청 본문은 사용하지 않지만 keep-alive를 위해 끝까지 읽어 둡니다.
+            length = int(self.headers.get("Content-Length", 0) or 0)
+            if length:
+                self.rfile.read(length)
+
+            time.sleep(settings.next_delay())
+
+            if settings.should_fail():
+                settings.count("errors")
+                self._respond(settings.error_status, "application/json", json.dumps({"error": "injected failure"}))
+                return
+
+            fixture = fixture_store.find_fixture(index, self.command, host, path, params)
+            if fixture is None:
+                settings.count("missing")
+                print(f"⚠️ 픽스처 없음: {self.command} {host}{path}")
+                self._respond(404, "application/json", json.dumps({"error": "no fixture", "host": host, "path": path}))
+                return
+
+            settings.count("served")
+            body = fixture["body"]
+            # JSON/XML 파서는 뒤쪽 공백을 무시하므로, 공백으로 응답 크기를 원하는 만큼 늘립니다.
+            if settings.payload_bytes > len(body.encode("utf-8")):
+                body += " " * (settings.payload_bytes - len(body.encode("utf-8")))
+            self._respond(fixture["status"], fixture["content_type"], body)
+
+        def _respond(self, status, content_type, body):
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def log_message(self, format, *args):
+            print(f"[stub] {self.address_string()} {format % args}")
+
+    return StubHandler
+
+
+def create_server(fixtures_dir=DEFAULT_FIXTURES_DIR, host="127.0.0.1", port=8089, settings=None):
+    """픽스처를 읽어 대역 서버를 만듭니다 (serve_forever는 호출하는 쪽에서 실행)."""
+    index = fixture_store.load_fixtures(fixtures_dir)
+    fixture_count = sum(len(v) for v in index.values())
+    print(f"✅ 픽스처 {fixture_count}개 로드 ({len(index)}개 엔드포인트): {fixtures_dir}")
+    settings = settings or StubSettings()
+    server = ThreadingHTTPServer((host, port), make_handler(index, settings))
+    server.daemon_threads = True
+    server.settings = settings
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="외부 API 대역 서버 (픽스처 재생)")
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES_DIR), help="픽스처 디렉토리")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 시간 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 시간 편차 (±초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0.0~1.0)")
+    parser.add_argument("--error-status", type=int, default=503, help="오류 응답 상태 코드")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="응답 본문 최소 크기 (공백으로 채움)")
+    parser.add_argument("--seed", type=int, default=None, help="지연/오류 난수 시드")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.jitter, args.error_rate, args.error_status, args.payload_bytes, args.seed)
+    server = create_server(args.fixtures, args.host, args.port, settings)
+    print(f"→ 대역 서버 실행 중: http://{args.host}:{args.port} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"→ 통계: {settings.stats}")
+
+
+if __name__ == "__main__":
+    main()
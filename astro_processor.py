@@ -44,7 +44,7 @@ def get_complete_astro_info(api_key, target_date, location="서울"):
 
     Args:
         api_key (str): KASI API 키.
-        target_date (datetime.date): 조회할 날짜.
+        target_date (str): 조회할 날짜 (YYYYMMDD 형식).
         location (str): 조회할 지역.
 
     Returns:
@@ -57,7 +57,43 @@ def get_complete_astro_info(api_key, target_date, location="서울"):
     
     # 2. KASI API를 통해 월령 정보 조회
     moon_phase_xml = get_moon_phase_info(api_key, target_date)
-    
+
+    # 3. 월몰 시간이 없는 날에만 다음 날 월몰 정보 조회
+    next_day_sun_moon_xml = None
+    if _find_moonset(sun_moon_xml) == "----":
+        next_day_sun_moon_xml = get_astronomical_info(api_key, location, next_date(target_date))
+
+    return build_astro_info(target_date, location, sun_moon_xml, moon_phase_xml, next_day_sun_moon_xml)
+
+def next_date(target_date):
+    """YYYYMMDD 날짜의 다음 날 (YYYYMMDD)"""
+    return (datetime.datetime.strptime(str(target_date), "%Y%m%d") + datetime.timedelta(days=1)).strftime("%Y%m%d")
+
+def _find_moonset(sun_moon_xml):
+    """일출/일몰 응답의 월몰 시간 (응답이 없거나 형식이 잘못되었으면 None)"""
+    if not sun_moon_xml:
+        return None
+    try:
+        item = ET.fromstring(sun_moon_xml).find(".//item")
+    except ET.ParseError:
+        return None
+    return item.findtext("moonset", "----").strip() if item is not None else None
+
+def build_astro_info(target_date, location, sun_moon_xml, moon_phase_xml, next_day_sun_moon_xml=None):
+    """
+    미리 받아온 KASI 응답(XML)으로 천문 정보 딕셔너리를 구성합니다.
+    data_fetcher에서 요청들을 동시에 보낸 뒤 이 함수로 결과를 합치며, 이 함수는 API를 호출하지 않습니다.
+
+    Args:
+        target_date (str): 조회 날짜 (YYYYMMDD 형식).
+        location (str): 조회 지역.
+        sun_moon_xml (str or None): 일출/일몰 API 응답.
+        moon_phase_xml (str or None): 월령 API 응답.
+        next_day_sun_moon_xml (str or None): 다음 날 일출/일몰 API 응답 (월몰 시간이 없는 날의 월몰 시간용).
+
+    Returns:
+        dict: 모든 천문 정보가 포함된 딕셔너리.
+    """
     # 결과를 저장할 기본 딕셔너리 구조
     result = {
         "sunrise": "N/A", "sunset": "N/A", 
@@ -81,19 +117,13 @@ def get_complete_astro_info(api_key, target_date, location="서울"):
                 result["moonset"] = item.findtext("moonset", "N/A").strip()
                 print(f" → 일출/월몰 정보: {result['sunrise']}/{result['sunset']}, {result['moonrise']}/{result['moonset']}")
 
-                # [오류 수정] 월몰 시간이 '----' (뜨지 않음)일 경우, 다음 날 월몰 시간 조회
+                # [오류 수정] 월몰 시간이 '----' (뜨지 않음)일 경우, 함께 받아 둔 다음 날 월몰 시간 사용
                 if result["moonset"] == "----":
-                    print(" → 월몰 시간이 없어, 다음 날 월몰 시간을 조회합니다.")
-                    next_day = target_date + datetime.timedelta(days=1)
-                    next_day_sun_moon_xml = get_astronomical_info(api_key, location, next_day)
-                    if next_day_sun_moon_xml:
-                        next_day_root = ET.fromstring(next_day_sun_moon_xml)
-                        next_day_item = next_day_root.find(".//item")
-                        if next_day_item:
-                            moonset_next_day = next_day_item.findtext("moonset", "----").strip()
-                            if moonset_next_day != "----":
-                                result["moonset"] = f"다음 날 {moonset_next_day}"
-                                print(f" → 다음 날 월몰 시간 확인: {result['moonset']}")
+                    print(" → 월몰 시간이 없어, 다음 날 월몰 시간을 사용합니다.")
+                    moonset_next_day = _find_moonset(next_day_sun_moon_xml)
+                    if moonset_next_day and moonset_next_day != "----":
+                        result["moonset"] = f"다음 날 {moonset_next_day}"
+                        print(f" → 다음 날 월몰 시간 확인: {result['moonset']}")
 
                 # [기능 복원] 낮과 밤 길이 계산
                 if result["sunrise"] != "N/A" and result["sunset"] != "N/A":
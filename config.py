@@ -27,3 +27,54 @@ IMGUR_CLIENT_ID = os.getenv("IMGUR_CLIENT_ID")
 SEOUL_NX = 60
 SEOUL_NY = 127
 SEOUL_AREA_ID = "1100000000" # 서울 지역 코드
+
+# HTTP 연결 풀 설정 (api_clients/http_client.py)
+# 호스트마다 keep-alive 세션 하나를 공유하며, 동시 수집 스레드 수보다 풀 크기를 크게 잡습니다.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+
+# API 응답 디스크 캐시 설정 (api_clients/response_cache.py)
+# 재실행 시 이미 발표된 데이터를 다시 요청하지 않도록 발표 시각 기준으로 응답을 보관합니다.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", str(Path(__file__).parent / "weather_service" / "cache" / "responses"))
+
+# 외부 API 대역 서버 / 응답 기록 설정 (api_stub_server.py, api_clients/fixture_store.py)
+# API_STUB_URL을 지정하면 모든 외부 API 호출이 대역 서버(예: http://127.0.0.1:8089)로 향합니다.
+# API_RECORD_DIR을 지정하면 실제 API 응답을 해당 디렉토리에 픽스처로 기록합니다.
+API_STUB_URL = os.getenv("API_STUB_URL")
+API_RECORD_DIR = os.getenv("API_RECORD_DIR")
+
+# 이미지 렌더링 프로세스 수 (rendering/render_executor.py)
+# 0이면 CPU 수만큼 사용하며, 1이면 현재 프로세스에서 순서대로 렌더링합니다.
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0"))
+# 여러 프로세스로 렌더링할 때 디코딩한 템플릿을 공유 메모리에 한 벌만 두고 모든 작업자가 함께 씁니다 (rendering/shared_pool.py).
+RENDER_SHARED_TEMPLATES = os.getenv("RENDER_SHARED_TEMPLATES", "true").lower() == "true"
+
+# 미리 디코딩한 템플릿 (rendering/raw_templates.py)
+# `python -m rendering.raw_templates`로 만든 원시 RGBA 파일이 있으면 PNG를 디코딩하지 않고 메모리 매핑으로 엽니다.
+RAW_TEMPLATES_ENABLED = os.getenv("RAW_TEMPLATES_ENABLED", "true").lower() == "true"
+RAW_TEMPLATE_DIR = os.getenv("RAW_TEMPLATE_DIR", str(Path(__file__).parent / "weather_service" / "cache" / "templates"))
+
+# 함께 배포하는 이모지 이미지 (Twemoji PNG, rendering/emoji_source.py)
+EMOJI_DIR = os.getenv("EMOJI_DIR", str(Path(__file__).parent / "weather_service" / "emoji"))
+
+# 출력 이미지 인코딩 프로필 (rendering/encoder.py의 OUTPUT_PROFILES)
+# png(기존과 동일), png_rgb, png_fast, png_palette, jpeg, webp 중 하나. 업로드 용량을 줄이려면 jpeg를 권장합니다.
+OUTPUT_PROFILE = os.getenv("OUTPUT_PROFILE", "png")
+
+# 렌더링 결과 캐시 (rendering/render_cache.py)
+# 그릴 텍스트, 템플릿, 레이아웃, 폰트가 모두 같으면 다시 그리지 않고 이전에 저장한 이미지를 그대로 씁니다.
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "true").lower() == "true"
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", str(Path(__file__).parent / "weather_service" / "cache" / "renders"))
+# 정리할 때 남길 최대 항목 수 (항목은 이미지 경로만 기록하며, 출력 이미지 자체는 지우지 않습니다)
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "500"))
+RENDER_CACHE_MAX_AGE_DAYS = float(os.getenv("RENDER_CACHE_MAX_AGE_DAYS", "14"))
+
+# 텍스트 래스터 캐시 용량 (rendering/text_raster.py)
+# 반복되는 문자열("N/A", "32°" 등)의 알파 마스크를 (폰트, 텍스트)마다 한 번만 만들어 보관합니다.
+TEXT_RASTER_CACHE_MB = float(os.getenv("TEXT_RASTER_CACHE_MB", "16"))
+
+# 부분 렌더링 (rendering/dirty_regions.py)
+# 같은 ImageGenerator로 같은 언어/형식을 다시 그릴 때, 바뀐 요소의 영역만 템플릿에서 복원해 다시 그립니다 (결과는 동일).
+RENDER_INCREMENTAL = os.getenv("RENDER_INCREMENTAL", "true").lower() == "true"
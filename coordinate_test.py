@@ -6,6 +6,8 @@ from pilmoji import Pilmoji
 from pathlib import Path
 import json
 
+from rendering.emoji_source import LocalEmojiSource
+
 def test_coordinates():
     # 기본 경로 설정 (스크립트 위치 기반 동적 경로)
     # main.py나 image_generator.py와 동일한 방식으로, 테스트 파일의 위치를 기준으로 경로를 설정합니다.
@@ -105,7 +107,6 @@ def test_coordinates():
         "uv_number": "8",
         "uv_level": "VERY HIGH",
         "uv_emoji": "🔴",
-        "air_quality_status": "GOOD",
         "air_quality_emoji": "🟢",
         "daylight": "14H 19M",
         "night": "09H 41M", 
@@ -217,7 +218,7 @@ def test_coordinates():
             
             if has_emoji:
                 print(f"  🎭 이모지 포함, Pilmoji 사용")
-                with Pilmoji(img) as pilmoji:
+                with Pilmoji(img, source=LocalEmojiSource()) as pilmoji:
                     pilmoji.text((draw_x, y), text_to_draw, fill=rgb_color, font=font)
             else:
                 print(f"  ✏️ 일반 텍스트, PIL 사용")
@@ -0,0 +1,164 @@
+# data_fetcher.py
+# Fetches raw data from all upstream APIs concurrently.
+# 서로 독립적인 외부 API 요청들을 스레드 풀에서 동시에 실행하여 원시 데이터를 수집합니다.
+# 각 요청(소스)은 자체 재시도 정책을 가지며, 실패한 소스만 지수 백오프로 다시 요청합니다.
+
+import concurrent.futures
+import random
+import time
+
+from api_clients import kma_api, kasi_api, airkorea_api, http_client, response_cache
+from astro_processor import build_astro_info, next_date
+
+# 수집 단계 전체에 적용되는 최종 마감 시간 (초)
+# 필수 소스가 개별 timeout(10초)으로 몇 번 재시도할 수 있을 만큼의 여유를 둡니다.
+FETCH_DEADLINE_SECONDS = 60
+MAX_FETCH_WORKERS = 8
+
+# 재시도 정책: 지터가 적용된 지수 백오프 (1초, 2초, 4초 ... 상한 이내에서 무작위)
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 8.0
+REQUIRED_MAX_ATTEMPTS = 3  # 필수 소스: 실패 시 포스트를 만들 수 없으므로 더 끈질기게 재시도
+OPTIONAL_MAX_ATTEMPTS = 2  # 선택 소스: 실패하면 기존 'N/A' 처리 경로로 넘어감
+
+
+def _has_json_body(data):
+    """공공데이터포털 JSON 응답에 body가 포함되어 있는지 확인합니다 (NO_DATA 등 오류 응답 제외)."""
+    return bool(isinstance(data, dict) and data.get('response', {}).get('body'))
+
+
+def _has_json_response(data):
+    """특보처럼 항목이 없어도 정상인 응답은 response 존재 여부만 확인합니다."""
+    return bool(isinstance(data, dict) and data.get('response'))
+
+
+def _has_xml_item(tag):
+    def validate(xml_text):
+        return bool(xml_text) and f"<{tag}>" in xml_text
+    return validate
+
+
+def _source(func, args, required, validate):
+    return {
+        "func": func,
+        "args": args,
+        "required": required,
+        "validate": validate,
+        "max_attempts": REQUIRED_MAX_ATTEMPTS if required else OPTIONAL_MAX_ATTEMPTS
+    }
+
+
+def _build_fetch_sources(kma_key, airkorea_key, kasi_key, base_date, base_time, target_date, nx, ny, area_id, location):
+    """
+    수집할 소스 목록을 만듭니다.
+    기상청 단기예보(날씨, 기온)와 일출/일몰 정보는 포스트의 핵심 정보이므로 필수 소스입니다.
+    다음 날 일출/일몰(월몰 시간이 없는 날의 월몰 시간용)은 필요 여부를 알기 전에 함께 요청해 마감 시간 안에 둡니다.
+    """
+    search_date_for_air = f"{target_date[:4]}-{target_date[4:6]}-{target_date[6:]}"
+    return {
+        "weather": _source(kma_api.get_weather_forecast, (kma_key, base_date, base_time, nx, ny, target_date), True, _has_json_body),
+        "sun_moon": _source(kasi_api.get_astronomical_info, (kasi_key, location, target_date), True, _has_xml_item("sunrise")),
+        "sun_moon_next_day": _source(kasi_api.get_astronomical_info, (kasi_key, location, next_date(target_date)), False, _has_xml_item("moonset")),
+        "moon_phase": _source(kasi_api.get_moon_phase_info, (kasi_key, target_date), False, _has_xml_item("lunAge")),
+        "uv": _source(kasi_api.get_uv_index, (kasi_key, area_id, target_date), False, _has_json_body),
+        "warnings": _source(kma_api.get_weather_warnings, (kma_key, target_date), False, _has_json_response),
+        "air_pm10": _source(airkorea_api.get_air_forecast, (airkorea_key, search_date_for_air, "PM10"), False, _has_json_body),
+        "air_pm25": _source(airkorea_api.get_air_forecast, (airkorea_key, search_date_for_air, "PM25"), False, _has_json_body),
+    }
+
+
+def _backoff_delay(attempt):
+    """attempt번째 실패 후 대기 시간 (full jitter 지수 백오프)."""
+    cap = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)))
+    return random.uniform(0, cap)
+
+
+def _fetch_with_retry(name, source, deadline_at):
+    """
+    하나의 소스를 재시도 정책에 따라 요청합니다.
+    유효한 응답을 받으면 그대로 반환하고, 모든 시도가 실패하면 None을 반환합니다.
+    """
+    max_attempts = source["max_attempts"]
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = source["func"](*source["args"])
+        except Exception as e:
+            print(f"❌ {name} 데이터 수집 중 오류: {e}")
+            result = None
+
+        if result is not None and source["validate"](result):
+            if attempt > 1:
+                print(f" -> {name} 재시도 성공 ({attempt}/{max_attempts})")
+            return result
+
+        if attempt == max_attempts:
+            break
+
+        delay = _backoff_delay(attempt)
+        if time.monotonic() + delay >= deadline_at:
+            print(f"⚠️ {name}: 마감 시간이 가까워 재시도를 중단합니다.")
+            break
+        print(f" -> {name} 응답이 유효하지 않아 {delay:.1f}초 후 재시도합니다 ({attempt}/{max_attempts}).")
+        time.sleep(delay)
+
+    level = "❌" if source["required"] else "⚠️"
+    print(f"{level} {name} 데이터 수집 실패 ({'필수' if source['required'] else '선택'} 소스)")
+    return None
+
+
+def fetch_all_data(kma_key, airkorea_key, kasi_key, base_date, base_time, target_date,
+                   nx, ny, area_id, location="서울", deadline=FETCH_DEADLINE_SECONDS):
+    """
+    모든 API를 동시에 호출하여 main.main이 사용하는 all_data 딕셔너리를 반환합니다.
+
+    실패한 소스만 각자의 재시도 정책에 따라 다시 요청합니다.
+    선택 소스(자외선, 대기질, 특보, 월령)가 실패하면 None으로 채워져 기존의 'N/A' 처리 경로를 따르고,
+    필수 소스(단기예보, 일출/일몰)가 마감 시간 안에 수집되지 않으면 None을 반환합니다.
+
+    Returns:
+        dict or None: {"weather", "uv", "warnings", "air_pm10", "air_pm25", "astro"} 키를 가진 딕셔너리
+    """
+    sources = _build_fetch_sources(kma_key, airkorea_key, kasi_key, base_date, base_time,
+                                   target_date, nx, ny, area_id, location)
+    results = {name: None for name in sources}
+
+    started = time.monotonic()
+    deadline_at = started + deadline
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix="fetch")
+    try:
+        futures = {
+            executor.submit(_fetch_with_retry, name, source, deadline_at): name
+            for name, source in sources.items()
+        }
+        done, not_done = concurrent.futures.wait(futures, timeout=deadline)
+
+        for future in done:
+            results[futures[future]] = future.result()
+
+        for future in not_done:
+            print(f"❌ {futures[future]} 데이터 수집이 마감 시간({deadline}초)을 초과했습니다.")
+    finally:
+        # 마감 시간을 넘긴 요청은 기다리지 않고 버립니다 (각 요청은 자체 timeout으로 곧 종료됨).
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f" -> API 동시 수집 완료 ({time.monotonic() - started:.2f}초)")
+    http_client.print_latency_summary()
+    response_cache.print_stats()
+
+    missing = [name for name, source in sources.items() if source["required"] and results[name] is None]
+    if missing:
+        print(f"❌ 필수 데이터 누락: {', '.join(missing)}")
+        return None
+
+    # 천문 정보는 KASI 응답들을 모아 기존과 동일한 형태로 가공합니다.
+    astro_info = build_astro_info(target_date, location, results["sun_moon"], results["moon_phase"],
+                                  results["sun_moon_next_day"])
+
+    return {
+        "weather": results["weather"],
+        "uv": results["uv"],
+        "warnings": results["warnings"],
+        "air_pm10": results["air_pm10"],
+        "air_pm25": results["air_pm25"],
+        "astro": astro_info
+    }
@@ -4,107 +4,99 @@
 
 import xml.etree.ElementTree as ET
 
+from hourly_table import HourlyTable, hour_of
+
 def process_weather_data(weather_api_data, target_date):
     """
     기상청 날씨 예보 API 데이터를 처리합니다.
     
     Args:
         weather_api_data: 기상청 API 원시 응답 데이터
+            (kma_api.decode_forecast로 대상 날짜의 사용 항목만 남긴 응답도 같은 형태로 처리합니다)
         target_date: 처리할 날짜 (YYYYMMDD 형식)
     
     Returns:
-        dict: 시간별 날씨 데이터가 정리된 딕셔너리
+        HourlyTable: 항목별 24시간 예보 표 (입력이 유효하지 않으면 빈 표)
     """
     
     # 입력 데이터 유효성 검사
     if not weather_api_data or 'response' not in weather_api_data or 'body' not in weather_api_data['response']:
         print("❌ Invalid weather data.")
-        return {}
+        return HourlyTable(target_date)
 
     # 해당 날짜의 예보 항목만 필터링
     forecast_items = weather_api_data['response']['body']['items'].get('item', [])
     target_items = [item for item in forecast_items if item.get("fcstDate") == target_date]
     print(f" -> Processing {len(target_items)} items for target date ({target_date})...")
 
-    # 결과 데이터 구조 초기화
-    processed = {
-        "temperatures": [],
-        "humidity": [],
-        "wind_speeds": [],
-        "rain_prob": {},
-        "rain_amount": {},
-        "rain_amounts_list": [],
-        "rain_type": {},
-        "sky_status": {},
-        "temp_max": None,
-        "temp_min": None
-    }
+    table = HourlyTable(target_date)
     
     # 각 예보 항목 처리
     for item in target_items:
         category = item["category"]
         value = item["fcstValue"]
-        fcst_time = int(item["fcstTime"])
 
         try:
-            if category == "TMP":
-                processed["temperatures"].append({"time": fcst_time, "value": float(value)})
+            hour = hour_of(item["fcstTime"])
+            if category in ("TMP", "WSD"):
+                table.set(category, hour, float(value))
             elif category == "TMX":
-                processed["temp_max"] = float(value)
+                table.temp_max = float(value)
             elif category == "TMN":
-                processed["temp_min"] = float(value)
-            elif category == "POP":
-                processed["rain_prob"][fcst_time] = int(value)
+                table.temp_min = float(value)
+            elif category in ("POP", "PTY", "REH", "SKY"):
+                table.set(category, hour, int(value))
             elif category == "PCP":
-                # "강수없음"은 일반적으로 0mm를 의미하므로, 강수확률이 있을 경우를 대비해 0으로 처리
-                if "강수없음" in value or "없음" in value:
-                    amount = 0.0
-                else:
-                    # "mm" 단위 제거 및 공백 제거
-                    value = value.replace("mm", "").strip()
-                    try:
-                        # "1.0 미만" 과 같은 형태 처리
-                        if "미만" in value:
-                            num_part = value.split(' ')[0]
-                            amount = float(num_part) / 2 # 예: 1.0 미만 -> 0.5
-                        # "5.0~10.0" 과 같은 범위 형태 처리
-                        elif '~' in value:
-                            parts = value.split('~')
-                            amount = (float(parts[0]) + float(parts[1])) / 2
-                        # 단일 숫자 값 처리
-                        else:
-                            amount = float(value)
-                    except (ValueError, IndexError) as e:
-                        print(f"⚠️ 강수량 파싱 오류 - 원본 값: '{item['fcstValue']}', 처리된 값: '{value}', 오류: {e}")
-                        continue
-                
-                processed["rain_amount"][fcst_time] = amount
-                processed["rain_amounts_list"].append(amount)
-
-            elif category == "PTY":
-                processed["rain_type"][fcst_time] = int(value)
-            elif category == "REH":
-                processed["humidity"].append({"time": fcst_time, "value": int(value)})
-            elif category == "WSD":
-                processed["wind_speeds"].append({"time": fcst_time, "value": float(value)})
-            elif category == "SKY":
-                processed["sky_status"][fcst_time] = int(value)
-        except (ValueError, TypeError) as e:
+                amount = parse_rain_amount(value)
+                if amount is None:
+                    continue
+                table.set(category, hour, amount)
+        except (ValueError, TypeError, IndexError) as e:
             print(f"⚠️ Data processing error - Category: {category}, Value: {value}, Error: {e}")
             continue
 
     # TMX/TMN 값이 없는 경우, 시간별 온도 데이터에서 직접 계산
-    if processed["temp_max"] is None and processed["temperatures"]:
-        processed["temp_max"] = max(t['value'] for t in processed["temperatures"])
-    if processed["temp_min"] is None and processed["temperatures"]:
-        processed["temp_min"] = min(t['value'] for t in processed["temperatures"])
+    if table.temp_max is None:
+        table.temp_max = table.max("TMP")
+    if table.temp_min is None:
+        table.temp_min = table.min("TMP")
 
     # 처리 결과 요약 출력
-    print(f" -> 온도 데이터: {len(processed['temperatures'])}개")
-    print(f" -> 최고/최저온도: {processed['temp_max']}°C / {processed['temp_min']}°C")
-    print(f" -> 강수확률 시간대: {len(processed['rain_prob'])}개")
+    print(f" -> 온도 데이터: {table.count('TMP')}개")
+    print(f" -> 최고/최저온도: {table.temp_max}°C / {table.temp_min}°C")
+    print(f" -> 강수확률 시간대: {table.count('POP')}개")
     
-    return processed
+    return table
+
+def parse_rain_amount(value):
+    """
+    기상청 강수량(PCP) 문자열을 mm 단위 숫자로 바꿉니다.
+
+    Returns:
+        float: 강수량 (mm). 해석할 수 없으면 None
+    """
+    original = value
+    # "강수없음"은 일반적으로 0mm를 의미하므로, 강수확률이 있을 경우를 대비해 0으로 처리
+    if "강수없음" in value or "없음" in value:
+        return 0.0
+
+    # "mm" 단위 제거 및 공백 제거
+    value = value.replace("mm", "").strip()
+    try:
+        # "1.0 미만" 과 같은 형태 처리
+        if "미만" in value:
+            num_part = value.split(' ')[0]
+            return float(num_part) / 2 # 예: 1.0 미만 -> 0.5
+        # "5.0~10.0" 과 같은 범위 형태 처리
+        elif '~' in value:
+            parts = value.split('~')
+            return (float(parts[0]) + float(parts[1])) / 2
+        # 단일 숫자 값 처리
+        else:
+            return float(value)
+    except (ValueError, IndexError) as e:
+        print(f"⚠️ 강수량 파싱 오류 - 원본 값: '{original}', 처리된 값: '{value}', 오류: {e}")
+        return None
 
 def extract_max_temp(processed_data):
     """
@@ -112,18 +104,17 @@ def extract_max_temp(processed_data):
     TMX 값이 없으면 시간별 온도 중 최댓값을 사용합니다.
     
     Args:
-        processed_data: process_weather_data()의 결과
+        processed_data: process_weather_data()의 결과 (HourlyTable)
     
     Returns:
         float: 최고온도 (°C) 또는 None
     """
     # TMX 값이 있으면 우선 사용
-    if processed_data.get('temp_max') is not None:
-        return processed_data['temp_max']
+    if processed_data.temp_max is not None:
+        return processed_data.temp_max
     
     # TMX가 없으면 시간별 온도 중 최댓값 계산
-    temps = [t['value'] for t in processed_data.get('temperatures', [])]
-    return max(temps) if temps else None
+    return processed_data.max("TMP")
 
 def process_uv_index(uv_api_data):
     """
@@ -4,6 +4,8 @@
 
 import datetime
 
+import numpy as np
+
 def get_base_datetime():
     """API 호출을 위한 기준 날짜와 시간을 결정합니다."""
     now = datetime.datetime.now()
@@ -52,6 +54,7 @@ def classify_wind_strength(wind_speed):
 def classify_main_weather(sky_status, rain_type, rain_prob_max, temp_max, rainfall_max=0, warnings=None):
     """
     전체적인 날씨 상태를 분류합니다. 특보를 최우선으로 고려하되, 다른 날씨 정보도 함께 반환합니다.
+    sky_status, rain_type은 값이 있는 시각들의 하늘상태/강수형태 코드 배열입니다.
     """
     print(f"[DEBUG] classify_main_weather received warnings: {warnings}")
     
@@ -81,16 +84,16 @@ def classify_main_weather(sky_status, rain_type, rain_prob_max, temp_max, rainfa
     temp_state = "NORMAL"
     
     # 2. 강수 상태 판단
-    if any(t == 4 for t in rain_type.values()):
+    if np.any(rain_type == 4):
         base_weather = "SHOWER"
-    elif any(t == 3 for t in rain_type.values()):
+    elif np.any(rain_type == 3):
         base_weather = "SNOW"
-    elif any(t > 0 for t in rain_type.values()) or rain_prob_max >= 50:
+    elif np.any(rain_type > 0) or rain_prob_max >= 50:
         base_weather = "RAINY"
     
     # 3. 하늘 상태 판단 (강수 없을 때)
     if base_weather is None:
-        avg_sky = sum(sky_status.values()) / len(sky_status) if sky_status else 1
+        avg_sky = float(np.mean(sky_status)) if len(sky_status) else 1
         if avg_sky <= 2:
             base_weather = "SUNNY"
         elif avg_sky <= 3:
@@ -149,98 +152,167 @@ def classify_main_weather(sky_status, rain_type, rain_prob_max, temp_max, rainfa
         "base_description": base_description # 기본 날씨 설명 추가
     }
 
-def analyze_processed_data(processed_data, target_date, yesterday_temps=None, warnings=None, language='en'):
+def compute_weather_analysis(processed_data, target_date, yesterday_temps=None, warnings=None):
     """
-    처리된 날씨 데이터를 종합 분석하여 최종 요약을 생성합니다.
-    계절에 따라 온도 비교 기준을 변경하고, 새로운 정보들을 추가합니다.
-    
+    처리된 날씨 데이터에서 언어와 무관한 수치 분석 결과를 한 번만 계산합니다.
+    문구는 localize_weather_analysis()에서 언어별로 만듭니다.
+
     Args:
-        language (str): 'en' 또는 'ko' - 강수 정보 등의 언어를 결정
+        processed_data (HourlyTable): process_weather_data()의 결과
+        target_date (str): 대상 날짜 (YYYYMMDD)
+        yesterday_temps (dict or None): 어제 최고/최저 기온
+        warnings (dict or None): process_weather_warnings()의 결과
+
+    Returns:
+        dict: 수치 분석 결과
     """
-    
-    print(f" -> 날씨 데이터 종합 분석 시작 ({language.upper()})...")
-    
-    summary = {}
-    date_obj = datetime.datetime.strptime(target_date, "%Y%m%d")
-    month = date_obj.month
+    print(" -> 날씨 데이터 수치 분석 시작...")
+
+    analysis = {}
+    month = datetime.datetime.strptime(target_date, "%Y%m%d").month
+    table = processed_data
 
     # ============================================
     # 1. 기본 데이터 추출
     # ============================================
-    all_temps_data = processed_data.get('temperatures', [])
-    temps = [t['value'] for t in all_temps_data]
-    summary['temp_max'] = processed_data.get('temp_max') or (max(temps) if temps else None)
-    summary['temp_min'] = processed_data.get('temp_min') or (min(temps) if temps else None)
+    analysis['temp_max'] = table.temp_max if table.temp_max is not None else table.max("TMP")
+    analysis['temp_min'] = table.temp_min if table.temp_min is not None else table.min("TMP")
+
+    avg_humidity = table.mean("REH")
+    analysis['avg_humidity'] = round(avg_humidity, 1) if avg_humidity is not None else 0
 
-    humidity_data = processed_data.get('humidity', [])
-    humidity_values = [h['value'] for h in humidity_data]
-    summary['avg_humidity'] = round(sum(humidity_values) / len(humidity_values), 1) if humidity_values else 0
+    max_wind_speed = table.max("WSD")
+    analysis['max_wind_speed'] = round(max_wind_speed, 1) if max_wind_speed is not None else 0
 
-    wind_data = processed_data.get('wind_speeds', [])
-    wind_values = [w['value'] for w in wind_data]
-    summary['max_wind_speed'] = round(max(wind_values), 1) if wind_values else 0
+    # 시간별 기온 (0~23시, 예보 없는 시각은 None) - 스토리 이미지의 시간대별 기온에 사용
+    analysis['hourly_temps'] = table.column("TMP").tolist()
 
     # ============================================
-    # 2. 계절별 온도차 및 신규 정보 계산 (언어별)
+    # 2. 계절별 온도차, 일교차, 불쾌지수, 밤하늘
     # ============================================
-    summary['temp_diff'] = None
-    summary['temp_diff_description'] = ""
-
+    # 겨울 (12, 1, 2월)에는 어제 아침(최저기온)과, 그 외 계절에는 어제 낮(최고기온)과 비교
+    analysis['temp_diff'] = None
+    analysis['temp_diff_basis'] = "morning" if month in [12, 1, 2] else "day"
     if yesterday_temps:
-        # 겨울 (12, 1, 2월)에는 최저기온 비교
-        if month in [12, 1, 2]:
-            yesterday_min = yesterday_temps.get('yesterday_min_temp')
-            if yesterday_min is not None and summary['temp_min'] is not None:
-                temp_diff = round(summary['temp_min'] - yesterday_min, 1)
-                summary['temp_diff'] = temp_diff
-                if language == 'ko':
-                    if temp_diff > 0:
-                        summary['temp_diff_description'] = f"어제 아침보다 {temp_diff}°C 포근해요"
-                    elif temp_diff < 0:
-                        summary['temp_diff_description'] = f"어제 아침보다 {abs(temp_diff)}°C 더 추워요"
-                    else:
-                        summary['temp_diff_description'] = "어제 아침과 비슷해요"
-                else:
-                    if temp_diff > 0:
-                        summary['temp_diff_description'] = f"{temp_diff}°C warmer than yesterday morning"
-                    elif temp_diff < 0:
-                        summary['temp_diff_description'] = f"{abs(temp_diff)}°C colder than yesterday morning"
-                    else:
-                        summary['temp_diff_description'] = "Similar to yesterday morning"
-        # 그 외 계절에는 최고기온 비교
+        if analysis['temp_diff_basis'] == "morning":
+            today_temp, yesterday_temp = analysis['temp_min'], yesterday_temps.get('yesterday_min_temp')
         else:
-            yesterday_max = yesterday_temps.get('yesterday_max_temp')
-            if yesterday_max is not None and summary['temp_max'] is not None:
-                temp_diff = round(summary['temp_max'] - yesterday_max, 1)
-                summary['temp_diff'] = temp_diff
-                if language == 'ko':
-                    if temp_diff > 0:
-                        summary['temp_diff_description'] = f"어제 낮보다 {temp_diff}°C 더 더워요"
-                    elif temp_diff < 0:
-                        summary['temp_diff_description'] = f"어제 낮보다 {abs(temp_diff)}°C 더 시원해요"
-                    else:
-                        summary['temp_diff_description'] = "어제 낮과 비슷해요"
-                else:
-                    if temp_diff > 0:
-                        summary['temp_diff_description'] = f"{temp_diff}°C hotter than yesterday"
-                    elif temp_diff < 0:
-                        summary['temp_diff_description'] = f"{abs(temp_diff)}°C cooler than yesterday"
-                    else:
-                        summary['temp_diff_description'] = "Similar to yesterday"
+            today_temp, yesterday_temp = analysis['temp_max'], yesterday_temps.get('yesterday_max_temp')
+        if yesterday_temp is not None and today_temp is not None:
+            analysis['temp_diff'] = round(today_temp - yesterday_temp, 1)
 
     # 일교차 계산
-    if summary['temp_max'] is not None and summary['temp_min'] is not None:
-        summary['diurnal_range'] = round(summary['temp_max'] - summary['temp_min'], 1)
+    if analysis['temp_max'] is not None and analysis['temp_min'] is not None:
+        analysis['diurnal_range'] = round(analysis['temp_max'] - analysis['temp_min'], 1)
     else:
-        summary['diurnal_range'] = None
+        analysis['diurnal_range'] = None
 
     # 불쾌지수 계산
-    if summary['temp_max'] is not None and summary['avg_humidity'] > 0:
-        t = summary['temp_max']
-        h = summary['avg_humidity']
-        discomfort_index = (9/5 * t) - 0.55 * (1 - h/100) * ((9/5 * t) - 26) + 32
+    if analysis['temp_max'] is not None and analysis['avg_humidity'] > 0:
+        t = analysis['temp_max']
+        h = analysis['avg_humidity']
+        analysis['discomfort_index'] = (9/5 * t) - 0.55 * (1 - h/100) * ((9/5 * t) - 26) + 32
+    else:
+        analysis['discomfort_index'] = None
+
+    # 밤 9시~12시 평균 하늘 상태
+    analysis['avg_night_sky'] = table.mean("SKY", 21, 23)
+
+    # ============================================
+    # 3. 바람, 강수
+    # ============================================
+    analysis['wind'] = classify_wind_strength(analysis['max_wind_speed'])
+
+    rain_prob = table.column("POP")
+    rain_amount = table.column("PCP")
+    rain_type = table.column("PTY")
+    analysis['rain_prob_max'] = int(table.max("POP", default=0))
+    analysis['rainfall_max'] = table.max("PCP", default=0)
+    analysis['total_rain_amount'] = round(table.sum("PCP"), 1) if analysis['rain_prob_max'] >= 30 and table.count("PCP") else 0
+
+    # 강수확률 30% 이상인 시간대와 그중 강수량이 가장 많은 시각 (결측 시각은 False로 채워 제외)
+    rain_hours = np.flatnonzero((rain_prob >= 30).filled(False))
+    if rain_hours.size:
+        rain_amount_data = rain_amount[rain_hours]
+        analysis['rain_window'] = {
+            "start": int(rain_hours[0]),
+            "end": int(rain_hours[-1]) + 1,
+            "peak": int(rain_hours[rain_amount_data.argmax()]) if rain_amount_data.count() else None
+        }
+    else:
+        analysis['rain_window'] = None
+
+    analysis['rain_groups'] = find_rain_time_groups(rain_prob, rain_type)
+
+    # ============================================
+    # 4. 전체 날씨 상태 분류
+    # ============================================
+    analysis['main_weather'] = classify_main_weather(
+        table.present("SKY"), table.present("PTY"), analysis['rain_prob_max'],
+        analysis['temp_max'], analysis['rainfall_max'], warnings=warnings
+    )
+    return analysis
+
+def localize_weather_analysis(analysis, language='en'):
+    """
+    compute_weather_analysis()의 수치 결과를 지정한 언어의 요약 딕셔너리로 만듭니다.
+    문자열 조합만 하므로 언어를 추가해도 수치 분석은 다시 하지 않습니다.
+
+    Args:
+        language (str): 'en' 또는 'ko'
+    """
+    ko = language == 'ko'
+    summary = {
+        'temp_max': analysis['temp_max'],
+        'temp_min': analysis['temp_min'],
+        'avg_humidity': analysis['avg_humidity'],
+        'max_wind_speed': analysis['max_wind_speed'],
+        'temp_diff': analysis['temp_diff'],
+        'temp_diff_description': "",
+        'hourly_temps': analysis['hourly_temps'],
+    }
+
+    # 온도차 문구
+    temp_diff = analysis['temp_diff']
+    if temp_diff is not None:
+        if analysis['temp_diff_basis'] == "morning":
+            if ko:
+                if temp_diff > 0:
+                    summary['temp_diff_description'] = f"어제 아침보다 {temp_diff}°C 포근해요"
+                elif temp_diff < 0:
+                    summary['temp_diff_description'] = f"어제 아침보다 {abs(temp_diff)}°C 더 추워요"
+                else:
+                    summary['temp_diff_description'] = "어제 아침과 비슷해요"
+            else:
+                if temp_diff > 0:
+                    summary['temp_diff_description'] = f"{temp_diff}°C warmer than yesterday morning"
+                elif temp_diff < 0:
+                    summary['temp_diff_description'] = f"{abs(temp_diff)}°C colder than yesterday morning"
+                else:
+                    summary['temp_diff_description'] = "Similar to yesterday morning"
+        else:
+            if ko:
+                if temp_diff > 0:
+                    summary['temp_diff_description'] = f"어제 낮보다 {temp_diff}°C 더 더워요"
+                elif temp_diff < 0:
+                    summary['temp_diff_description'] = f"어제 낮보다 {abs(temp_diff)}°C 더 시원해요"
+                else:
+                    summary['temp_diff_description'] = "어제 낮과 비슷해요"
+            else:
+                if temp_diff > 0:
+                    summary['temp_diff_description'] = f"{temp_diff}°C hotter than yesterday"
+                elif temp_diff < 0:
+                    summary['temp_diff_description'] = f"{abs(temp_diff)}°C cooler than yesterday"
+                else:
+                    summary['temp_diff_description'] = "Similar to yesterday"
+
+    summary['diurnal_range'] = analysis['diurnal_range']
+
+    # 불쾌지수 단계 (언어별 기준이 다름)
+    discomfort_index = analysis['discomfort_index']
+    if discomfort_index is not None:
         summary['discomfort_index'] = round(discomfort_index, 1)
-        if language == 'ko':
+        if ko:
             if discomfort_index >= 80:
                 summary['discomfort_level'] = "매우 높음"
             elif discomfort_index >= 75:
@@ -262,12 +334,10 @@ def analyze_processed_data(processed_data, target_date, yesterday_temps=None, wa
         summary['discomfort_index'] = None
         summary['discomfort_level'] = "N/A"
 
-    # 밤 9시~12시 하늘 상태 조회 (언어별)
-    sky_status_data = processed_data.get('sky_status', {})
-    night_sky_codes = [v for k, v in sky_status_data.items() if 2100 <= k <= 2359]
-    if night_sky_codes:
-        avg_night_sky = sum(night_sky_codes) / len(night_sky_codes)
-        if language == 'ko':
+    # 밤 9시~12시 하늘 상태
+    avg_night_sky = analysis['avg_night_sky']
+    if avg_night_sky is not None:
+        if ko:
             if avg_night_sky <= 1.5:
                 summary['night_sky_clarity'] = "매우 맑음"
             elif avg_night_sky <= 2.5:
@@ -282,54 +352,41 @@ def analyze_processed_data(processed_data, target_date, yesterday_temps=None, wa
             else:
                 summary['night_sky_clarity'] = "Cloudy"
     else:
-        summary['night_sky_clarity'] = "정보 없음" if language == 'ko' else "No Data"
+        summary['night_sky_clarity'] = "정보 없음" if ko else "No Data"
 
-    # ============================================
-    # 3. 나머지 정보 분석 (바람, 강수 등)
-    # ============================================
-    wind_info = classify_wind_strength(summary['max_wind_speed'])
-    summary['wind_strength'] = wind_info['strength']
-    summary['wind_description'] = wind_info['description']
-
-    rain_prob = processed_data.get('rain_prob', {})
-    rain_amounts = processed_data.get('rain_amounts_list', [])
-    rain_type = processed_data.get('rain_type', {})
-    summary['rain_prob_max'] = max(rain_prob.values()) if rain_prob else 0
-    summary['rainfall_max'] = max(rain_amounts) if rain_amounts else 0
-    summary['total_rain_amount'] = round(sum(rain_amounts), 1) if summary['rain_prob_max'] >= 30 and rain_amounts else 0
-    
-    rain_times = sorted([t for t, p in rain_prob.items() if p >= 30])
-    if rain_times:
-        start_time = f"{rain_times[0]:04d}"[:2] + ("시" if language == 'ko' else ":00")
-        end_time = f"{rain_times[-1]+100:04d}"[:2] + ("시" if language == 'ko' else ":00")
-        rain_amount_data = {t:a for t, a in processed_data.get('rain_amount', {}).items() if t in rain_times}
-        peak_time = max(rain_amount_data, key=rain_amount_data.get) if rain_amount_data else None
-        peak_time_str = f"{peak_time:04d}"[:2] + ("시경" if language == 'ko' else ":00") if peak_time else ""
-        
-        if language == 'ko':
+    summary['wind_strength'] = analysis['wind']['strength']
+    summary['wind_description'] = analysis['wind']['description']
+
+    summary['rain_prob_max'] = analysis['rain_prob_max']
+    summary['rainfall_max'] = analysis['rainfall_max']
+    summary['total_rain_amount'] = analysis['total_rain_amount']
+
+    # 강수 요약
+    rain_window = analysis['rain_window']
+    if rain_window:
+        start_time = f"{rain_window['start']:02d}" + ("시" if ko else ":00")
+        end_time = f"{rain_window['end']:02d}" + ("시" if ko else ":00")
+        peak_time = rain_window['peak']
+        peak_time_str = f"{peak_time:02d}" + ("시경" if ko else ":00") if peak_time else ""
+
+        if ko:
             summary['rainfall_summary'] = f"{start_time}~{end_time} (피크: {peak_time_str})"
         else:
             summary['rainfall_summary'] = f"{start_time}~{end_time} (Peak: {peak_time_str})"
     else:
-        summary['rainfall_summary'] = "비 소식 없음" if language == 'ko' else "No rain expected"
+        summary['rainfall_summary'] = "비 소식 없음" if ko else "No rain expected"
 
-    # 강수 시간대 상세 분석 (언어별로 처리)
-    summary['detailed_rain_times'] = analyze_rain_times_detailed(
-        rain_prob, {}, rain_type, 
+    # 강수 시간대 상세 분석
+    summary['detailed_rain_times'] = format_rain_time_groups(
+        analysis['rain_groups'],
         {0:"No rain", 1:"Rain", 2:"Rain/Snow", 3:"Snow", 4:"Showers"},
         language=language
     )
 
-    # ============================================
-    # 4. 전체 날씨 상태 분류 (기존 로직 유지)
-    # ============================================
-    main_weather_info = classify_main_weather(
-        sky_status_data, rain_type, summary['rain_prob_max'], 
-        summary['temp_max'], summary['rainfall_max'], warnings=warnings
-    )
-    summary.update(main_weather_info)
-    
-    print(f" -> 날씨 데이터 종합 분석 완료 ({language.upper()})!")
+    # 전체 날씨 상태 분류 결과
+    summary.update(analysis['main_weather'])
+
+    print(f" -> 날씨 요약 문구 생성 완료 ({language.upper()})!")
     print(f"    - 온도차: {summary.get('temp_diff_description')}")
     print(f"    - 일교차: {summary.get('diurnal_range')}°C")
     print(f"    - 불쾌지수: {summary.get('discomfort_index')} ({summary.get('discomfort_level')})")
@@ -338,41 +395,60 @@ def analyze_processed_data(processed_data, target_date, yesterday_temps=None, wa
 
     return summary
 
-# 기존 함수들 (analyze_rain_times_detailed, create_instagram_summary) 유지
-def analyze_rain_times_detailed(prob, amount, p_type, pty_map, language='en'):
-    """
-    강수 시간, 확률, 형태를 분석하여 상세 텍스트 리스트를 반환합니다.
+def analyze_processed_data(processed_data, target_date, yesterday_temps=None, warnings=None, language='en'):
     """
+    처리된 날씨 데이터를 종합 분석하여 최종 요약을 생성합니다.
+    계절에 따라 온도 비교 기준을 변경하고, 새로운 정보들을 추가합니다.
+    여러 언어를 만들 때는 compute_weather_analysis()를 한 번 호출하고 localize_weather_analysis()만 반복하세요.
     
-    def group_times(times):
-        if not times:
+    Args:
+        language (str): 'en' 또는 'ko' - 강수 정보 등의 언어를 결정
+    """
+    analysis = compute_weather_analysis(processed_data, target_date, yesterday_temps, warnings)
+    return localize_weather_analysis(analysis, language)
+
+def find_rain_time_groups(prob, p_type):
+    """
+    강수확률이 높은 시간대를 연속 구간으로 묶습니다 (언어 무관).
+    prob, p_type은 HourlyTable.column()이 반환하는 24시간 배열입니다.
+
+    Returns:
+        dict: {"high": [(시작 시각, 끝 시각, 주 강수형태 코드), ...], "possible": [(시작 시각, 끝 시각), ...]}
+    """
+
+    def group_times(hours):
+        # 연속된 시각끼리 묶습니다 (예: [3, 4, 5, 9] -> [[3, 4, 5], [9]])
+        if not hours.size:
             return []
-        groups = []
-        current_group = [times[0]]
-        for i in range(1, len(times)):
-            if (times[i] - current_group[-1]) <= 100:
-                current_group.append(times[i])
-            else:
-                groups.append(current_group)
-                current_group = [times[i]]
-        groups.append(current_group)
-        return groups
-
-    def format_group_string(g, include_type=True):
-        start_hour = f"{g[0]:04d}"[:2]
-        end_hour = f"{g[-1]:04d}"[:2]
-        time_str = f"{start_hour}:00" if start_hour == end_hour else f"{start_hour}:00-{int(end_hour)+1:02d}:00"
-        
-        type_str = ""
-        if include_type:
-            types_in_group = [p_type.get(t, 0) for t in g if p_type.get(t, 0) > 0]
-            main_type_code = max(set(types_in_group), key=types_in_group.count) if types_in_group else 0
-            type_str = pty_map.get(main_type_code, "")
-        
+        breaks = np.flatnonzero(np.diff(hours) > 1) + 1
+        return np.split(hours, breaks)
+
+    def main_type_of(g):
+        types_in_group = p_type[g].filled(0).astype(int)
+        types_in_group = types_in_group[types_in_group > 0]
+        # 가장 자주 나타나는 강수형태 (같으면 코드가 작은 쪽)
+        return int(np.bincount(types_in_group).argmax()) if types_in_group.size else 0
+
+    # 50% 이상 (높은 확률)
+    high_prob_times = np.flatnonzero((prob >= 50).filled(False))
+    # 30% 이상 50% 미만 (가능성 있음)
+    possible_rain_times = np.flatnonzero(((prob >= 30) & (prob < 50)).filled(False))
+
+    return {
+        "high": [(int(g[0]), int(g[-1]), main_type_of(g)) for g in group_times(high_prob_times)],
+        "possible": [(int(g[0]), int(g[-1])) for g in group_times(possible_rain_times)]
+    }
+
+def format_rain_time_groups(groups, pty_map, language='en'):
+    """find_rain_time_groups()의 결과를 언어별 상세 텍스트 리스트로 만듭니다."""
+
+    def format_group_string(start_hour, end_hour, type_code=None):
+        time_str = f"{start_hour:02d}:00" if start_hour == end_hour else f"{start_hour:02d}:00-{end_hour+1:02d}:00"
+        type_str = pty_map.get(type_code, "") if type_code is not None else ""
         return f"{time_str} ({type_str})" if type_str and type_str != "No rain" and type_str != "강수 없음" else time_str
 
     details = []
-    
+
     if language == 'ko':
         pty_map = {0: "강수 없음", 1: "비", 2: "비/눈", 3: "눈", 4: "소나기"}
         high_chance_label = "강수 예상(50%↑):"
@@ -381,22 +457,23 @@ def analyze_rain_times_detailed(prob, amount, p_type, pty_map, language='en'):
         high_chance_label = "HIGH CHANCE OF RAIN:"
         possible_label = "POSSIBLE RAIN:"
 
-    # 50% 이상 (높은 확률)
-    high_prob_times = sorted([t for t, p in prob.items() if p >= 50])
-    if high_prob_times:
-        high_prob_groups = group_times(high_prob_times)
-        formatted_groups = [format_group_string(g, include_type=True) for g in high_prob_groups]
+    if groups["high"]:
+        formatted_groups = [format_group_string(start, end, type_code) for start, end, type_code in groups["high"]]
         details.append(f"{high_chance_label} {', '.join(formatted_groups)}".upper())
 
-    # 30% 이상 50% 미만 (가능성 있음)
-    possible_rain_times = sorted([t for t, p in prob.items() if 30 <= p < 50])
-    if possible_rain_times:
-        possible_rain_groups = group_times(possible_rain_times)
-        formatted_groups = [format_group_string(g, include_type=False) for g in possible_rain_groups]
+    if groups["possible"]:
+        formatted_groups = [format_group_string(start, end) for start, end in groups["possible"]]
         details.append(f"{possible_label} {', '.join(formatted_groups)}".upper())
 
     return details
 
+def analyze_rain_times_detailed(prob, amount, p_type, pty_map, language='en'):
+    """
+    강수 시간, 확률, 형태를 분석하여 상세 텍스트 리스트를 반환합니다.
+    prob, amount, p_type은 HourlyTable.column()이 반환하는 24시간 배열입니다.
+    """
+    return format_rain_time_groups(find_rain_time_groups(prob, p_type), pty_map, language=language)
+
 def create_instagram_summary(data, catch_phrase):
     """기존 인스타그램 요약 함수 (일부 수정)"""
     target_dt = datetime.datetime.strptime(data['info']['target_date'], "%Y%m%d")
@@ -0,0 +1,72 @@
+# hourly_table.py
+# 하루 24시간 예보를 항목(category)별 고정 길이 배열로 보관하는 열 지향(columnar) 표입니다.
+# 값이 없는 시각은 결측 마스크로 표시하며, 분석 코드는 시간 구간을 잘라 벡터 연산으로 집계합니다.
+
+import numpy as np
+
+HOURS_PER_DAY = 24
+
+# 표에 보관하는 시간별 예보 항목 (기온, 습도, 풍속, 강수확률, 강수량, 강수형태, 하늘상태)
+HOURLY_CATEGORIES = ("TMP", "REH", "WSD", "POP", "PCP", "PTY", "SKY")
+
+
+def hour_of(fcst_time):
+    """기상청 fcstTime(예: "0600", 600)을 시각 인덱스(0~23)로 바꿉니다."""
+    return int(fcst_time) // 100
+
+
+class HourlyTable:
+    """
+    대상 날짜의 시간별 예보 표.
+
+    values[행, 시각]에 값을, missing[행, 시각]에 결측 여부를 저장합니다.
+    행 순서는 HOURLY_CATEGORIES와 같고, 시간 구간(start_hour, end_hour)은 양 끝을 포함합니다.
+    """
+
+    def __init__(self, target_date):
+        self.target_date = target_date
+        self.values = np.zeros((len(HOURLY_CATEGORIES), HOURS_PER_DAY), dtype=np.float64)
+        self.missing = np.ones((len(HOURLY_CATEGORIES), HOURS_PER_DAY), dtype=bool)
+        self.temp_max = None  # TMX (없으면 시간별 기온 최댓값)
+        self.temp_min = None  # TMN (없으면 시간별 기온 최솟값)
+        self._rows = {category: row for row, category in enumerate(HOURLY_CATEGORIES)}
+
+    def set(self, category, hour, value):
+        row = self._rows[category]
+        self.values[row, hour] = value
+        self.missing[row, hour] = False
+
+    def column(self, category):
+        """항목의 24시간 값을 결측 마스크가 적용된 배열(numpy.ma)로 반환합니다."""
+        row = self._rows[category]
+        return np.ma.MaskedArray(self.values[row], mask=self.missing[row])
+
+    def present(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1):
+        """시간 구간 안에서 값이 있는 시각들의 값만 1차원 배열로 반환합니다."""
+        row = self._rows[category]
+        window = slice(start_hour, end_hour + 1)
+        return self.values[row, window][~self.missing[row, window]]
+
+    def hours(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1):
+        """시간 구간 안에서 값이 있는 시각(0~23)들을 반환합니다."""
+        row = self._rows[category]
+        return np.flatnonzero(~self.missing[row, start_hour:end_hour + 1]) + start_hour
+
+    def count(self, category):
+        return int(np.count_nonzero(~self.missing[self._rows[category]]))
+
+    def mean(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1, default=None):
+        values = self.present(category, start_hour, end_hour)
+        return float(values.mean()) if values.size else default
+
+    def max(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1, default=None):
+        values = self.present(category, start_hour, end_hour)
+        return float(values.max()) if values.size else default
+
+    def min(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1, default=None):
+        values = self.present(category, start_hour, end_hour)
+        return float(values.min()) if values.size else default
+
+    def sum(self, category, start_hour=0, end_hour=HOURS_PER_DAY - 1, default=0):
+        values = self.present(category, start_hour, end_hour)
+        return float(values.sum()) if values.size else default
@@ -9,12 +9,37 @@ from zoneinfo import ZoneInfo # 시간대 정보 라이브러리
 from PIL import Image, ImageDraw, ImageFont
 from pilmoji import Pilmoji
 
+from config import OUTPUT_PROFILE, RENDER_INCREMENTAL
+from rendering import (dirty_regions, emoji_source, encoder, font_cache, layout_plan, render_cache, template_store,
+                       text_layout, text_raster)
+from rendering.emoji_source import LocalEmojiSource, count_emoji, has_emoji
+
+# pilmoji.text의 기본 줄 간격 (줄 높이 = 폰트 크기 + 줄 간격)
+PILMOJI_LINE_SPACING = 4
+
+# 포스트에 _prepare_texts() 결과를 그대로 그리는 요소 (그리는 순서대로)
+POST_TEXT_ELEMENTS = (
+    "temp_max", "temp_min", "temp_diff", "rain_probability", "rain_amount", "humidity", "wind",
+    "uv_number", "uv_level", "air_quality_pm10", "air_quality_pm25",
+    "daylight", "night", "sunrise", "sunset", "moonrise", "moonset", "moon_emoji", "moon_phase",
+)
+
+# 스토리 규격과 스토리 안에 포스트 이미지를 놓는 위치 (세로 가운데: (1920 - 1350) / 2 = 285)
+STORY_SIZE = (1080, 1920)
+STORY_POST_POSITION = (0, 285)
+
+# 스토리 템플릿은 맑음/흐림/비 세 가지이므로 포스트 템플릿 유형을 그중 하나로 묶습니다 (나머지는 맑음).
+STORY_TEMPLATE_TYPES = {
+    'cloudy': 'cloudy', 'snowy': 'cloudy',
+    'rainy': 'rainy', 'shower': 'rainy', 'heavyrain': 'rainy', 'typhoon': 'rainy',
+}
+
 class ImageGenerator:
     """
     날씨 데이터 기반 Instagram 이미지 생성기
     """
     
-    def __init__(self, base_dir_name="weather_service"):
+    def __init__(self, base_dir_name="weather_service", output_profile=None, incremental=None):
         # 이 파일(image_generator.py)의 위치를 기준으로 프로젝트 루트 폴더를 찾습니다.
         # 이렇게 하면 어떤 위치에서 스크립트를 실행해도 항상 정확한 경로를 찾을 수 있습니다.
         script_dir = Path(__file__).parent
@@ -23,6 +48,11 @@ class ImageGenerator:
         self.fonts_dir = self.base_dir / "fonts"
         self.config_dir = self.base_dir / "config"
         self.output_dir = self.base_dir / "output"
+        # 저장 형식 (rendering.encoder의 프로필 이름, 기본값은 config.OUTPUT_PROFILE)
+        self.output_profile = output_profile or OUTPUT_PROFILE
+        # 부분 렌더링 여부 (기본값은 config.RENDER_INCREMENTAL). 켜면 (형식, 언어)별 마지막 렌더링 결과를 보관합니다.
+        self.incremental = RENDER_INCREMENTAL if incremental is None else incremental
+        self._render_states = {}  # (형식, 언어) -> dirty_regions.RenderState
         
         # 폰트 경로 정의 (한국어 폰트도 영어와 동일하게 처리)
         self.font_paths = {
@@ -40,25 +70,43 @@ class ImageGenerator:
             'NanumSquareNeo-eHv': self.fonts_dir / 'NanumSquareNeo-eHv.ttf',
             'NanumGothic': self.fonts_dir / 'NanumGothic.ttf',
         }
+        self.positions = {}
+        self._layout_plans = {}  # (템플릿, 언어) -> 컴파일된 LayoutPlan
 
     def load_positions(self):
         positions_path = self.config_dir / 'positions.json'
         try:
-            with open(positions_path, 'r', encoding='utf-8') as f:
-                self.positions = json.load(f)
-                print("✅ positions.json 로드 완료")
+            # 파일이 바뀌지 않았다면 언어별 ImageGenerator가 같은 파싱 결과를 공유합니다.
+            self.positions = template_store.load_json(positions_path)
+            print("✅ positions.json 로드 완료")
+            for issue in layout_plan.validate(self.positions):
+                print(f"⚠️ positions.json: {issue}")
         except FileNotFoundError:
             print(f"❌ positions.json을 찾을 수 없습니다: {positions_path}")
             self.positions = {}
         except json.JSONDecodeError:
             print(f"❌ positions.json JSON 디코딩 오류: {positions_path}")
             self.positions = {}
+        self._layout_plans = {}
+
+    def get_layout_plan(self, language='en', template='post_template'):
+        """positions.json의 템플릿을 언어별 렌더링 계획으로 한 번만 컴파일해 재사용합니다."""
+        key = (template, language)
+        plan = self._layout_plans.get(key)
+        if plan is None:
+            plan = layout_plan.compile_plan(self.positions, template, language, self.get_font)
+            self._layout_plans[key] = plan
+        return plan
 
     def load_templates(self):
-        """템플릿 로드 (현재는 파일 존재 여부만 확인)"""
+        """
+        템플릿 확인: 포스트/스토리 템플릿 디렉토리의 사용 가능한 템플릿 목록을 만들어 둡니다.
+        템플릿 선택(_select_template_by_weather)은 파일을 하나씩 확인하지 않고 이 목록에서 고릅니다.
+        """
         posts_dir = self.templates_dir / "posts"
         if posts_dir.exists():
-            template_count = len(list(posts_dir.glob("*.png")))
+            template_store.available(self.templates_dir)
+            template_count = len(template_store.available(posts_dir))
             print(f"✅ 템플릿 디렉토리 확인 완료: {template_count}개 템플릿 발견")
         else:
             print(f"⚠️ 템플릿 디렉토리가 없습니다: {posts_dir}")
@@ -68,6 +116,8 @@ class ImageGenerator:
         self.load_positions()
         self.load_templates()
         self.check_fonts()
+        # 번들 이모지 이미지가 빠져 있으면 이모지가 깨진 이미지를 게시하지 않도록 여기서 멈춥니다.
+        emoji_source.require_assets()
         print("--- Image Generator Setup Complete ---")
 
     def check_fonts(self):
@@ -100,21 +150,14 @@ class ImageGenerator:
 
     def _hex_to_rgba(self, hex_color):
         """HEX 색상을 RGBA 튜플로 변환"""
-        if not hex_color or not isinstance(hex_color, str):
-            return (0, 0, 0, 255)
-            
-        hex_color = hex_color.lstrip('#')
-        if len(hex_color) == 6:
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4)) + (255,)
-        elif len(hex_color) == 8:
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4, 6))
-        return (0, 0, 0, 255)
-
-    def _select_template_by_weather(self, weather_summary, language='en', format='post'):
-        """날씨에 따른 템플릿 선택"""
+        return layout_plan.parse_color(hex_color)
+
+    def _select_template_by_weather(self, weather_summary, language='en', format='post', verbose=True):
+        """날씨에 따른 템플릿 선택 (verbose=False이면 선택 과정을 출력하지 않음)"""
         combined_weather = weather_summary.get('combined', 'SUNNY').upper()
         temp_max = weather_summary.get('temp_max')
-        print(f" → 날씨 상태: {combined_weather}, 최고기온: {temp_max}°C")
+        if verbose:
+            print(f" → 날씨 상태: {combined_weather}, 최고기온: {temp_max}°C")
 
         # 템플릿 타입 결정
         template_type = 'sunny'  # 기본값
@@ -135,25 +178,31 @@ class ImageGenerator:
         elif 'CLOUDY' in combined_weather or 'PARTLY_CLOUDY' in combined_weather: 
             template_type = 'cloudy'
 
-        # 언어별 템플릿 파일명 생성
-        lang_suffix = '_ko' if language == 'ko' else ''
+        if format == 'story':
+            template_type = STORY_TEMPLATE_TYPES.get(template_type, 'sunny')
+
+        # 언어별 템플릿 파일명 생성 (영어가 기본, 다른 언어는 _{언어} 템플릿 또는 레이어 템플릿)
+        lang_suffix = '' if language == 'en' else f'_{language}'
         template_filename = f"{format}_{template_type}{lang_suffix}.png"
         
-        # 1. 언어별 템플릿 시도
+        # 1. 언어별 템플릿 시도 (template_store.available()에 만들어 둔 템플릿 목록에서 확인)
         template_path = self._get_template_path(template_filename, format)
-        if template_path.exists():
-            print(f" → 선택된 템플릿: {template_filename}")
+        if template_store.exists(template_path):
+            if verbose:
+                print(f" → 선택된 템플릿: {template_filename}")
             return template_filename
 
         # 2. 언어별 템플릿이 없으면 기본(영어) 템플릿으로 대체
         if lang_suffix:
             template_filename = f"{format}_{template_type}.png"
             template_path = self._get_template_path(template_filename, format)
-            if template_path.exists():
-                print(f" → (대체) 선택된 템플릿: {template_filename}")
+            if template_store.exists(template_path):
+                if verbose:
+                    print(f" → (대체) 선택된 템플릿: {template_filename}")
                 return template_filename
             
-        print(f" → 최종 선택된 템플릿: {template_filename}")
+        if verbose:
+            print(f" → 최종 선택된 템플릿: {template_filename}")
         return template_filename
 
     def _get_template_path(self, template_filename, format='post'):
@@ -164,67 +213,56 @@ class ImageGenerator:
             return self.templates_dir / template_filename
 
     def _draw_text(self, image, text, config, language='en', **kwargs):
-        """텍스트를 이미지에 그리는 통합 함수"""
+        """
+        요소 설정(dict) 하나로 텍스트를 그립니다. 설정을 그 자리에서 TextSlot으로 컴파일하므로,
+        반복해서 그리는 요소는 get_layout_plan()의 슬롯으로 _draw_slot을 호출하세요.
+        kwargs로 font_name_override, color, align, x, y를 바꿀 수 있고, pilmoji는 _draw_slot에 넘깁니다.
+        """
         if not text or text == "N/A" or str(text).strip() == "": 
             return
-        if not config.get("visible", True): 
+        if kwargs.get("font_name_override"):
+            config = dict(config, font_name=kwargs["font_name_override"])
+            config.pop("font_name_ko", None)
+
+        slot = layout_plan.compile_slot(None, config, language, self.get_font)
+        if slot is None:
             return
-            
-        font_size = config.get("font_size", 30)
-        if font_size == 0: 
+
+        changes = {name: kwargs[name] for name in ("align", "x", "y") if name in kwargs}
+        if "color" in kwargs:
+            changes["color"] = layout_plan.parse_color(kwargs["color"])
+        if changes:
+            slot = slot.replace(**changes)
+        self._draw_slot(image, text, slot, kwargs.get("pilmoji"))
+
+    def _draw_slot(self, image, text, slot, pilmoji=None):
+        """
+        컴파일된 TextSlot 위치에 텍스트를 그리는 통합 함수
+        pilmoji에 렌더링 중인 이미지의 이모지 렌더러(_open_emoji_renderer)를 넘기면 그것을 공유합니다.
+        """
+        if not text or text == "N/A" or str(text).strip() == "": 
             return
 
-        # 폰트 결정
-        font_name = kwargs.get("font_name_override")
-        if not font_name:
-            if language == 'ko' and 'font_name_ko' in config:
-                font_name = config['font_name_ko']
-            else:
-                font_name = config.get("font_name", "Inter_18pt-Regular")
+        font = slot.font
+        color = slot.color
+        y = slot.y
 
-        font = self.get_font(font_name, font_size)
-        
-        # 색상, 위치, 정렬 설정
-        color = self._hex_to_rgba(kwargs.get("color", config.get("color", "#000000")))
-        align = kwargs.get("align", config.get("align", "left"))
-        x = kwargs.get("x", config.get("x", 0))
-        y = kwargs.get("y", config.get("y", 0))
-        max_width = config.get("max_width")
-
-        draw = ImageDraw.Draw(image)
-        
-        # 텍스트 래핑 처리
-        text_to_draw = text
-        if max_width:
-            lines = []
-            words = str(text).split(' ')
-            current_line = []
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                if draw.textlength(test_line, font=font) <= max_width:
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    current_line = [word]
-            if current_line:
-                lines.append(' '.join(current_line))
-            text_to_draw = "\n".join(lines)
-
-        # 정렬 처리
-        if align == "center":
-            bbox = draw.textbbox((0, 0), text_to_draw, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = x - text_width // 2
-        elif align == "right":
-            bbox = draw.textbbox((0, 0), text_to_draw, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = x - text_width
+        draw = pilmoji.draw if pilmoji else ImageDraw.Draw(image)
+        lines, x = self._place_text(text, slot)
+        text_to_draw = "\n".join(line for line, _ in lines)
 
         # 텍스트 그리기
+        # 이모지가 없는 문자열은 pilmoji를 거치지 않고 ImageDraw로 바로 그립니다.
         try:
-            with Pilmoji(image) as pilmoji:
+            if not has_emoji(text_to_draw):
+                self._draw_plain_lines(image, (x, y), text_to_draw, color, font)
+            elif pilmoji:
+                pilmoji.source.size = font.size
                 pilmoji.text((x, y), text_to_draw, fill=color, font=font)
+            else:
+                with self._open_emoji_renderer(image) as emoji_renderer:
+                    emoji_renderer.source.size = font.size
+                    emoji_renderer.text((x, y), text_to_draw, fill=color, font=font)
         except Exception:
             # Pilmoji 실패 시 일반 텍스트로 대체
             try:
@@ -234,6 +272,48 @@ class ImageGenerator:
                 default_font = ImageFont.load_default()
                 draw.text((x, y), text_to_draw, fill=color, font=default_font)
 
+    def _place_text(self, text, slot):
+        """텍스트를 슬롯에 배치해 ([(줄, 폭)], 정렬을 적용한 시작 x)를 반환합니다."""
+        # 텍스트 배치: max_width 줄바꿈과 줄 폭 계산 (토큰 폭은 text_layout이 폰트별로 보관)
+        lines = text_layout.layout_lines(text, slot.font, slot.max_width, break_hangul=slot.word_break != "keep_all")
+
+        # 정렬 처리 (배치할 때 잰 줄 폭을 그대로 사용, 여러 줄은 가장 긴 줄 기준)
+        x = slot.x
+        if slot.align == "center":
+            x = x - int(text_layout.block_width(lines)) // 2
+        elif slot.align == "right":
+            x = x - int(text_layout.block_width(lines))
+        return lines, x
+
+    def _text_box(self, slot, text):
+        """
+        _draw_slot이 text를 그릴 때 칠할 수 있는 픽셀을 모두 덮는 사각형 (left, top, right, bottom).
+        글리프의 음수 여백, 아래로 내려가는 획, 이모지 이미지 폭을 감안해 폰트 크기만큼 여유를 둡니다.
+        """
+        if not text or text == "N/A" or str(text).strip() == "":
+            return (0, 0, 0, 0)
+        lines, x = self._place_text(text, slot)
+        size = slot.font.size
+        width = int(text_layout.block_width(lines)) + count_emoji(text) * size
+        height = len(lines) * (size + PILMOJI_LINE_SPACING)
+        return (int(x) - size, int(slot.y) - size, int(x) + width + size, int(slot.y) + height + size)
+
+    def _open_emoji_renderer(self, image):
+        """로컬 이모지 소스를 쓰는 pilmoji 렌더러를 엽니다 (네트워크 요청 없음)."""
+        # 스프라이트는 emoji_source가 (이모지, 크기)별로 보관하므로 pilmoji 자체 캐시는 끕니다.
+        return Pilmoji(image, source=LocalEmojiSource(), cache=False)
+
+    def _draw_plain_lines(self, image, xy, text, color, font):
+        """
+        이모지가 없는 텍스트를 pilmoji와 같은 줄 간격(폰트 크기 + 4px)으로 그립니다.
+        줄마다 래스터화한 마스크는 text_raster가 (폰트, 텍스트)별로 보관해 다른 요소/언어/렌더링과 공유합니다.
+        """
+        x, y = xy
+        for line in str(text).split("\n"):
+            if line:
+                text_raster.draw(image, (x, y), line, color, font)
+            y += PILMOJI_LINE_SPACING + font.size
+
     def _format_time_hhmm_to_readable(self, time_str):
         """HHMM 형식을 HH:MM으로 변환"""
         if not time_str or time_str == "N/A" or len(str(time_str)) != 4: 
@@ -299,46 +379,34 @@ class ImageGenerator:
             type_en = type_en_map.get(warn_type, 'Weather')
             return f"{type_en} {level_en}"
 
-    def create_post_image(self, data, phrase, activity_index_am, activity_index_pm, language='en'):
-        """포스트 이미지 생성"""
-        print(f"포스트 이미지 생성 시작 ({language.upper()})...")
-        
-        # 템플릿 선택 및 로드
-        template_filename = self._select_template_by_weather(data['weather_summary'], language, 'post')
-        template_path = self._get_template_path(template_filename, 'post')
-        
-        if template_path.exists():
-            img = Image.open(template_path).convert("RGBA")
+    def _load_template_image(self, plan, template_filename, format='post'):
+        """템플릿 복사본을 반환합니다. 템플릿이 없으면 계획의 크기/배경색으로 빈 이미지를 만듭니다."""
+        template_path = self._get_template_path(template_filename, format)
+        # 템플릿은 프로세스에서 한 번만 디코딩하고, 그릴 이미지는 그 복사본을 사용합니다.
+        img = template_store.get_template(template_path)
+        if img is not None:
             print(f" → 템플릿 로드 성공: {template_path}")
         else:
             # 기본 이미지 생성
-            size = tuple(self.positions.get("post_template", {}).get("size", [1080, 1350]))
-            bg_color = self._hex_to_rgba(self.positions.get("post_template", {}).get("background_color", "#FFFFFF"))
-            img = Image.new("RGBA", size, bg_color)
+            img = Image.new("RGBA", plan.size, plan.background_color)
             print(f" ⚠️ 템플릿 없음, 기본 배경 생성: {template_path}")
-        
-        # positions 설정 가져오기
-        pos = self.positions.get("post_template", {}).get("elements", {})
-        if not pos:
-            print("❌ positions 설정을 찾을 수 없습니다!")
-            return None, {}
-        
-        # 데이터 추출
+        return img
+
+    def _prepare_texts(self, data, language='en'):
+        """
+        포스트와 스토리가 함께 쓰는 언어별 텍스트를 만듭니다.
+        반환값은 요소 이름 -> 텍스트 딕셔너리이며, rain_info는 줄 목록입니다.
+        """
         ws = data['weather_summary']
         indices = data['indices']
         astro = data['astro_info']
         target_date = data['info']['target_date']
-        warnings = data.get('warnings')
         
         try:
             date_obj = datetime.datetime.strptime(target_date, "%Y%m%d")
         except:
             date_obj = datetime.datetime.now()
 
-        # ========================================
-        # 언어별 텍스트 변수 생성
-        # ========================================
-        
         # 날짜 텍스트
         if language == 'ko':
             weekdays = ["월", "화", "수", "목", "금", "토", "일"]
@@ -427,6 +495,154 @@ class ImageGenerator:
         else:
             moon_phase_name = astro.get('moon_phase_simple', 'N/A')
 
+        return {
+            "date": date_text,
+            "temp_max": temp_max_text,
+            "temp_min": temp_min_text,
+            "temp_diff": temp_diff_text,
+            "rain_info": rain_details,
+            "rain_probability": rain_probability_text,
+            "rain_amount": rain_amount_text,
+            "humidity": humidity_text,
+            "wind": wind_text,
+            "uv_number": uv_number_text,
+            "uv_level": uv_level_text,
+            "air_quality_pm10": air_pm10_text,
+            "air_quality_pm25": air_pm25_text,
+            "daylight": daylight_text,
+            "night": night_text,
+            "sunrise": sunrise_text,
+            "sunset": sunset_text,
+            "moonrise": moonrise_text,
+            "moonset": moonset_text,
+            "moon_emoji": moon_emoji_text,
+            "moon_phase": moon_phase_name,
+        }
+
+    def _line_ops(self, slot, lines):
+        """여러 줄 요소(rain_info)를 slot.line_spacing 간격의 (슬롯, 한 줄) 목록으로 펼칩니다."""
+        return [(slot.replace(y=slot.y + (i * slot.line_spacing)), line) for i, line in enumerate(lines)]
+
+    def _element_ops(self, plan, text_elements):
+        """(요소 이름, 텍스트) 목록을 (슬롯, 텍스트) 목록으로 바꿉니다. 슬롯이나 텍스트가 없는 요소는 건너뜁니다."""
+        ops = []
+        for element_key, text_value in text_elements:
+            slot = plan.get(element_key)
+            if slot and text_value:
+                ops.append((slot, text_value))
+        return ops
+
+    def _draw_ops(self, img, ops):
+        """(슬롯, 텍스트) 목록을 순서대로 그립니다. 이모지 렌더러는 이미지 한 장에 하나만 열어 모든 요소가 공유합니다."""
+        pilmoji = self._open_emoji_renderer(img)
+        for slot, text in ops:
+            try:
+                self._draw_slot(img, text, slot, pilmoji)
+            except Exception as e:
+                print(f"⚠️ {slot.key} 텍스트 그리기 실패: {e}")
+        pilmoji.close()
+
+    def _render_ops(self, plan, template_filename, format, ops, kind=None):
+        """
+        템플릿 복사본에 (슬롯, 텍스트) 목록을 그린 이미지를 반환합니다.
+        부분 렌더링이 켜져 있고 kind(형식)와 언어가 같은 이전 렌더링이 있으면, 바뀐 요소의 영역만 다시 그립니다.
+        """
+        if not (self.incremental and kind):
+            img = self._load_template_image(plan, template_filename, format)
+            self._draw_ops(img, ops)
+            return img
+
+        state_key = (kind, plan.language)
+        template_path = self._get_template_path(template_filename, format)
+        template_digest = template_store.file_digest(template_path)
+        boxes = [self._text_box(slot, text) for slot, text in ops]
+
+        img = None
+        previous = self._render_states.get(state_key)
+        if previous is not None and previous.matches(plan, template_path, template_digest):
+            size = previous.image.size
+            regions = dirty_regions.merge_boxes(dirty_regions.dirty_boxes(previous, ops, boxes), size)
+            fraction = dirty_regions.dirty_fraction(regions, size)
+            if fraction <= dirty_regions.MAX_DIRTY_FRACTION:
+                template = template_store.load_template(template_path)
+                if template is None:
+                    template = Image.new("RGBA", plan.size, plan.background_color)
+                img = previous.image.copy()
+                dirty_regions.patch(img, template, regions, ops, boxes, self._draw_ops)
+                print(f" → 부분 렌더링: 바뀐 영역 {len(regions)}곳 (이미지의 {fraction:.1%})")
+
+        if img is None:
+            img = self._load_template_image(plan, template_filename, format)
+            self._draw_ops(img, ops)
+
+        # 호출한 쪽이 반환된 이미지를 수정해도 다음 부분 렌더링의 바탕이 바뀌지 않도록 복사본을 보관합니다.
+        self._render_states[state_key] = dirty_regions.RenderState(plan, template_path, template_digest, ops, boxes,
+                                                                   img.copy())
+        return img
+
+    def _render_cache_key(self, kind, language, plan, template_filename, format, ops):
+        """
+        렌더링 결과 캐시 키: 그릴 텍스트, 템플릿 파일 내용, positions.json의 해당 템플릿 설정,
+        계획이 쓰는 폰트 파일 내용, 이모지 이미지, 출력 프로필이 모두 같으면 같은 키가 됩니다.
+        """
+        template_path = self._get_template_path(template_filename, format)
+        font_paths = sorted({slot.font.path for slot in plan.text_slots()
+                             if isinstance(getattr(slot.font, "path", None), str)})
+        return render_cache.make_key(
+            kind,
+            language,
+            self.output_profile,
+            [(slot.key, str(text)) for slot, text in ops],
+            template_store.file_digest(template_path),
+            self.positions.get(plan.template),
+            [(Path(path).name, template_store.file_digest(path)) for path in font_paths],
+            emoji_source.assets_digest(),
+        )
+
+    def _cached_render(self, key, description):
+        """캐시에 같은 렌더링 결과가 있으면 그 경로를 반환합니다."""
+        cached_path = render_cache.get(key)
+        if cached_path is not None:
+            print(f"✅ {description} 렌더 캐시 적중: {cached_path}")
+        return cached_path
+
+    def _output_name(self, prefix, language, variant=None):
+        """출력 파일명 앞부분: {prefix}_{언어}[_{변형}] (언어는 항상 세 번째 항목)."""
+        return f"{prefix}_{language}_{variant}" if variant else f"{prefix}_{language}"
+
+    def _save_image(self, img, name, description, tz=None):
+        """이미지를 출력 프로필 형식으로 한 번 인코딩해 출력 디렉토리에 저장하고 경로를 반환합니다 (실패 시 None)."""
+        # 출력 디렉토리 생성
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        timestamp = datetime.datetime.now(tz).strftime("%Y%m%d_%H%M%S")
+        
+        try:
+            output_path = encoder.save(img, self.output_dir / f"{name}_{timestamp}", self.output_profile)
+            print(f"✅ {description} 생성 완료: {output_path}")
+            return output_path
+        except Exception as e:
+            print(f"❌ {description} 저장 실패: {e}")
+            return None
+
+    def _prepare_post(self, data, phrase, activity_index_am, activity_index_pm, language='en'):
+        """포스트의 렌더링 계획, 템플릿 파일명, 그릴 (슬롯, 텍스트) 목록을 반환합니다. 설정이 없으면 None."""
+        # 렌더링 계획 (positions.json을 언어별로 한 번 컴파일한 결과)
+        plan = self.get_layout_plan(language, 'post_template')
+
+        # 템플릿 선택
+        template_filename = self._select_template_by_weather(data['weather_summary'], language, 'post')
+        
+        # positions 설정 확인
+        if not plan.slots:
+            print("❌ positions 설정을 찾을 수 없습니다!")
+            return None
+        
+        warnings = data.get('warnings')
+        texts = self._prepare_texts(data, language)
+        date_text = texts["date"]
+        rain_details = texts["rain_info"]
+
         # 야외활동 지수 포맷
         def format_index_text(index_data):
             grade = index_data.get('grade', 'N/A')
@@ -442,9 +658,9 @@ class ImageGenerator:
         activity_pm_text = format_index_text(activity_index_pm)
 
         # ========================================
-        # 특보 확인 및 텍스트 그리기
+        # 특보 확인
         # ========================================
-        
+
         # 특보 여부 확인
         is_major_warning = False
         warning_text = None
@@ -454,188 +670,198 @@ class ImageGenerator:
                 is_major_warning = True
                 warning_text = self._prepare_warning_text(warnings, language)
 
+        ops = []
         # 특보가 있을 경우 특별 처리
         if is_major_warning and warning_text:
             print(f" → 특보 발효: {warning_text}")
             
-            # 특보용 날짜 위치 사용
-            date_config = pos.get("date_for_warning", pos.get("date", {}))
-            if date_config:
-                self._draw_text(img, date_text, date_config, language)
-            
-            # 특보 정보 위치 사용
-            warning_config = pos.get("warning_info", pos.get("catch_phrase", {}))
-            if warning_config:
-                self._draw_text(img, warning_text, warning_config, language)
+            # 특보용 날짜 위치와 특보 정보 위치 사용
+            date_slot = plan.get("date_for_warning", "date")
+            headline_slot, headline_text = plan.get("warning_info", "catch_phrase"), warning_text
         else:
             # 일반 날씨: 기본 위치 사용
-            date_config = pos.get("date", {})
-            if date_config:
-                self._draw_text(img, date_text, date_config, language)
-            
-            catch_phrase_config = pos.get("catch_phrase", {})
-            if catch_phrase_config:
-                self._draw_text(img, phrase, catch_phrase_config, language)
+            date_slot = plan.get("date")
+            headline_slot, headline_text = plan.get("catch_phrase"), phrase
+        if date_slot:
+            ops.append((date_slot, date_text))
+        if headline_slot:
+            ops.append((headline_slot, headline_text))
 
         # ========================================
-        # 나머지 모든 텍스트 그리기 (language 파라미터 추가)
+        # 나머지 모든 텍스트
         # ========================================
         
-        # rain_info는 여러 줄일 수 있으므로 별도 처리
-        if 'rain_info' in pos and rain_details:
-            rain_config = pos['rain_info']
-            start_y = rain_config.get('y', 0)
-            # positions.json에 정의된 line_spacing 사용, 없으면 폰트 크기 + 4
-            line_spacing = rain_config.get('line_spacing', rain_config.get('font_size', 20) + 4)
-            
-            for i, line in enumerate(rain_details):
-                line_y = start_y + (i * line_spacing)
-                line_config = rain_config.copy()
-                line_config['y'] = line_y
-                
-                try:
-                    self._draw_text(img, line, line_config, language)
-                except Exception as e:
-                    print(f"⚠️ rain_info의 {i+1}번째 줄 그리기 실패: {e}")
-
-        text_elements = [
-            ("temp_max", temp_max_text),
-            ("temp_min", temp_min_text),
-            ("temp_diff", temp_diff_text),
-            ("rain_probability", rain_probability_text),
-            ("rain_amount", rain_amount_text),
-            ("humidity", humidity_text),
-            ("wind", wind_text),
-            ("uv_number", uv_number_text),
-            ("uv_level", uv_level_text),
-            ("air_quality_pm10", air_pm10_text),
-            ("air_quality_pm25", air_pm25_text),
-            ("daylight", daylight_text),
-            ("night", night_text),
-            ("sunrise", sunrise_text),
-            ("sunset", sunset_text),
-            ("moonrise", moonrise_text),
-            ("moonset", moonset_text),
-            ("moon_emoji", moon_emoji_text),
-            ("moon_phase", moon_phase_name),
+        # rain_info는 여러 줄일 수 있으므로 한 줄씩 펼침
+        # positions.json에 정의된 line_spacing 사용, 없으면 폰트 크기 + 4 (컴파일 시 결정)
+        rain_slot = plan.get('rain_info')
+        if rain_slot and rain_details:
+            ops.extend(self._line_ops(rain_slot, rain_details))
+
+        text_elements = [(key, texts[key]) for key in POST_TEXT_ELEMENTS] + [
             ("activity_index_am", activity_am_text),
             ("activity_index_pm", activity_pm_text),
         ]
+        ops.extend(self._element_ops(plan, text_elements))
+        return plan, template_filename, ops
 
-        for element_key, text_value in text_elements:
-            if element_key in pos and text_value:
-                try:
-                    self._draw_text(img, text_value, pos[element_key], language)
-                except Exception as e:
-                    print(f"⚠️ {element_key} 텍스트 그리기 실패: {e}")
+    def render_post_image(self, data, phrase, activity_index_am, activity_index_pm, language='en'):
+        """포스트 이미지를 메모리에서 그려 RGBA 이미지로 반환합니다 (저장하지 않음). 설정이 없으면 None."""
+        prepared = self._prepare_post(data, phrase, activity_index_am, activity_index_pm, language)
+        if prepared is None:
+            return None
+        plan, template_filename, ops = prepared
+        return self._render_ops(plan, template_filename, 'post', ops, kind="post")
+
+    def create_post_image(self, data, phrase, activity_index_am, activity_index_pm, language='en', variant=None):
+        """
+        포스트 이미지 생성
+        반환값의 두 번째 딕셔너리에는 그린 이미지("image")와 렌더 캐시 키("cache_key")가 들어 있어,
+        스토리 이미지를 PNG를 다시 읽지 않고 만들 수 있습니다. 렌더 캐시에 적중하면 "image"는 None입니다.
+        variant(예: 도시 이름)를 주면 같은 언어의 다른 변형과 겹치지 않게 파일명에 붙입니다.
+        """
+        print(f"포스트 이미지 생성 시작 ({language.upper()})...")
+        prepared = self._prepare_post(data, phrase, activity_index_am, activity_index_pm, language)
+        if prepared is None:
+            return None, {}
+        plan, template_filename, ops = prepared
+
+        cache_key = self._render_cache_key("post", language, plan, template_filename, 'post', ops)
+        cached_path = self._cached_render(cache_key, "포스트 이미지")
+        if cached_path is not None:
+            return cached_path, {"image": None, "cache_key": cache_key}
+
+        img = self._render_ops(plan, template_filename, 'post', ops, kind="post")
 
         # ========================================
         # 이미지 저장
         # ========================================
-        
-        # 출력 디렉토리 생성
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = self.output_dir / f"weather_post_{language}_{timestamp}.png"
-        
-        try:
-            img.save(output_path, "PNG")
-            print(f"✅ 포스트 이미지 생성 완료: {output_path}")
-            return output_path, {}
-        except Exception as e:
-            print(f"❌ 이미지 저장 실패: {e}")
+        output_path = self._save_image(img, self._output_name("weather_post", language, variant), "포스트 이미지")
+        if output_path is None:
             return None, {}
+        render_cache.put(cache_key, output_path, kind="post")
+        return output_path, {"image": img, "cache_key": cache_key}
 
     def get_font(self, font_name="Inter_18pt-Regular", size=20):
-        """폰트를 로드하는 함수 (한국어/영어 동일한 방식 처리)"""
-        
-        # 1. 프로젝트 폰트 디렉토리에서 찾기 (정확한 이름으로)
-        if font_name in self.font_paths:
-            font_path = self.font_paths[font_name]
-            if font_path.exists():
-                try:
-                    font = ImageFont.truetype(str(font_path), size, encoding='unic')
-                    return font
-                except (IOError, OSError) as e:
-                    print(f"⚠️ 폰트 로드 실패: {font_name}")
-        
-        # 2. 확장자 있는 파일명으로 시도
-        for ext in ['.ttf', '.otf', '.ttc']:
-            font_path = self.fonts_dir / f"{font_name}{ext}"
-            if font_path.exists():
-                try:
-                    return ImageFont.truetype(str(font_path), size, encoding='unic')
-                except (IOError, OSError):
-                    continue
-        
-        # 3. 한국어 폰트 요청 시 대체 시도
-        if 'Nanum' in font_name or font_name in ['NanumSquareNeo-bRg', 'NanumSquareNeo-cBd', 'NanumSquareNeo-dEb', 'NanumSquareNeo-eHv']:
-            fallback_fonts = ["malgun.ttf", "NanumGothic.ttf", "gulim.ttc"]
-            for fallback in fallback_fonts:
-                try:
-                    return ImageFont.truetype(fallback, size, encoding='unic')
-                except (IOError, OSError):
-                    continue
-            print(f"⚠️ 한국어 폰트 실패, 영어 폰트로 대체: {font_name}")
-            return self.get_font("Inter_18pt-Regular", size)
-        
-        # 4. 영어 폰트 대체
-        system_fonts = ["arial.ttf", "calibri.ttf", "tahoma.ttf"]
-        for sys_font in system_fonts:
-            try:
-                return ImageFont.truetype(sys_font, size, encoding='unic')
-            except (IOError, OSError):
-                continue
-        
-        # 5. 최후의 수단
-        print(f"❌ 모든 폰트 실패, 기본 폰트 사용: {font_name}")
-        try:
-            return ImageFont.load_default(size)
-        except:
-            return ImageFont.load_default()
-
-    def create_story_image(self, data, phrase, language='en'):
-        """스토리 이미지 생성 (향후 구현)"""
-        print(f"스토리 이미지 생성은 현재 구현되지 않았습니다 ({language}).")
-        return None, None
-
-    def create_story_from_post(self, post_image_path):
-        """생성된 포스트 이미지를 잘리지 않게 스토리 규격으로 변환합니다."""
-        if not post_image_path or not Path(post_image_path).exists():
-            print("❌ 원본 포스트 이미지가 없어 스토리 이미지를 생성할 수 없습니다.")
+        """
+        폰트를 로드하는 함수 (한국어/영어 동일한 방식 처리)
+        대체 폰트 결정과 폰트 객체는 rendering.font_cache에서 프로세스 전체가 공유합니다.
+        """
+        return font_cache.get_font(font_name, size, self.font_paths, self.fonts_dir)
+
+    def _prepare_story(self, data, phrase, language='en'):
+        """스토리 카드의 렌더링 계획, 템플릿 파일명, 그릴 (슬롯, 텍스트) 목록을 반환합니다. 설정이 없으면 None."""
+        plan = self.get_layout_plan(language, 'story_template')
+        template_filename = self._select_template_by_weather(data['weather_summary'], language, 'story')
+
+        if not plan.slots:
+            print("❌ story_template 설정을 찾을 수 없습니다!")
             return None
 
-        print(f"→ 포스트 이미지를 스토리 규격으로 변환 시작: {post_image_path}")
-
-        # 1. 검은색 스토리 배경 생성 (1080x1920)
-        story_bg = Image.new("RGBA", (1080, 1920), (0, 0, 0, 255))
-
-        # 2. 포스트 이미지 불러오기
-        post_img = Image.open(post_image_path).convert("RGBA")
-
-        # 3. 포스트 이미지를 중앙에 위치시킬 좌표 계산
-        # x 좌표는 (1080 - 1080) / 2 = 0
-        # y 좌표는 (1920 - 1350) / 2 = 285
-        paste_position = (0, 285)
-
-        # 4. 배경 위에 포스트 이미지 붙여넣기
-        story_bg.paste(post_img, paste_position)
+        ws = data['weather_summary']
+        texts = self._prepare_texts(data, language)
+        if language == 'ko':
+            humidity_wind_text = f"습도 {texts['humidity']} · 바람 {texts['wind']}"
+            uv_label, sunrise_label, sunset_label = "자외선", "일출", "일몰"
+        else:
+            humidity_wind_text = f"Humidity {texts['humidity']} · Wind {texts['wind']}"
+            uv_label, sunrise_label, sunset_label = "UV", "Sunrise", "Sunset"
+        uv_air_text = (f"{uv_label} {texts['uv_number']} {texts['uv_level']} · "
+                       f"{texts['air_quality_pm10']} · {texts['air_quality_pm25']}")
+        sun_text = f"{sunrise_label} {texts['sunrise']} · {sunset_label} {texts['sunset']}"
+        moon_text = f"{texts['moon_emoji']} {texts['moon_phase']}"
+
+        ops = []
+        rain_slot = plan.get('rain_info')
+        if rain_slot and texts['rain_info']:
+            ops.extend(self._line_ops(rain_slot, texts['rain_info']))
+
+        ops.extend(self._element_ops(plan, [
+            ("date", texts['date']),
+            ("catch_phrase", phrase),
+            ("temp_max", texts['temp_max']),
+            ("temp_min", texts['temp_min']),
+            ("temp_diff", texts['temp_diff']),
+            ("humidity_wind", humidity_wind_text),
+            ("uv_air", uv_air_text),
+            ("sun_info", sun_text),
+            ("moon_info", moon_text),
+        ]))
+
+        # 시간대별 기온: 열마다 제목과 그 시각의 기온을 그립니다.
+        hourly_temps = ws.get('hourly_temps') or []
+        for column in plan.get('hourly_temps') or ():
+            temp = hourly_temps[column.hour] if column.hour is not None and column.hour < len(hourly_temps) else None
+            ops.append((column.title, column.label))
+            ops.append((column.value, f"{round(temp)}°" if temp is not None else "N/A"))
+
+        return plan, template_filename, ops
+
+    def render_story_image(self, data, phrase, language='en'):
+        """positions.json의 story_template과 templates/story_*.png로 스토리 이미지를 메모리에서 그립니다 (저장하지 않음)."""
+        prepared = self._prepare_story(data, phrase, language)
+        if prepared is None:
+            return None
+        plan, template_filename, ops = prepared
+        return self._render_ops(plan, template_filename, 'story', ops, kind="story_card")
+
+    def create_story_image(self, data, phrase, language='en', variant=None):
+        """스토리 템플릿으로 스토리 이미지 생성. (경로, {"image": 이미지, "cache_key": 키})를 반환합니다."""
+        print(f"스토리 이미지 생성 시작 ({language.upper()})...")
+        prepared = self._prepare_story(data, phrase, language)
+        if prepared is None:
+            return None, {}
+        plan, template_filename, ops = prepared
 
-        # 5. 새 스토리 이미지 저장
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d_%H%M%S")
-        # 원본 파일명에서 언어 코드 추출
-        language = Path(post_image_path).stem.split('_')[2]
-        output_path = self.output_dir / f"weather_story_{language}_{timestamp}.png"
+        cache_key = self._render_cache_key("story_card", language, plan, template_filename, 'story', ops)
+        cached_path = self._cached_render(cache_key, "스토리 이미지")
+        if cached_path is not None:
+            return cached_path, {"image": None, "cache_key": cache_key}
 
-        try:
-            story_bg.save(output_path, "PNG")
-            print(f"✅ 스토리 규격 이미지 생성 완료: {output_path}")
-            return output_path
-        except Exception as e:
-            print(f"❌ 스토리 규격 이미지 저장 실패: {e}")
-            return None
+        img = self._render_ops(plan, template_filename, 'story', ops, kind="story_card")
+        output_path = self._save_image(img, self._output_name("weather_story_card", language, variant), "스토리 이미지",
+                                       ZoneInfo("Asia/Seoul"))
+        if output_path is None:
+            return None, {}
+        render_cache.put(cache_key, output_path, kind="story_card")
+        return output_path, {"image": img, "cache_key": cache_key}
+
+    def compose_story_from_post(self, post_img):
+        """포스트 이미지를 검은 스토리 배경(1080x1920) 가운데에 놓은 새 이미지를 반환합니다."""
+        story_bg = Image.new("RGBA", STORY_SIZE, (0, 0, 0, 255))
+        story_bg.paste(post_img, STORY_POST_POSITION)
+        return story_bg
+
+    def create_story_from_post(self, post_image, language=None, cache_key=None, variant=None):
+        """
+        생성된 포스트 이미지를 잘리지 않게 스토리 규격으로 변환합니다.
+        post_image에는 create_post_image가 반환한 이미지(PNG를 다시 읽지 않음) 또는 저장된 PNG 경로를 넘깁니다.
+        경로를 넘기고 language를 생략하면 파일명(weather_post_{언어}_...)에서 언어를 읽습니다.
+        cache_key에 포스트의 렌더 캐시 키를 넘기면, 같은 포스트로 만든 스토리 이미지가 캐시에 있을 때 그 경로를 반환합니다.
+        """
+        story_key = render_cache.derive_key(cache_key, "story") if cache_key else None
+        cached_path = self._cached_render(story_key, "스토리 규격 이미지")
+        if cached_path is not None:
+            return cached_path
+
+        if isinstance(post_image, Image.Image):
+            post_img = post_image.convert("RGBA") if post_image.mode != "RGBA" else post_image
+            print(f"→ 포스트 이미지를 스토리 규격으로 변환 시작 (메모리, {language})")
+        else:
+            if not post_image or not Path(post_image).exists():
+                print("❌ 원본 포스트 이미지가 없어 스토리 이미지를 생성할 수 없습니다.")
+                return None
+            print(f"→ 포스트 이미지를 스토리 규격으로 변환 시작: {post_image}")
+            with Image.open(post_image) as source:
+                post_img = source.convert("RGBA")
+            if language is None:
+                # 원본 파일명에서 언어 코드 추출
+                language = Path(post_image).stem.split('_')[2]
+
+        story_img = self.compose_story_from_post(post_img)
+        output_path = self._save_image(story_img, self._output_name("weather_story", language, variant), "스토리 규격 이미지",
+                                       ZoneInfo("Asia/Seoul"))
+        render_cache.put(story_key, output_path, kind="story")
+        return output_path
         
     def test_coordinates(self):
         """좌표 테스트 (향후 구현)"""
@@ -2,18 +2,24 @@
 # Instagram API 연동 및 포스팅 기능
 # 캐러셀, 스토리 포스팅 등을 담당합니다.
 
+import base64
 import requests
 import datetime
 from zoneinfo import ZoneInfo # 시간대 정보 라이브러리
-from imgurpython import ImgurClient
 from pathlib import Path
 
+from api_clients import http_client
+
 class InstagramAPI:
+    # Graph API는 image_url을 직접 내려받으므로 데이터 API보다 여유 있게 대기합니다.
+    REQUEST_TIMEOUT = 30
+
     def __init__(self, access_token, user_id, imgur_client_id):
         self.access_token = access_token
         self.user_id = user_id
         self.imgur_client_id = imgur_client_id
         self.base_url = "https://graph.facebook.com/v20.0"
+        self.imgur_upload_url = "https://api.imgur.com/3/upload"
         
     def upload_to_imgur(self, image_path):
         """
@@ -24,8 +30,18 @@ class InstagramAPI:
             print("❌ Imgur 클라이언트 ID가 설정되지 않았습니다.")
             return None
         try:
-            client = ImgurClient(self.imgur_client_id, None)
-            uploaded_image = client.upload_from_path(str(image_path), config=None, anon=True)
+            # 익명 업로드 API를 공유 세션으로 직접 호출합니다.
+            # (ImgurClient는 생성할 때마다 credits 조회 요청을 한 번 더 보냅니다)
+            with open(image_path, 'rb') as f:
+                image_b64 = base64.b64encode(f.read())
+            response = http_client.post(
+                self.imgur_upload_url,
+                data={'image': image_b64, 'type': 'base64'},
+                headers={'Authorization': f'Client-ID {self.imgur_client_id}'},
+                timeout=self.REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+            uploaded_image = response.json()['data']
             print(f"✅ Imgur 업로드 성공! URL: {uploaded_image['link']}")
             return uploaded_image['link']
         except Exception as e:
@@ -47,7 +63,7 @@ class InstagramAPI:
             params['caption'] = caption
             
         try:
-            response = requests.post(url, params=params)
+            response = http_client.post(url, params=params, timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             result = response.json()
             
@@ -77,7 +93,7 @@ class InstagramAPI:
         }
         
         try:
-            response = requests.post(url, params=params)
+            response = http_client.post(url, params=params, timeout=self.REQUEST_TIMEOUT)
             print(f"요청 URL: {response.request.url}")
             print(f"요청 바디: {response.request.body}")
             print(f"응답 코드: {response.status_code}")
@@ -109,7 +125,7 @@ class InstagramAPI:
         }
         
         try:
-            response = requests.post(url, params=params)
+            response = http_client.post(url, params=params, timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             result = response.json()
             
@@ -205,7 +221,7 @@ class InstagramAPI:
         }
         
         try:
-            response = requests.post(url, params=params)
+            response = http_client.post(url, params=params, timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
             result = response.json()
             
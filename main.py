@@ -6,7 +6,6 @@ import datetime
 import json
 import os
 import subprocess # git 명령 실행을 위해 추가
-import time  # 재시도 대기를 위해 추가
 import sys   # 실패 시 프로그램 종료를 위해 추가
 from pathlib import Path
 from zoneinfo import ZoneInfo # 시간대 정보 라이브러리
@@ -17,7 +16,8 @@ from config import (
     SEOUL_NX, SEOUL_NY, SEOUL_AREA_ID,
     INSTAGRAM_ACCESS_TOKEN, INSTAGRAM_USER_ID, IMGUR_CLIENT_ID
 )
-from api_clients import kma_api, kasi_api, airkorea_api
+from api_clients import kma_api
+from data_fetcher import fetch_all_data
 from data_processor import (
     process_weather_data, 
     process_uv_index, 
@@ -25,15 +25,16 @@ from data_processor import (
     process_weather_warnings
 )
 from forecast_generator import (
-    analyze_processed_data, 
+    compute_weather_analysis,
+    localize_weather_analysis,
     create_instagram_summary
 )
-from astro_processor import get_complete_astro_info
-from image_generator import ImageGenerator
 from weather_phrases import WeatherPhraseGenerator
 from weather_phrases_ko import WeatherPhraseGenerator as WeatherPhraseGeneratorKo
-from outdoor_activity_index import calculate_activity_index
+from outdoor_activity_index import compute_activity_curve, localize_activity_index
 from instagram_api import InstagramAPI, post_daily_weather
+from rendering import font_cache, render_cache, template_store, text_raster
+from rendering.render_executor import RenderJob, render_all
 
 # main.py 파일의 위치를 기준으로 상대 경로 설정
 BASE_DIR = Path(__file__).parent
@@ -45,8 +46,8 @@ def get_base_datetime():
     API 데이터 생성 지연(약 15분)을 고려하여 현재 시간에서 20분을 뺀 시간을 기준으로, 요청 가능한 가장 최신 시간을 결정합니다.
     """
     now = datetime.datetime.now(ZoneInfo("Asia/Seoul")) # 한국 시간 기준
-    base_criteria_time = now - datetime.timedelta(minutes=20)
-    available_hours = [2, 5, 8, 11, 14, 17, 20, 23]
+    base_criteria_time = now - datetime.timedelta(minutes=kma_api.VILAGE_FCST_RELEASE_DELAY_MINUTES)
+    available_hours = kma_api.VILAGE_FCST_BASE_HOURS
     
     base_date = base_criteria_time.strftime('%Y%m%d')
     base_hour = None
@@ -93,10 +94,6 @@ def main():
     """
     메인 실행 함수
     """
-    # -- 설정값 --
-    MAX_RETRIES = 3  # API 데이터 수집 최대 재시도 횟수
-    RETRY_DELAY_SECONDS = 30  # 재시도 간격 (초)
-
     # 1. 날짜 및 시간 설정 (한국 시간 기준)
     kst = ZoneInfo("Asia/Seoul")
     base_date, base_time = get_base_datetime()
@@ -108,47 +105,16 @@ def main():
     print(f"Base Time: {base_date} {base_time}")
     print("="*50)
 
-    # 2. API 데이터 수집 (재시도 로직 포함)
+    # 2. API 데이터 수집 (소스별 재시도 로직 포함)
+    # 필수 데이터(단기예보, 일출/일몰)의 검증과 재시도는 data_fetcher에서 소스별로 처리합니다.
     print("1. 모든 API 요청 중...")
-    all_data = None
-    for attempt in range(MAX_RETRIES):
-        print(f" -> 데이터 수집 시도 ({attempt + 1}/{MAX_RETRIES})...")
-        
-        # 모든 API를 호출하여 원시 데이터를 가져옵니다.
-        raw_weather_data = kma_api.get_weather_forecast(KMA_API_KEY, base_date, base_time, SEOUL_NX, SEOUL_NY)
-        raw_uv_data = kasi_api.get_uv_index(KASI_API_KEY, SEOUL_AREA_ID, target_date)
-        raw_warning_data = kma_api.get_weather_warnings(KMA_API_KEY, target_date)
-        search_date_for_air = f"{target_date[:4]}-{target_date[4:6]}-{target_date[6:]}"
-        raw_air_forecast_pm10 = airkorea_api.get_air_forecast(AIRKOREA_API_KEY, search_date_for_air, inform_code='PM10')
-        raw_air_forecast_pm25 = airkorea_api.get_air_forecast(AIRKOREA_API_KEY, search_date_for_air, inform_code='PM25')
-        astro_info = get_complete_astro_info(KASI_API_KEY, target_date, "서울")
-
-        # 데이터 검증: 포스트 생성에 필수적인 데이터가 정상적으로 수신되었는지 확인합니다.
-        # 기상청 단기예보(날씨, 기온)와 천문정보(일출/일몰)는 포스트의 핵심 정보이므로 반드시 필요합니다.
-        is_valid = (
-            raw_weather_data and raw_weather_data.get('response', {}).get('body') and
-            astro_info and astro_info.get('sunrise')
-        )
-
-        if is_valid:
-            print(" -> 모든 필수 데이터 수집 성공.")
-            # 수집된 모든 데이터를 하나의 딕셔너리로 묶습니다.
-            all_data = {
-                "weather": raw_weather_data,
-                "uv": raw_uv_data,
-                "warnings": raw_warning_data,
-                "air_pm10": raw_air_forecast_pm10,
-                "air_pm25": raw_air_forecast_pm25,
-                "astro": astro_info
-            }
-            break  # 데이터 수집에 성공했으므로 재시도 루프를 탈출합니다.
-        
-        # 재시도 횟수가 남아있을 경우, 다음 시도 전에 잠시 대기합니다.
-        if attempt < MAX_RETRIES - 1:
-            print(f" -> 필수 데이터 누락. {RETRY_DELAY_SECONDS}초 후 재시도합니다.")
-            time.sleep(RETRY_DELAY_SECONDS)
-    
-    # 최종 확인: 모든 재시도 후에도 데이터 수집에 실패했다면, 에러를 기록하고 프로그램을 종료합니다.
+    all_data = fetch_all_data(
+        KMA_API_KEY, AIRKOREA_API_KEY, KASI_API_KEY,
+        base_date, base_time, target_date,
+        SEOUL_NX, SEOUL_NY, SEOUL_AREA_ID, location="서울"
+    )
+
+    # 최종 확인: 재시도 후에도 필수 데이터 수집에 실패했다면, 에러를 기록하고 프로그램을 종료합니다.
     if not all_data:
         print("="*50)
         print("❌ 최종 데이터 수집 실패. 프로그램을 종료합니다.")
@@ -183,8 +149,7 @@ def main():
     main_air_quality = pm10_status if status_priority.get(pm10_status, 0) >= status_priority.get(pm25_status, 0) else pm25_status
 
     # 안전한 기본값 설정 (원시 데이터에서 직접 계산)
-    temps = [t['value'] for t in processed_today.get('temperatures', [])]
-    daily_max_temp = processed_today.get('temp_max') or (max(temps) if temps else 20)
+    daily_max_temp = processed_today.temp_max if processed_today.temp_max is not None else 20
     daily_uv_max = uv_index if uv_index and uv_index != 'N/A' else 5  # 기본값 5
 
     print(f" -> 일최고기온: {daily_max_temp}°C, UV지수: {daily_uv_max}, 주요대기질: {main_air_quality}")
@@ -205,17 +170,27 @@ def main():
     }
     print(" -> 기본 데이터 구조 생성 완료.")
 
+    # 언어와 무관한 수치 분석과 야외활동 지수는 한 번만 계산하고, 언어별로는 문구만 만듭니다.
+    weather_analysis = compute_weather_analysis(processed_today, target_date, yesterday_temps, warnings)
+    print(" -> 야외활동 지수 계산 중...")
+    activity_curve = compute_activity_curve([processed_today], [daily_max_temp], daily_uv_max, main_air_quality)
+    activity_score_am = activity_curve.slot('am')
+    activity_score_pm = activity_curve.slot('pm')
+    best_hours = activity_curve.best_hours()
+    print(f" -> 외출하기 좋은 시간: {best_hours['start']:02d}:00-{best_hours['end']:02d}:00 (점수 {best_hours['score']})")
+
     # 7. 언어별 이미지 생성
     print("\n5. 언어별 이미지 생성 중...")
     languages = ['en', 'ko']
     generated_images = {}
     lang_data = {}  # 캐치프레이즈 등 언어별 데이터 저장
+    render_jobs = []  # (언어, 형식)별 렌더링 작업, 데이터 준비 후 한꺼번에 실행
 
     for lang in languages:
         print(f"\n--- {lang.upper()} 버전 생성 시작 ---")
         
         # 언어별 날씨 요약 생성
-        weather_summary = analyze_processed_data(processed_today, target_date, yesterday_temps, warnings, language=lang)
+        weather_summary = localize_weather_analysis(weather_analysis, language=lang)
         
         # 언어별 캐치프레이즈 생성기 선택
         if lang == 'ko':
@@ -238,10 +213,9 @@ def main():
             'weather_summary': weather_summary
         }
 
-        # 야외활동 지수 계산 (언어별)
-        print(f" -> 야외활동 지수 계산 중 ({lang})...")
-        index_am = calculate_activity_index(processed_today, 'am', daily_max_temp, daily_uv_max, main_air_quality, language=lang)
-        index_pm = calculate_activity_index(processed_today, 'pm', daily_max_temp, daily_uv_max, main_air_quality, language=lang)
+        # 야외활동 지수 (언어별 문구)
+        index_am = localize_activity_index(activity_score_am, language=lang)
+        index_pm = localize_activity_index(activity_score_pm, language=lang)
         print(f" -> 오전 지수: {index_am['grade']}")
         print(f" -> 오후 지수: {index_pm['grade']}")
 
@@ -249,22 +223,30 @@ def main():
         final_data['indices']['activity_index_am'] = index_am
         final_data['indices']['activity_index_pm'] = index_pm
 
-        # 이미지 생성
-        img_gen = ImageGenerator()
-        img_gen.setup()
-        image_path, _ = img_gen.create_post_image(final_data, catch_phrase, index_am, index_pm, language=lang)
-        
+        # 이미지 생성 작업 (한국어는 포스트 이미지로 스토리용 이미지도 생성)
+        render_jobs.append(RenderJob(lang, 'post', final_data, catch_phrase, index_am, index_pm))
+        if lang == 'ko':
+            render_jobs.append(RenderJob(lang, 'story', final_data, catch_phrase, index_am, index_pm))
+
+    # 언어별 이미지는 서로 독립적이므로 여러 프로세스에서 동시에 렌더링합니다 (결과는 작업 순서대로).
+    print("\n--- 이미지 렌더링 ---")
+    for job, image_path in render_all(render_jobs):
+        image_key = job.language if job.format == 'post' else f"{job.format}_{job.language}"
         if image_path:
-            generated_images[lang] = image_path
-            print(f" -> {lang.upper()} 이미지 생성 완료: {image_path}")
-
-            # 한국어 포스트 이미지가 생성되면, 바로 스토리용 이미지도 생성
-            if lang == 'ko':
-                story_image_path = img_gen.create_story_from_post(image_path)
-                if story_image_path:
-                    generated_images['story_ko'] = story_image_path
+            generated_images[image_key] = image_path
+            print(f" -> {image_key.upper()} 이미지 생성 완료: {image_path}")
         else:
-            print(f" -> ❌ {lang.upper()} 이미지 생성 실패")
+            print(f" -> ❌ {image_key.upper()} 이미지 생성 실패")
+
+    font_cache.print_stats()
+    template_store.print_stats()
+    text_raster.print_stats()
+    render_cache.print_stats()
+
+    # 렌더 캐시 정리 (오래되었거나 개수를 넘는 캐시 항목만 삭제, 출력 이미지는 그대로 둠)
+    pruned = render_cache.prune()
+    if pruned["removed"]:
+        print(f" -> 렌더 캐시 정리: 항목 {pruned['removed']}개 삭제, {pruned['kept']}개 보관")
 
     # 8. Instagram 포스팅 (GitHub Actions 환경에서만 실행)
     if os.getenv('CI') == 'true':
@@ -296,9 +278,8 @@ def main():
 
     # 9. 오늘 최고/최저 기온 저장 (원시 데이터에서 직접 계산)
     print(f"\n7. 데이터 저장 중...")
-    temps = [t['value'] for t in processed_today.get('temperatures', [])]
-    temp_max_for_save = processed_today.get('temp_max') or (max(temps) if temps else None)
-    temp_min_for_save = processed_today.get('temp_min') or (min(temps) if temps else None)
+    temp_max_for_save = processed_today.temp_max
+    temp_min_for_save = processed_today.temp_min
     
     today_temps_to_save = {
         'yesterday_max_temp': temp_max_for_save,
@@ -1,6 +1,10 @@
 # outdoor_activity_index.py
 # Calculates the outdoor activity index based on weather data.
 
+import numpy as np
+
+from hourly_table import HOURS_PER_DAY
+
 # =======================================
 # 1. 감점 요인 정의 (영문/한글)
 # =======================================
@@ -25,70 +29,99 @@ REASON_MAPPING_KO = {
 }
 
 # =======================================
-# 2. 개별 점수 계산 함수 (기존과 동일)
+# 2. 개별 점수 계산 함수 (구간표 기반, 배열 입력 지원)
 # =======================================
+# 각 구간표는 (하한, 상한, 경계 포함 방식, 점수)의 목록이며 위에서부터 처음 일치하는 구간의 점수를 사용합니다.
+# 경계 포함 방식: "both" = 하한 <= x <= 상한, "left" = 하한 <= x < 상한, "right" = 하한 < x <= 상한
+
+_INF = float("inf")
+
+_TEMPERATURE_TABLES = {
+    "summer": (  # 덥거나 따뜻한 날
+        [(18, 24, "both", 30),
+         (15, 18, "left", 25), (24, 26, "right", 25),
+         (12, 15, "left", 20), (26, 28, "right", 20),
+         (28, 30, "right", 10)], 5),
+    "winter": (  # 추운 날
+        [(5, 10, "both", 30),
+         (2, 5, "left", 25), (10, 12, "right", 25),
+         (-1, 2, "left", 20), (12, 14, "right", 20),
+         (-5, -1, "left", 10)], 5),
+    "mild": (  # 온화한 날 (봄/가을)
+        [(14, 20, "both", 30),
+         (11, 14, "left", 25), (20, 22, "right", 25),
+         (8, 11, "left", 20), (22, 24, "right", 20)], 10),
+}
+
+_HUMIDITY_TABLE = (
+    [(40, 60, "both", 20),
+     (30, 40, "left", 15), (60, 70, "right", 15),
+     (70, 80, "right", 10)], 5)
+
+_WIND_TABLES = {
+    "summer": (  # 더울 땐 바람이 긍정적
+        [(2, 4, "both", 10),
+         (-_INF, 2, "left", 8),
+         (4, 6, "right", 6)], 2),
+    "winter": (  # 추울 땐 바람이 부정적
+        [(-_INF, 1, "left", 10),
+         (1, 3, "left", 5)], 0),
+    "mild": (  # 온화한 날
+        [(-_INF, 3, "left", 10),
+         (3, 6, "left", 7),
+         (6, 9, "left", 4)], 2),
+}
+
+_RAIN_PROB_TABLE = (
+    [(-_INF, 10, "right", 15),
+     (10, 30, "right", 10),
+     (30, 50, "right", 5)], 0)
+
+_RAIN_AMOUNT_TABLE = (
+    [(-_INF, 0.5, "left", 10),
+     (0.5, 1, "left", 7),
+     (1, 3, "left", 4)], 0)
+
+SEASON_MODES = ("summer", "winter", "mild")
+
+
+def _score_by_table(values, table):
+    """구간표로 점수를 매깁니다. values는 스칼라 또는 배열이며 같은 모양의 정수 배열을 반환합니다."""
+    values = np.asarray(values, dtype=np.float64)
+    intervals, default = table
+    conditions = []
+    for low, high, closed, _ in intervals:
+        lower = values >= low if closed in ("both", "left") else values > low
+        upper = values <= high if closed in ("both", "right") else values < high
+        conditions.append(lower & upper)
+    return np.select(conditions, [score for _, _, _, score in intervals], default)
+
+
+def _score_by_mode(values, modes, tables):
+    """계절 모드(SEASON_MODES의 인덱스 배열)에 따라 다른 구간표로 점수를 매깁니다."""
+    scores = [_score_by_table(values, tables[mode]) for mode in SEASON_MODES]
+    return np.choose(modes, scores)
+
+
+def _mode_index(mode):
+    return np.asarray(SEASON_MODES.index(mode) if isinstance(mode, str) else mode)
+
 
 def _score_temperature(temp, mode):
-    """온도 점수 계산 (30점 만점)"""
-    score = 0
-    if mode == "summer": # 덥거나 따뜻한 날
-        if 18 <= temp <= 24: score = 30
-        elif 15 <= temp < 18 or 24 < temp <= 26: score = 25
-        elif 12 <= temp < 15 or 26 < temp <= 28: score = 20
-        elif 28 < temp <= 30: score = 10
-        else: score = 5
-    elif mode == "winter": # 추운 날
-        if 5 <= temp <= 10: score = 30
-        elif 2 <= temp < 5 or 10 < temp <= 12: score = 25
-        elif -1 <= temp < 2 or 12 < temp <= 14: score = 20
-        elif -5 <= temp < -1: score = 10
-        else: score = 5
-    else: # 온화한 날 (봄/가을)
-        if 14 <= temp <= 20: score = 30
-        elif 11 <= temp < 14 or 20 < temp <= 22: score = 25
-        elif 8 <= temp < 11 or 22 < temp <= 24: score = 20
-        else: score = 10
-    return score
+    """온도 점수 계산 (30점 만점). mode는 "summer"/"winter"/"mild" 또는 모드 인덱스 배열"""
+    return _score_by_mode(temp, _mode_index(mode), _TEMPERATURE_TABLES)
 
 def _score_humidity(humidity):
     """습도 점수 계산 (20점 만점)"""
-    if 40 <= humidity <= 60: return 20
-    elif 30 <= humidity < 40 or 60 < humidity <= 70: return 15
-    elif 70 < humidity <= 80: return 10
-    else: return 5
+    return _score_by_table(humidity, _HUMIDITY_TABLE)
 
 def _score_wind(wind, mode):
     """바람 점수 계산 (10점 만점, 계절별 로직)"""
-    if mode == "summer": # 더울 땐 바람이 긍정적
-        if 2 <= wind <= 4: return 10
-        elif wind < 2: return 8
-        elif 4 < wind <= 6: return 6
-        else: return 2
-    elif mode == "winter": # 추울 땐 바람이 부정적
-        if wind < 1: return 10
-        elif 1 <= wind < 3: return 5
-        else: return 0
-    else: # 온화한 날
-        if wind < 3: return 10
-        elif 3 <= wind < 6: return 7
-        elif 6 <= wind < 9: return 4
-        else: return 2
+    return _score_by_mode(wind, _mode_index(mode), _WIND_TABLES)
 
 def _score_precipitation(prob, amount):
     """강수 점수 계산 (25점 만점)"""
-    prob_score = 0
-    if prob <= 10: prob_score = 15
-    elif prob <= 30: prob_score = 10
-    elif prob <= 50: prob_score = 5
-    else: prob_score = 0
-
-    amount_score = 0
-    if amount < 0.5: amount_score = 10
-    elif amount < 1: amount_score = 7
-    elif amount < 3: amount_score = 4
-    else: amount_score = 0
-    
-    return prob_score + amount_score
+    return _score_by_table(prob, _RAIN_PROB_TABLE) + _score_by_table(amount, _RAIN_AMOUNT_TABLE)
 
 def _score_air_quality(air_quality_status):
     """공기질 점수 계산 (15점 만점)"""
@@ -99,97 +132,211 @@ def _score_air_quality(air_quality_status):
     elif "bad" in status_lower or "나쁨" in status_lower: return 5
     else: return 0
 
-def _get_bonus_penalty(uvi, sky_status):
-    """오전 시간대 보너스/패널티 점수 계산"""
-    score = 0
+def _get_uv_bonus(uvi):
+    """오전 시간대 자외선 보너스/패널티 점수 계산"""
     if uvi is None: uvi = 0
-        
-    if uvi <= 2: score += 5
-    elif 6 <= uvi <= 7: score -= 2
-    elif uvi >= 8: score -= 5
-    
-    if sky_status in ["Cloudy", "Overcast", "흐림"]:
-        score += 5
-    return score
+    if uvi <= 2: return 5
+    elif 6 <= uvi <= 7: return -2
+    elif uvi >= 8: return -5
+    return 0
+
+def _season_mode(daily_max_temp):
+    """계절 모드 결정"""
+    if daily_max_temp >= 23: return "summer"
+    elif daily_max_temp <= 10: return "winter"
+    else: return "mild"
 
 # =======================================
-# 3. 메인 계산 함수 (다국어 지원 추가)
+# 3. 시간별 야외활동 지수 계산 (벡터 연산)
 # =======================================
 
-def calculate_activity_index(weather_data, time_slot, daily_max_temp, daily_uv_max, daily_air_quality, language='en'):
+# 등급 기준 점수와 언어별 등급명
+GRADES_EN = {90: "Excellent", 75: "Good", 60: "Moderate", 45: "Bad", 0: "Very Bad"}
+GRADES_KO = {90: "최상", 75: "좋음", 60: "보통", 45: "나쁨", 0: "매우 나쁨"}
+# 이 기준 점수 이하 등급(보통, 나쁨, 매우 나쁨)일 때만 감점 요인을 함께 표시
+REASON_GRADE_THRESHOLD = 60
+
+# 각 시각의 지수는 그 시각부터 ACTIVITY_WINDOW_HOURS 시간 동안의 예보로 계산합니다.
+# 오전(06~09시)과 오후(18~21시) 지수는 각각 6시, 18시에서 시작하는 구간입니다.
+ACTIVITY_WINDOW_HOURS = 4
+SLOT_START_HOURS = {"am": 6, "pm": 18}
+# 자외선/하늘 보너스는 오전 지수 구간에만 적용합니다.
+BONUS_SLOT = "am"
+
+# 감점 요인 (같은 감점이면 앞쪽 요인이 우선)
+PENALTY_FACTORS = ("temperature", "humidity", "wind", "precipitation", "air_quality", "uv_index")
+_MAX_SCORES = {"temperature": 30, "humidity": 20, "wind": 10, "precipitation": 25, "air_quality": 15}
+
+
+def _windows(values, present, window, fill):
     """
-    야외활동 지수를 계산하고 지정된 언어로 결과를 반환합니다.
+    시각마다 그 시각부터 window시간 동안의 (값, 존재 여부) 창을 만듭니다.
+    마지막 시각 이후는 결측으로 채우며, 결측 값 자리는 fill로 채웁니다.
     """
-    
-    # 1. 계절 모드 결정
-    if daily_max_temp >= 23: mode = "summer"
-    elif daily_max_temp <= 10: mode = "winter"
-    else: mode = "mild"
-
-    # 2. 시간대별 데이터 추출
-    if time_slot == 'am': start, end = 600, 900
-    else: start, end = 1800, 2100
-
-    temps = [t['value'] for t in weather_data.get('temperatures', []) if start <= t['time'] <= end]
-    humi = [h['value'] for h in weather_data.get('humidity', []) if start <= h['time'] <= end]
-    wind = [w['value'] for w in weather_data.get('wind_speeds', []) if start <= w['time'] <= end]
-    rain_prob = {t: p for t, p in weather_data.get('rain_prob', {}).items() if start <= t <= end}
-    rain_amounts = [a for t, a in weather_data.get('rain_amount', {}).items() if start <= t <= end]
-    sky = {t: s for t, s in weather_data.get('sky_status', {}).items() if start <= t <= end}
-
-    avg_temp = sum(temps) / len(temps) if temps else 0
-    avg_humi = sum(humi) / len(humi) if humi else 50
-    avg_wind = sum(wind) / len(wind) if wind else 0
-    max_rain_prob = max(rain_prob.values()) if rain_prob else 0
-    total_rain_amount = sum(rain_amounts) if rain_amounts else 0
-    avg_sky_val = sum(sky.values()) / len(sky) if sky else 1
-    
-    sky_status = "Sunny"
-    if avg_sky_val >= 4: sky_status = "Overcast"
-    elif avg_sky_val >= 3: sky_status = "Cloudy"
+    padded_values = np.concatenate([np.where(present, values, fill), np.full(window - 1, fill)])
+    padded_present = np.concatenate([present, np.zeros(window - 1, dtype=bool)])
+    return (np.lib.stride_tricks.sliding_window_view(padded_values, window),
+            np.lib.stride_tricks.sliding_window_view(padded_present, window))
+
+
+def _window_mean(values, present, window, default):
+    windows, counts = _windows(values, present, window, 0.0)
+    counts = counts.sum(axis=1)
+    sums = windows.sum(axis=1)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), default)
+
+
+def _window_max(values, present, window, default):
+    windows, counts = _windows(values, present, window, -_INF)
+    maxima = windows.max(axis=1)
+    return np.where(counts.any(axis=1), maxima, default)
+
+
+def _window_sum(values, present, window):
+    windows, _ = _windows(values, present, window, 0.0)
+    return windows.sum(axis=1)
+
+
+class ActivityCurve:
+    """
+    하루 이상의 시간별 야외활동 지수.
+    모든 배열은 (일수 x 24) 길이의 1차원 배열이며, 인덱스 = 날짜 인덱스 * 24 + 시각입니다.
+    """
+
+    def __init__(self, dates, scores, grade_thresholds, reason_factors, base_scores=None):
+        self.dates = dates
+        self.scores = scores
+        # 오전 보너스를 빼고 모든 시각을 같은 기준으로 매긴 점수 (best_hours 비교용)
+        self.base_scores = scores if base_scores is None else base_scores
+        self.grade_thresholds = grade_thresholds
+        self.reason_factors = reason_factors
+
+    def at(self, hour, day_index=0):
+        """해당 시각에서 시작하는 구간의 지수 ({"score", "grade_threshold", "reason_factor"})"""
+        i = day_index * HOURS_PER_DAY + hour
+        return {
+            "score": int(self.scores[i]),
+            "grade_threshold": int(self.grade_thresholds[i]),
+            "reason_factor": self.reason_factors[i]
+        }
+
+    def slot(self, time_slot, day_index=0):
+        """오전('am') 또는 오후('pm') 지수"""
+        return self.at(SLOT_START_HOURS[time_slot], day_index)
+
+    def daily_scores(self, day_index=0):
+        """해당 날짜의 24시간 점수 곡선"""
+        return self.scores[day_index * HOURS_PER_DAY:(day_index + 1) * HOURS_PER_DAY]
+
+    def best_hours(self, day_index=0, start_hour=6, end_hour=21):
+        """
+        start_hour~end_hour 사이에서 시작하는 구간 중 점수가 가장 높은 구간을 찾습니다 (같으면 이른 시각).
+        오전 지수 구간에만 붙는 자외선/하늘 보너스는 빼고 비교하므로 모든 구간이 같은 기준으로 비교됩니다.
+
+        Returns:
+            dict: {"start", "end", "score", "grade_threshold", "reason_factor"} (end는 구간이 끝나는 시각)
+        """
+        day = slice(day_index * HOURS_PER_DAY, (day_index + 1) * HOURS_PER_DAY)
+        curve = self.base_scores[day][start_hour:end_hour + 1]
+        best_start = start_hour + int(np.argmax(curve))
+        best = self.at(best_start, day_index)
+        best.update({"start": best_start, "end": min(best_start + ACTIVITY_WINDOW_HOURS, HOURS_PER_DAY)})
+        return best
+
+
+def compute_activity_curve(tables, daily_max_temps, daily_uv_max, daily_air_quality, window=ACTIVITY_WINDOW_HOURS):
+    """
+    여러 날의 모든 시각에 대해 야외활동 지수를 한 번에 계산합니다.
+    시각마다 그 시각부터 window시간 동안의 평균 기온/습도/풍속/하늘상태, 최대 강수확률, 총 강수량으로
+    점수를 매기므로, 오전/오후 지수와 '외출하기 좋은 시간', 여러 날 곡선이 모두 이 결과의 일부입니다.
+
+    Args:
+        tables (list): 날짜순 HourlyTable 목록
+        daily_max_temps (list): 날짜별 최고기온 (계절 모드 결정용)
+        daily_uv_max: 자외선 지수 최댓값 (오전 보너스용)
+        daily_air_quality (str): 대기질 등급
+
+    Returns:
+        ActivityCurve
+    """
+    def series(category):
+        columns = [table.column(category) for table in tables]
+        return (np.concatenate([column.data for column in columns]),
+                np.concatenate([~np.ma.getmaskarray(column) for column in columns]))
+
+    # 1. 계절 모드 (날짜별)
+    modes = np.repeat([SEASON_MODES.index(_season_mode(t)) for t in daily_max_temps], HOURS_PER_DAY)
+
+    # 2. 시각별 구간 집계 (구간에 값이 없을 때의 기본값은 기존과 동일)
+    avg_temp = _window_mean(*series("TMP"), window, 0)
+    avg_humi = _window_mean(*series("REH"), window, 50)
+    avg_wind = _window_mean(*series("WSD"), window, 0)
+    max_rain_prob = _window_max(*series("POP"), window, 0)
+    total_rain_amount = _window_sum(*series("PCP"), window)
+    avg_sky_val = _window_mean(*series("SKY"), window, 1)
 
     # 3. 점수 및 감점 계산
-    scores = {}
-    penalties = {}
-
-    scores['temperature'] = _score_temperature(avg_temp, mode)
-    penalties['temperature'] = 30 - scores['temperature']
-    scores['humidity'] = _score_humidity(avg_humi)
-    penalties['humidity'] = 20 - scores['humidity']
-    scores['wind'] = _score_wind(avg_wind, mode)
-    penalties['wind'] = 10 - scores['wind']
-    scores['precipitation'] = _score_precipitation(max_rain_prob, total_rain_amount)
-    penalties['precipitation'] = 25 - scores['precipitation']
-    scores['air_quality'] = _score_air_quality(daily_air_quality)
-    penalties['air_quality'] = 15 - scores['air_quality']
-
-    total_score = sum(scores.values())
-
-    if time_slot == 'am':
-        bonus = _get_bonus_penalty(daily_uv_max, sky_status)
-        total_score += bonus
-        if bonus < 0: penalties['uv_index'] = abs(bonus)
-
-    # 4. 최종 등급 및 감점 요인 결정 (언어별)
-    grades_en = {90: "Excellent", 75: "Good", 60: "Moderate", 45: "Bad", 0: "Very Bad"}
-    grades_ko = {90: "최상", 75: "좋음", 60: "보통", 45: "나쁨", 0: "매우 나쁨"}
-    grades = grades_ko if language == 'ko' else grades_en
-    
-    final_grade = grades[0] # 기본값
-    for score_threshold, grade_text in sorted(grades.items(), reverse=True):
-        if total_score >= score_threshold:
-            final_grade = grade_text
-            break
-
-    reason = None
-    if final_grade in ["Moderate", "Bad", "Very Bad", "보통", "나쁨", "매우 나쁨"]:
-        if penalties:
-            worst_factor = max(penalties, key=penalties.get)
-            if penalties[worst_factor] > 5:
-                reason_map = REASON_MAPPING_KO if language == 'ko' else REASON_MAPPING_EN
-                reason = reason_map.get(worst_factor)
-
-    return {"grade": final_grade, "reason": reason}
+    scores = {
+        "temperature": _score_temperature(avg_temp, modes),
+        "humidity": _score_humidity(avg_humi),
+        "wind": _score_wind(avg_wind, modes),
+        "precipitation": _score_precipitation(max_rain_prob, total_rain_amount),
+        "air_quality": np.full(len(modes), _score_air_quality(daily_air_quality)),
+    }
+    base_scores = sum(scores.values())
+
+    # 오전 지수 구간에만 자외선/하늘(흐림 이상이면 +5) 보너스 적용
+    hours = np.tile(np.arange(HOURS_PER_DAY), len(tables))
+    bonus_hours = hours == SLOT_START_HOURS[BONUS_SLOT]
+    bonus = np.where(bonus_hours, _get_uv_bonus(daily_uv_max) + np.where(avg_sky_val >= 3, 5, 0), 0)
+    total_scores = base_scores + bonus
+
+    penalties = np.stack(
+        [_MAX_SCORES[factor] - scores[factor] for factor in PENALTY_FACTORS[:-1]]
+        + [np.where(bonus < 0, -bonus, 0)]
+    )
+
+    # 4. 등급 기준 점수 및 감점 요인 결정
+    thresholds = sorted(GRADES_EN, reverse=True)
+    grade_thresholds = np.select([total_scores >= t for t in thresholds], thresholds, 0)
+
+    worst = penalties.argmax(axis=0)
+    worst_penalty = penalties.max(axis=0)
+    has_reason = (grade_thresholds <= REASON_GRADE_THRESHOLD) & (worst_penalty > 5)
+    reason_factors = [PENALTY_FACTORS[w] if r else None for w, r in zip(worst, has_reason)]
+
+    return ActivityCurve([table.target_date for table in tables], total_scores, grade_thresholds, reason_factors,
+                         base_scores)
+
+
+def compute_activity_score(weather_data, time_slot, daily_max_temp, daily_uv_max, daily_air_quality):
+    """
+    야외활동 지수의 점수, 등급 기준 점수, 주 감점 요인을 계산합니다 (언어 무관).
+    결과 문구는 localize_activity_index()로 언어별로 만듭니다.
+    오전/오후를 모두 구할 때는 compute_activity_curve()를 한 번 호출하고 slot()을 사용하세요.
+
+    Returns:
+        dict: {"score", "grade_threshold", "reason_factor"}
+    """
+    curve = compute_activity_curve([weather_data], [daily_max_temp], daily_uv_max, daily_air_quality)
+    return curve.slot(time_slot)
+
+def localize_activity_index(activity_score, language='en'):
+    """compute_activity_score()의 결과를 지정된 언어의 {"grade", "reason"}으로 바꿉니다."""
+    grades = GRADES_KO if language == 'ko' else GRADES_EN
+    reason_map = REASON_MAPPING_KO if language == 'ko' else REASON_MAPPING_EN
+    reason_factor = activity_score["reason_factor"]
+    return {
+        "grade": grades[activity_score["grade_threshold"]],
+        "reason": reason_map.get(reason_factor) if reason_factor else None
+    }
+
+def calculate_activity_index(weather_data, time_slot, daily_max_temp, daily_uv_max, daily_air_quality, language='en'):
+    """
+    야외활동 지수를 계산하고 지정된 언어로 결과를 반환합니다.
+    """
+    activity_score = compute_activity_score(weather_data, time_slot, daily_max_temp, daily_uv_max, daily_air_quality)
+    return localize_activity_index(activity_score, language)
 
 # 테스트 함수는 변경 없음
 def get_mock_data(scenario="good_day"):
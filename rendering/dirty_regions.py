@@ -0,0 +1,96 @@
+# rendering/dirty_regions.py
+# 낮 시간 갱신처럼 몇 개 요소만 바뀌는 재렌더링을 위한 부분 렌더링 도구입니다.
+# 이전 렌더링의 (슬롯, 텍스트) 목록과 요소마다 칠할 수 있는 사각형을 기억해 두고,
+# 바뀐 요소의 사각형만 템플릿에서 복원한 뒤 그 사각형에 걸치는 요소를 순서대로 다시 그립니다.
+# 사각형은 글리프와 이모지가 닿을 수 있는 범위를 넉넉하게 잡으므로 결과는 처음부터 그린 것과 픽셀 단위로 같습니다.
+
+import difflib
+
+# 바뀐 영역이 이미지의 이 비율을 넘으면 부분 렌더링 대신 처음부터 다시 그립니다.
+MAX_DIRTY_FRACTION = 0.5
+
+
+class RenderState:
+    """한 번의 렌더링 결과: 사용한 계획과 템플릿, 그린 (슬롯, 텍스트) 목록, 요소별 사각형, 완성된 이미지."""
+
+    __slots__ = ("plan", "template_path", "template_digest", "ops", "boxes", "image")
+
+    def __init__(self, plan, template_path, template_digest, ops, boxes, image):
+        self.plan = plan
+        self.template_path = template_path
+        self.template_digest = template_digest
+        self.ops = tuple(ops)
+        self.boxes = tuple(boxes)
+        self.image = image
+
+    def matches(self, plan, template_path, template_digest):
+        """같은 계획과 같은 템플릿 파일로 그린 결과인지 (부분 렌더링의 바탕으로 쓸 수 있는지)."""
+        return (self.plan is plan and self.template_path == template_path
+                and self.template_digest == template_digest)
+
+
+def _intersects(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _clip(box, size):
+    left, top, right, bottom = box
+    return (max(0, left), max(0, top), min(size[0], right), min(size[1], bottom))
+
+
+def _area(box):
+    return max(0, box[2] - box[0]) * max(0, box[3] - box[1])
+
+
+def merge_boxes(boxes, size):
+    """사각형들을 이미지 안으로 자르고, 겹치는 것끼리 합쳐 서로 겹치지 않는 사각형 목록을 반환합니다."""
+    merged = []
+    for box in boxes:
+        box = _clip(box, size)
+        if _area(box) == 0:
+            continue
+        # 새 사각형과 겹치는 사각형을 모두 흡수하고, 커진 사각형이 다른 것과 겹치면 다시 흡수합니다.
+        absorbed = True
+        while absorbed:
+            absorbed = False
+            for other in merged:
+                if _intersects(box, other):
+                    merged.remove(other)
+                    box = (min(box[0], other[0]), min(box[1], other[1]),
+                           max(box[2], other[2]), max(box[3], other[3]))
+                    absorbed = True
+                    break
+        merged.append(box)
+    return merged
+
+
+def dirty_boxes(previous, ops, boxes):
+    """
+    이전 렌더링과 비교해 다시 그려야 하는 사각형 목록을 반환합니다 (사라진 요소와 새로 생긴/바뀐 요소의 사각형).
+    두 목록은 순서를 지키며 맞추므로(최장 공통 부분열), 바뀌지 않은 요소끼리의 그리는 순서는 항상 같습니다.
+    """
+    matcher = difflib.SequenceMatcher(None, previous.ops, list(ops), autojunk=False)
+    dirty = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            dirty.extend(previous.boxes[i1:i2])
+            dirty.extend(boxes[j1:j2])
+    return dirty
+
+
+def dirty_fraction(regions, size):
+    return sum(_area(region) for region in regions) / float(size[0] * size[1])
+
+
+def patch(image, template, regions, ops, boxes, draw_ops):
+    """
+    image의 각 영역을 template에서 복원하고, 그 영역에 걸치는 요소를 순서대로 다시 그립니다 (image를 직접 수정).
+    요소는 영역 크기의 조각 위에 정수 좌표만큼 옮겨 그리므로, 글리프 래스터화 결과는 원래 위치에 그린 것과 같습니다.
+    draw_ops(이미지, [(슬롯, 텍스트)])는 ImageGenerator._draw_ops처럼 목록을 순서대로 그리는 함수입니다.
+    """
+    for region in regions:
+        left, top = region[0], region[1]
+        tile = template.crop(region)
+        draw_ops(tile, [(slot.replace(x=slot.x - left, y=slot.y - top), text)
+                        for (slot, text), box in zip(ops, boxes) if _intersects(box, region)])
+        image.paste(tile, (left, top))
@@ -0,0 +1,192 @@
+# rendering/emoji_source.py
+# 네트워크 없이 이모지를 그리기 위한 로컬 이모지 소스입니다.
+# 이미지에 쓰는 이모지는 달 위상(🌑~🌘)과 대기질/자외선 점(🟢🟡🟠🔴🟣⚪)뿐이므로, 예전에 pilmoji가 렌더링마다
+# 내려받던 Twemoji PNG를 EMOJI_DIR(weather_service/emoji/)에 함께 배포하고 그 파일로 그립니다.
+# (이모지, 크기)마다 pilmoji와 같은 방식(LANCZOS)으로 줄인 스프라이트를 한 번만 만들어 보관하므로,
+# 결과는 예전 출력과 픽셀 단위로 같습니다.
+# Twemoji 그림: Copyright Twitter, Inc and other contributors, CC-BY 4.0 (weather_service/emoji/LICENSE.md)
+# 렌더링은 네트워크를 쓰지 않으며, 번들 이미지가 빠져 있으면 이모지를 글리프로 대신 그리지 않고 오류로 멈춥니다.
+#
+# 번들 이미지를 처음 저장소에 넣을 때만 쓰는 도구 (이미 있는 파일은 건너뜀, 네트워크 필요, 실패하면 종료 코드 1):
+#   python -m rendering.emoji_source
+
+import hashlib
+import io
+import math
+import sys
+import threading
+from pathlib import Path
+
+from PIL import Image
+from pilmoji.helpers import EMOJI_REGEX
+from pilmoji.source import BaseSource, Twemoji
+
+from config import EMOJI_DIR
+
+DEFAULT_SPRITE_SIZE = 72
+
+# 함께 배포하는 이모지 (달 위상, 대기질/자외선 점)
+SUPPORTED_EMOJI = ("🌑", "🌒", "🌓", "🌔", "🌕", "🌖", "🌗", "🌘", "🟢", "🟡", "🟠", "🔴", "🟣", "⚪")
+
+_assets = {}       # 이모지 -> 원본 RGBA 이미지
+_sprites = {}      # (이모지, 크기) -> RGBA 이미지
+_sprite_png = {}   # (이모지, 크기) -> PNG 바이트 (pilmoji 소스용)
+_digest = None
+_lock = threading.Lock()
+
+
+def has_emoji(text):
+    """pilmoji가 이모지로 인식하는 문자가 있는지 확인합니다 (없으면 ImageDraw로 바로 그릴 수 있음)."""
+    return EMOJI_REGEX.search(str(text)) is not None
+
+
+def count_emoji(text):
+    """pilmoji가 이모지 이미지로 그리는 문자 수 (이모지 하나는 폰트 크기만큼의 폭을 차지함)."""
+    return len(EMOJI_REGEX.findall(str(text)))
+
+
+def asset_path(emoji, emoji_dir=None):
+    """번들 이미지 경로. 파일 이름은 Twemoji와 같은 코드 포인트 이름입니다 (예: 🌑 -> 1f311.png)."""
+    name = "-".join(f"{ord(char):x}" for char in emoji if char != "\ufe0f")
+    return Path(emoji_dir or EMOJI_DIR) / f"{name}.png"
+
+
+def missing_assets(emoji_dir=None):
+    """번들 이미지 파일이 없는 이모지 경로 목록."""
+    return [path for path in (asset_path(emoji, emoji_dir) for emoji in SUPPORTED_EMOJI) if not path.is_file()]
+
+
+def require_assets():
+    """번들 이미지가 모두 있는지 확인합니다. 빠진 파일이 있으면 FileNotFoundError (이모지가 깨진 이미지를 만들지 않도록)."""
+    missing = missing_assets()
+    if missing:
+        raise FileNotFoundError(f"이모지 이미지가 없습니다 ({len(missing)}개): {', '.join(str(path) for path in missing)}")
+
+
+def _load_asset(emoji):
+    with _lock:
+        if emoji in _assets:
+            return _assets[emoji]
+
+    # 파일이 없으면 FileNotFoundError를 그대로 발생시킵니다.
+    with Image.open(asset_path(emoji)) as source:
+        asset = source.convert("RGBA")
+
+    with _lock:
+        _assets[emoji] = asset
+    return asset
+
+
+def render_sprite(emoji, size):
+    """
+    이모지 하나를 폭 size의 RGBA 이미지로 반환합니다. 지원하지 않는 이모지면 None, 번들 이미지가 없으면 FileNotFoundError.
+    같은 (이모지, 크기)는 한 번만 만들고 재사용합니다 (반환된 이미지는 수정하지 마세요).
+    """
+    if emoji not in SUPPORTED_EMOJI or size <= 0:
+        return None
+
+    key = (emoji, size)
+    with _lock:
+        sprite = _sprites.get(key)
+    if sprite is not None:
+        return sprite
+
+    asset = _load_asset(emoji)
+    # pilmoji.text가 이모지 이미지를 줄이는 방식과 같습니다 (이미 이 크기면 pilmoji는 다시 줄이지 않음).
+    sprite = asset.resize((size, math.ceil(asset.height / asset.width * size)), Image.Resampling.LANCZOS)
+
+    with _lock:
+        _sprites[key] = sprite
+    return sprite
+
+
+def sprite_png(emoji, size):
+    """render_sprite() 결과를 PNG 바이트로 반환합니다 (pilmoji 소스용)."""
+    key = (emoji, size)
+    with _lock:
+        png = _sprite_png.get(key)
+    if png is not None:
+        return png
+
+    sprite = render_sprite(emoji, size)
+    if sprite is None:
+        return None
+    buffer = io.BytesIO()
+    sprite.save(buffer, "PNG")
+    png = buffer.getvalue()
+    with _lock:
+        _sprite_png[key] = png
+    return png
+
+
+def assets_digest():
+    """번들 이미지 전체의 SHA-256(hex). 이모지 그림이 바뀌면 렌더 캐시 키도 바뀌도록 씁니다."""
+    global _digest
+    with _lock:
+        if _digest is not None:
+            return _digest
+
+    digest = hashlib.sha256()
+    for emoji in SUPPORTED_EMOJI:
+        path = asset_path(emoji)
+        digest.update(path.name.encode("ascii"))
+        digest.update(path.read_bytes())
+
+    with _lock:
+        _digest = digest.hexdigest()
+    return _digest
+
+
+def fetch(emoji_dir=None):
+    """
+    번들 이미지가 없는 이모지를 예전 렌더링과 같은 출처(pilmoji의 Twemoji 소스)에서 받아 저장합니다.
+    저장소에 이미지를 넣을 때 한 번만 쓰며, 렌더링 중에는 호출하지 않습니다.
+
+    Returns:
+        dict: {"fetched": 받은 수, "skipped": 이미 있어 건너뛴 수, "failed": 받지 못한 이모지 목록}
+    """
+    source = Twemoji()
+    result = {"fetched": 0, "skipped": 0, "failed": []}
+    for emoji in SUPPORTED_EMOJI:
+        path = asset_path(emoji, emoji_dir)
+        if path.exists():
+            result["skipped"] += 1
+            continue
+        try:
+            stream = source.get_emoji(emoji)
+        except OSError as e:
+            print(f"⚠️ 이모지 이미지 다운로드 실패 ({emoji}): {e}")
+            stream = None
+        if stream is None:
+            result["failed"].append(emoji)
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(stream.getvalue())
+        result["fetched"] += 1
+    return result
+
+
+class LocalEmojiSource(BaseSource):
+    """
+    pilmoji용 로컬 이모지 소스. 네트워크 요청을 하지 않습니다.
+    size를 그릴 폰트 크기로 맞춰 두면 pilmoji가 다시 크기를 바꿀 필요 없이 그 크기로 줄인 스프라이트를 돌려줍니다.
+    지원하지 않는 이모지는 None을 반환하여 pilmoji가 폰트 글리프로 그리게 합니다.
+    """
+
+    def __init__(self, size=DEFAULT_SPRITE_SIZE):
+        self.size = size
+
+    def get_emoji(self, emoji, /):
+        png = sprite_png(emoji, self.size)
+        return io.BytesIO(png) if png is not None else None
+
+    def get_discord_emoji(self, id, /):
+        return None
+
+
+if __name__ == "__main__":
+    fetched = fetch()
+    if fetched["failed"]:
+        print(f"❌ 받지 못한 이모지: {' '.join(fetched['failed'])} (받음 {fetched['fetched']}개)")
+        sys.exit(1)
+    print(f"✅ 이모지 이미지: 받음 {fetched['fetched']}개, 이미 있어 건너뜀 {fetched['skipped']}개 -> {EMOJI_DIR}")
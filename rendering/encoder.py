@@ -0,0 +1,125 @@
+# rendering/encoder.py
+# 출력 이미지 인코딩 프로필입니다.
+# 포스트/스토리 이미지는 템플릿이 불투명하므로 알파 채널이 필요 없고, 업로드할 때는 용량이 작을수록 좋습니다.
+# 프로필마다 색상 모드(RGBA/RGB/팔레트), 형식(PNG/JPEG/WebP), 저장 옵션을 정해 두고 ImageGenerator가 골라 씁니다.
+#
+# 프로필별 인코딩 시간과 용량 비교:
+#   python -m rendering.encoder weather_service/output/weather_post_ko_*.png
+
+import io
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+# 알파를 없앨 때 반투명 픽셀을 합성할 배경색
+FLATTEN_BACKGROUND = (255, 255, 255)
+
+OUTPUT_PROFILES = {
+    # 기존과 동일한 출력 (RGBA PNG, 기본 압축)
+    "png": {"format": "PNG", "extension": ".png", "mode": "RGBA", "options": {}},
+    # 알파 없는 PNG (무손실, 용량 약 3/4)
+    "png_rgb": {"format": "PNG", "extension": ".png", "mode": "RGB", "options": {"compress_level": 6}},
+    # 압축을 줄여 인코딩 시간을 우선하는 PNG
+    "png_fast": {"format": "PNG", "extension": ".png", "mode": "RGB", "options": {"compress_level": 1}},
+    # 256색 팔레트 PNG (색이 단순한 템플릿이라 눈에 띄는 손실이 적음)
+    "png_palette": {"format": "PNG", "extension": ".png", "mode": "P", "options": {"optimize": True}},
+    # 업로드용 고화질 JPEG (Instagram 게시 API는 JPEG를 기본으로 지원)
+    "jpeg": {"format": "JPEG", "extension": ".jpg", "mode": "RGB",
+             "options": {"quality": 92, "subsampling": 0, "optimize": True}},
+    # 업로드용 고화질 WebP
+    "webp": {"format": "WEBP", "extension": ".webp", "mode": "RGB", "options": {"quality": 90, "method": 4}},
+}
+DEFAULT_PROFILE = "png"
+
+
+def get_profile(name):
+    """프로필 이름으로 설정을 반환합니다. 알 수 없는 이름이면 기본 프로필을 쓰고 경고합니다."""
+    if name not in OUTPUT_PROFILES:
+        print(f"⚠️ 알 수 없는 출력 프로필 '{name}', 기본 프로필({DEFAULT_PROFILE})을 사용합니다.")
+        name = DEFAULT_PROFILE
+    return OUTPUT_PROFILES[name]
+
+
+def _flatten(image):
+    """알파 채널을 없앤 RGB 이미지. 완전히 불투명하면 합성 없이 채널만 버립니다."""
+    if image.mode == "RGB":
+        return image
+    if image.mode != "RGBA":
+        return image.convert("RGB")
+    if image.getchannel("A").getextrema()[0] == 255:
+        return image.convert("RGB")
+    background = Image.new("RGB", image.size, FLATTEN_BACKGROUND)
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def prepare(image, profile):
+    """프로필의 색상 모드로 변환한 이미지를 반환합니다 (원본은 바꾸지 않음)."""
+    mode = profile["mode"]
+    if mode == "RGBA":
+        return image if image.mode == "RGBA" else image.convert("RGBA")
+    if mode == "RGB":
+        return _flatten(image)
+    # 팔레트: 빠른 옥트리 양자화 후 디더링
+    return _flatten(image).quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+
+def output_path(path, profile_name):
+    """확장자를 프로필 형식에 맞춘 경로를 반환합니다."""
+    return Path(path).with_suffix(get_profile(profile_name)["extension"])
+
+
+def save(image, path, profile_name=DEFAULT_PROFILE):
+    """이미지를 프로필대로 한 번 인코딩해 저장하고, 확장자를 맞춘 실제 저장 경로를 반환합니다."""
+    profile = get_profile(profile_name)
+    path = Path(path).with_suffix(profile["extension"])
+    prepare(image, profile).save(path, profile["format"], **profile["options"])
+    return path
+
+
+def encode(image, profile_name=DEFAULT_PROFILE):
+    """이미지를 프로필대로 인코딩한 바이트를 반환합니다."""
+    profile = get_profile(profile_name)
+    buffer = io.BytesIO()
+    prepare(image, profile).save(buffer, profile["format"], **profile["options"])
+    return buffer.getvalue()
+
+
+def benchmark(image, profiles=None, repeat=3):
+    """
+    프로필별 인코딩 시간(색상 변환 포함, repeat회 중 최솟값)과 용량을 잽니다.
+
+    Returns:
+        list[dict]: [{"profile", "bytes", "seconds"}] (profiles 순서)
+    """
+    results = []
+    for name in profiles or OUTPUT_PROFILES:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = encode(image, name)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({"profile": name, "bytes": len(data), "seconds": best})
+    return results
+
+
+def print_benchmark(results):
+    baseline = next((r["bytes"] for r in results if r["profile"] == DEFAULT_PROFILE), None)
+    print(f"{'프로필':<12} {'용량(KB)':>10} {'비율':>7} {'인코딩(ms)':>11}")
+    for r in results:
+        ratio = f"{r['bytes'] / baseline:.0%}" if baseline else "-"
+        print(f"{r['profile']:<12} {r['bytes'] / 1024:>10.1f} {ratio:>7} {r['seconds'] * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:]
+    if not paths:
+        print("사용법: python -m rendering.encoder <이미지 경로> [...]")
+        sys.exit(1)
+    for image_path in paths:
+        print(f"\n→ {image_path}")
+        with Image.open(image_path) as source:
+            print_benchmark(benchmark(source.convert("RGBA")))
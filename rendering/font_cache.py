@@ -0,0 +1,147 @@
+# rendering/font_cache.py
+# 프로세스 전체에서 공유하는 폰트 객체 캐시입니다.
+# 폰트 이름 -> 실제 파일 경로(대체 폰트 포함) 결정은 이름마다 한 번만 하고,
+# 로드한 폰트 객체는 (경로, 크기) 키로 LRU 캐시에 보관하여 같은 폰트를 디스크에서 다시 읽지 않습니다.
+
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import ImageFont
+
+# 보관할 (경로, 크기) 조합 수. 포스트 한 장에 쓰이는 조합은 20개 안팎입니다.
+FONT_CACHE_SIZE = 128
+
+# 한국어 폰트를 찾지 못했을 때 시도할 시스템 폰트, 그다음 영어 대체 폰트
+KOREAN_FALLBACK_FONTS = ["malgun.ttf", "NanumGothic.ttf", "gulim.ttc"]
+KOREAN_LAST_RESORT_FONT = "Inter_18pt-Regular"
+SYSTEM_FALLBACK_FONTS = ["arial.ttf", "calibri.ttf", "tahoma.ttf"]
+FONT_EXTENSIONS = ['.ttf', '.otf', '.ttc']
+
+# 기본 폰트(ImageFont.load_default)를 가리키는 경로 값
+DEFAULT_FONT = None
+
+_fonts = OrderedDict()    # (경로, 크기) -> 폰트 객체
+_resolved = {}            # (폰트 디렉토리, 폰트 이름) -> 경로 또는 DEFAULT_FONT
+_lock = threading.RLock()
+_stats = {"hits": 0, "misses": 0, "load_seconds": 0.0}
+
+
+def _is_loadable(path):
+    try:
+        ImageFont.truetype(str(path), 10, encoding='unic')
+        return True
+    except (IOError, OSError):
+        return False
+
+
+def _is_korean_font(font_name):
+    return 'Nanum' in font_name
+
+
+def resolve_font_path(font_name, font_paths, fonts_dir):
+    """
+    폰트 이름을 실제로 로드할 수 있는 경로로 바꿉니다. 결과는 프로세스 안에서 한 번만 계산됩니다.
+
+    순서: font_paths에 등록된 파일 -> fonts_dir의 확장자별 파일 -> (한국어) 시스템 폰트, 영어 폰트
+    -> 시스템 영어 폰트 -> 기본 폰트(DEFAULT_FONT)
+    """
+    key = (str(fonts_dir), font_name)
+    with _lock:
+        if key in _resolved:
+            return _resolved[key]
+
+        path = DEFAULT_FONT
+        candidates = []
+        # 1. 프로젝트 폰트 디렉토리에서 찾기 (정확한 이름으로)
+        if font_name in font_paths:
+            candidates.append(Path(font_paths[font_name]))
+        # 2. 확장자 있는 파일명으로 시도
+        candidates += [Path(fonts_dir) / f"{font_name}{ext}" for ext in FONT_EXTENSIONS]
+
+        for candidate in candidates:
+            if candidate.exists():
+                if _is_loadable(candidate):
+                    path = str(candidate)
+                    break
+                print(f"⚠️ 폰트 로드 실패: {font_name}")
+        else:
+            if _is_korean_font(font_name):
+                # 3. 한국어 폰트 요청 시 대체 시도
+                path = next((f for f in KOREAN_FALLBACK_FONTS if _is_loadable(f)), DEFAULT_FONT)
+                if path is DEFAULT_FONT:
+                    print(f"⚠️ 한국어 폰트 실패, 영어 폰트로 대체: {font_name}")
+                    path = resolve_font_path(KOREAN_LAST_RESORT_FONT, font_paths, fonts_dir)
+            else:
+                # 4. 영어 폰트 대체
+                path = next((f for f in SYSTEM_FALLBACK_FONTS if _is_loadable(f)), DEFAULT_FONT)
+                if path is DEFAULT_FONT:
+                    # 5. 최후의 수단
+                    print(f"❌ 모든 폰트 실패, 기본 폰트 사용: {font_name}")
+
+        _resolved[key] = path
+        return path
+
+
+def load_font(path, size):
+    """(경로, 크기)에 해당하는 폰트 객체를 캐시에서 반환하고, 없으면 로드합니다."""
+    key = (path, size)
+    with _lock:
+        font = _fonts.get(key)
+        if font is not None:
+            _fonts.move_to_end(key)
+            _stats["hits"] += 1
+            return font
+
+        started = time.perf_counter()
+        if path is DEFAULT_FONT:
+            try:
+                font = ImageFont.load_default(size)
+            except TypeError:
+                font = ImageFont.load_default()
+        else:
+            font = ImageFont.truetype(path, size, encoding='unic')
+        _stats["load_seconds"] += time.perf_counter() - started
+        _stats["misses"] += 1
+
+        _fonts[key] = font
+        if len(_fonts) > FONT_CACHE_SIZE:
+            _fonts.popitem(last=False)
+        return font
+
+
+def get_font(font_name, size, font_paths, fonts_dir):
+    """폰트 이름과 크기로 (대체 폰트를 포함해) 캐시된 폰트 객체를 반환합니다."""
+    return load_font(resolve_font_path(font_name, font_paths, fonts_dir), size)
+
+
+def get_stats():
+    """캐시 적중/미스 횟수, 적중률, 누적 로드 시간을 반환합니다."""
+    with _lock:
+        stats = dict(_stats)
+        stats["cached"] = len(_fonts)
+        stats["resolved"] = len(_resolved)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    print(f" -> 폰트 캐시: 적중 {stats['hits']}회, 로드 {stats['misses']}회 ({stats['load_seconds']:.3f}초), "
+          f"보관 {stats['cached']}개 (적중률 {stats['hit_rate']:.0%})")
+
+
+def reset_stats():
+    with _lock:
+        _stats.update({"hits": 0, "misses": 0, "load_seconds": 0.0})
+
+
+def clear():
+    """캐시된 폰트와 경로 결정 결과를 모두 비웁니다 (폰트 파일을 바꾼 경우)."""
+    with _lock:
+        _fonts.clear()
+        _resolved.clear()
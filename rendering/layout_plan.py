@@ -0,0 +1,328 @@
+# rendering/layout_plan.py
+# positions.json을 렌더링 계획(LayoutPlan)으로 한 번 컴파일합니다.
+# 각 텍스트 요소는 폰트 객체, RGBA 색상, 정렬, 줄바꿈 폭이 미리 결정된 TextSlot이 되므로,
+# 그리는 쪽은 설정 키를 다시 읽거나 색상/폰트를 다시 해석하지 않고 계획대로 그리기만 하면 됩니다.
+# 컴파일 전에 validate()로 알 수 없는 요소/필드, 빠진 요소, 잘못된 값을 찾아 알려줍니다.
+
+from types import MappingProxyType
+
+DEFAULT_FONT_NAME = "Inter_18pt-Regular"
+DEFAULT_FONT_SIZE = 30
+DEFAULT_COLOR = (0, 0, 0, 255)
+ALIGNMENTS = ("left", "center", "right")
+# max_width 줄바꿈 방식: normal은 공백과 한글 글자 사이, keep_all은 공백에서만 줄을 바꿉니다.
+WORD_BREAKS = ("normal", "keep_all")
+
+# 텍스트 요소 하나에 쓸 수 있는 필드
+TEXT_ELEMENT_FIELDS = frozenset([
+    "x", "y", "font_name", "font_name_ko", "font_size", "color", "align", "max_width", "line_spacing", "visible",
+    "word_break",
+])
+# 열(column) 요소: 제목과 값을 열마다 가운데 정렬해 그립니다 (스토리의 시간대별 기온).
+COLUMN_ELEMENT_FIELDS = frozenset([
+    "y_title", "y_temp", "font_name", "font_name_ko", "font_size_title", "font_size_temp", "color", "slots", "visible",
+])
+COLUMN_FIELDS = frozenset(["label", "label_ko", "hour", "x"])
+COLUMN_ELEMENTS = frozenset(["hourly_temps"])
+
+# 템플릿별로 실제로 그리는 요소. 여기에 없는 요소는 정의되어 있어도 그려지지 않습니다.
+POST_ELEMENTS = (
+    "date", "date_for_warning", "catch_phrase", "warning_info", "rain_info",
+    "temp_max", "temp_min", "temp_diff", "rain_probability", "rain_amount", "humidity", "wind",
+    "uv_number", "uv_level", "air_quality_pm10", "air_quality_pm25",
+    "daylight", "night", "sunrise", "sunset", "moonrise", "moonset", "moon_emoji", "moon_phase",
+    "activity_index_am", "activity_index_pm",
+)
+# 없어도 다른 요소로 대체되는 요소 (특보용 위치 -> 기본 위치)
+OPTIONAL_POST_ELEMENTS = frozenset(["date_for_warning", "warning_info"])
+
+STORY_ELEMENTS = (
+    "date", "catch_phrase", "temp_max", "temp_min", "temp_diff", "rain_info",
+    "humidity_wind", "uv_air", "hourly_temps", "sun_info", "moon_info",
+)
+
+TEMPLATE_ELEMENTS = {
+    "post_template": (POST_ELEMENTS, OPTIONAL_POST_ELEMENTS),
+    "story_template": (STORY_ELEMENTS, frozenset()),
+}
+
+
+def parse_color(hex_color):
+    """HEX 색상(#RRGGBB 또는 #RRGGBBAA)을 RGBA 튜플로 변환합니다. 해석할 수 없으면 검은색을 반환합니다."""
+    if not hex_color or not isinstance(hex_color, str):
+        return DEFAULT_COLOR
+
+    hex_color = hex_color.lstrip('#')
+    try:
+        if len(hex_color) == 6:
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4)) + (255,)
+        elif len(hex_color) == 8:
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4, 6))
+    except ValueError:
+        pass
+    return DEFAULT_COLOR
+
+
+def _is_valid_color(value):
+    if not isinstance(value, str):
+        return False
+    digits = value.lstrip('#')
+    return len(digits) in (6, 8) and all(c in "0123456789abcdefABCDEF" for c in digits)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Frozen:
+    """생성 후 값을 바꿀 수 없는 slotted 객체의 기반 클래스 (렌더링 사이에 공유되는 계획용)."""
+
+    __slots__ = ()
+
+    def _init(self, values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}은 변경할 수 없습니다 ({name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__}은 변경할 수 없습니다 ({name})")
+
+
+class TextSlot(_Frozen):
+    """
+    미리 해석된 텍스트 요소 하나. 렌더링 사이에 공유되므로 값을 바꿀 수 없고,
+    줄마다 y만 다른 경우처럼 일부 값만 다르게 그릴 때는 replace()로 새 슬롯을 만듭니다.
+    """
+
+    __slots__ = ("key", "x", "y", "font", "font_name", "color", "align", "max_width", "line_spacing", "word_break",
+                 "visible")
+
+    def __init__(self, key, x, y, font, font_name, color, align="left", max_width=None, line_spacing=None,
+                 word_break="normal", visible=True):
+        self._init(locals())
+
+    def replace(self, **changes):
+        """일부 값만 바꾼 새 슬롯을 반환합니다."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return TextSlot(**values)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        # 폰트는 font_cache가 공유하는 객체이므로 같은 폰트면 같은 객체입니다.
+        return isinstance(other, TextSlot) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        return (f"TextSlot({self.key!r}, x={self.x}, y={self.y}, font={self.font_name!r}@{self.font.size}, "
+                f"align={self.align!r})")
+
+
+class ColumnSlot(_Frozen):
+    """열 요소의 한 열: 언어별 제목, 값을 가져올 시각(hour), 제목/값 TextSlot."""
+
+    __slots__ = ("label", "hour", "title", "value")
+
+    def __init__(self, label, hour, title, value):
+        self._init(locals())
+
+    def __repr__(self):
+        return f"ColumnSlot({self.label!r}, hour={self.hour}, x={self.title.x})"
+
+
+class LayoutPlan(_Frozen):
+    """
+    한 템플릿을 한 언어로 그리기 위한 컴파일된 계획 (요소 이름 -> TextSlot, 열 요소는 ColumnSlot 튜플).
+    정의되어 있지만 숨긴 요소(visible=false, 크기 0)는 None 슬롯으로 남겨 대체 요소로 넘어가지 않게 합니다.
+    """
+
+    __slots__ = ("template", "language", "size", "background_color", "slots")
+
+    def __init__(self, template, language, size, background_color, slots):
+        slots = MappingProxyType(dict(slots))
+        self._init(locals())
+
+    def get(self, key, fallback=None):
+        """요소 key의 슬롯을 반환합니다. key가 정의되어 있지 않으면 fallback 요소의 슬롯(또는 None)을 반환합니다."""
+        if key in self.slots or fallback is None:
+            return self.slots.get(key)
+        return self.slots.get(fallback)
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def text_slots(self):
+        """계획에 들어 있는 모든 TextSlot (열 요소의 제목/값 포함)."""
+        for slot in self.slots.values():
+            if isinstance(slot, TextSlot):
+                yield slot
+            elif slot:
+                for column in slot:
+                    yield column.title
+                    yield column.value
+
+
+def select_font_name(config, language):
+    """요소 설정에서 언어에 맞는 폰트 이름을 고릅니다 (한국어는 font_name_ko 우선)."""
+    if language == 'ko' and 'font_name_ko' in config:
+        return config['font_name_ko']
+    return config.get("font_name", DEFAULT_FONT_NAME)
+
+
+def compile_slot(key, config, language, font_loader):
+    """
+    요소 설정(dict) 하나를 TextSlot으로 컴파일합니다.
+    font_loader(font_name, size)는 폰트 객체를 반환해야 합니다. 그리지 않는 요소(visible=false, 크기 0)는 None입니다.
+    """
+    font_size = config.get("font_size", DEFAULT_FONT_SIZE)
+    if not config.get("visible", True) or font_size == 0:
+        return None
+
+    font_name = select_font_name(config, language)
+    return TextSlot(
+        key=key,
+        x=config.get("x", 0),
+        y=config.get("y", 0),
+        font=font_loader(font_name, font_size),
+        font_name=font_name,
+        color=parse_color(config.get("color", "#000000")),
+        align=config.get("align", "left"),
+        max_width=config.get("max_width"),
+        # 여러 줄 요소(rain_info)의 줄 간격, 없으면 폰트 크기 + 4
+        line_spacing=config.get("line_spacing", font_size + 4),
+        word_break=config.get("word_break", "normal"),
+    )
+
+
+def compile_columns(key, config, language, font_loader):
+    """
+    열 요소 설정을 ColumnSlot 튜플로 컴파일합니다. 각 열은 x를 중심으로 제목(y_title)과 값(y_temp)을 그립니다.
+    그리지 않는 요소(visible=false)는 None입니다.
+    """
+    if not config.get("visible", True):
+        return None
+
+    columns = []
+    for column in config.get("slots", []):
+        label = column.get("label_ko", column.get("label", "")) if language == 'ko' else column.get("label", "")
+        common = {
+            "x": column.get("x", 0),
+            "font_name": config.get("font_name", DEFAULT_FONT_NAME),
+            "color": config.get("color", "#FFFFFF"),
+            "align": "center",
+        }
+        if "font_name_ko" in config:
+            common["font_name_ko"] = config["font_name_ko"]
+        title = compile_slot(key, dict(common, y=config.get("y_title", 0), font_size=config.get("font_size_title", 32)),
+                             language, font_loader)
+        value = compile_slot(key, dict(common, y=config.get("y_temp", 0), font_size=config.get("font_size_temp", 48)),
+                             language, font_loader)
+        columns.append(ColumnSlot(label=label, hour=column.get("hour"), title=title, value=value))
+    return tuple(columns)
+
+
+def _validate_text_element(where, config, issues):
+    unknown_fields = sorted(set(config) - TEXT_ELEMENT_FIELDS)
+    if unknown_fields:
+        issues.append(f"{where}: 알 수 없는 필드 {', '.join(unknown_fields)}")
+    for field in ("x", "y", "font_size", "max_width", "line_spacing"):
+        if field in config and not _is_number(config[field]):
+            issues.append(f"{where}.{field}: 숫자가 아닙니다 ({config[field]!r})")
+    if "color" in config and not _is_valid_color(config["color"]):
+        issues.append(f"{where}.color: HEX 색상이 아닙니다 ({config['color']!r})")
+    if config.get("align", "left") not in ALIGNMENTS:
+        issues.append(f"{where}.align: {config['align']!r}는 {'/'.join(ALIGNMENTS)} 중 하나여야 합니다")
+    if config.get("word_break", "normal") not in WORD_BREAKS:
+        issues.append(f"{where}.word_break: {config['word_break']!r}는 {'/'.join(WORD_BREAKS)} 중 하나여야 합니다")
+
+
+def _validate_column_element(where, config, issues):
+    unknown_fields = sorted(set(config) - COLUMN_ELEMENT_FIELDS)
+    if unknown_fields:
+        issues.append(f"{where}: 알 수 없는 필드 {', '.join(unknown_fields)}")
+    for field in ("y_title", "y_temp", "font_size_title", "font_size_temp"):
+        if field in config and not _is_number(config[field]):
+            issues.append(f"{where}.{field}: 숫자가 아닙니다 ({config[field]!r})")
+    if "color" in config and not _is_valid_color(config["color"]):
+        issues.append(f"{where}.color: HEX 색상이 아닙니다 ({config['color']!r})")
+
+    columns = config.get("slots")
+    if not isinstance(columns, list) or not columns:
+        issues.append(f"{where}.slots: 열 목록이 없습니다")
+        return
+    for i, column in enumerate(columns):
+        if not isinstance(column, dict):
+            issues.append(f"{where}.slots[{i}]: 값이 객체가 아닙니다")
+            continue
+        unknown_fields = sorted(set(column) - COLUMN_FIELDS)
+        if unknown_fields:
+            issues.append(f"{where}.slots[{i}]: 알 수 없는 필드 {', '.join(unknown_fields)}")
+        if not _is_number(column.get("x")):
+            issues.append(f"{where}.slots[{i}].x: 숫자가 아닙니다 ({column.get('x')!r})")
+        hour = column.get("hour")
+        if not isinstance(hour, int) or isinstance(hour, bool) or not 0 <= hour <= 23:
+            issues.append(f"{where}.slots[{i}].hour: 0~23 사이의 정수가 아닙니다 ({hour!r})")
+
+
+def validate(positions):
+    """
+    positions.json 내용을 검사하여 문제 목록(문자열)을 반환합니다. 문제가 없으면 빈 리스트입니다.
+    알 수 없는 요소(정의되어 있지만 그리지 않음), 빠진 요소, 알 수 없는 필드, 잘못된 값을 찾습니다.
+    """
+    issues = []
+    if not isinstance(positions, dict):
+        return ["최상위 값이 객체가 아닙니다"]
+
+    for template, (expected, optional) in TEMPLATE_ELEMENTS.items():
+        elements = positions.get(template, {}).get("elements")
+        if not isinstance(elements, dict):
+            issues.append(f"{template}.elements가 없습니다")
+            continue
+
+        for key in expected:
+            if key not in elements and key not in optional:
+                issues.append(f"{template}.elements.{key}: 그리는 요소인데 정의되어 있지 않습니다")
+
+        for key, config in elements.items():
+            where = f"{template}.elements.{key}"
+            if key not in expected:
+                issues.append(f"{where}: 정의되어 있지만 그리지 않는 요소입니다")
+                continue
+            if not isinstance(config, dict):
+                issues.append(f"{where}: 값이 객체가 아닙니다")
+                continue
+
+            if key in COLUMN_ELEMENTS:
+                _validate_column_element(where, config, issues)
+            else:
+                _validate_text_element(where, config, issues)
+
+    return issues
+
+
+def compile_plan(positions, template, language, font_loader):
+    """positions.json의 template 하나를 language용 LayoutPlan으로 컴파일합니다."""
+    template_config = positions.get(template, {})
+    elements = template_config.get("elements", {})
+    expected = TEMPLATE_ELEMENTS.get(template, (tuple(elements), frozenset()))[0]
+
+    slots = {}
+    for key in expected:
+        config = elements.get(key)
+        if isinstance(config, dict):
+            compile_element = compile_columns if key in COLUMN_ELEMENTS else compile_slot
+            slots[key] = compile_element(key, config, language, font_loader)
+
+    return LayoutPlan(
+        template=template,
+        language=language,
+        size=tuple(template_config.get("size", [1080, 1350])),
+        background_color=parse_color(template_config.get("background_color", "#FFFFFF")),
+        slots=slots,
+    )
@@ -0,0 +1,141 @@
+# rendering/raw_templates.py
+# 템플릿 PNG를 미리 디코딩해 둔 원시 RGBA 파일입니다.
+# CI에서는 매번 새 프로세스로 시작하므로 템플릿 PNG 디코딩(압축 해제) 시간이 그대로 첫 렌더링 지연이 됩니다.
+# build 단계에서 템플릿마다 [헤더 64바이트 + RGBA 픽셀]을 RAW_TEMPLATE_DIR에 써 두면,
+# template_store가 PNG 대신 이 파일을 메모리 매핑으로 열어 디코딩 없이 씁니다 (첫 접근 시 페이지를 읽어 들이는 비용뿐).
+# 헤더에는 원본 PNG의 SHA-256이 들어 있어, PNG가 바뀌면 원시 파일은 무시되고 다시 build할 때 갱신됩니다.
+# 레이어 템플릿(배경 + 언어 레이어)은 합성한 결과를 쓰고, 해시는 template_store.file_digest의 구성 해시를 씁니다.
+#
+# 빌드 (이미 최신인 파일은 건너뜀):
+#   python -m rendering.raw_templates
+
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from config import RAW_TEMPLATE_DIR
+
+MAGIC = b"WXTPLRAW"
+FORMAT_VERSION = 1
+# 매직, 형식 버전, 색상 모드(4바이트 ASCII), 너비, 높이, 원본 PNG의 SHA-256
+_HEADER = struct.Struct("<8sH4sII32s")
+# 픽셀 데이터가 정렬된 위치에서 시작하도록 헤더를 64바이트로 채웁니다.
+HEADER_SIZE = 64
+MODE = "RGBA"
+
+
+def raw_path(png_path, raw_dir=None):
+    """PNG 템플릿에 대응하는 원시 파일 경로 ({상위 폴더}_{파일명}.rgba)."""
+    png_path = Path(png_path)
+    return Path(raw_dir or RAW_TEMPLATE_DIR) / f"{png_path.parent.name}_{png_path.stem}.rgba"
+
+
+def _read_header(f):
+    """헤더를 읽어 (모드, (너비, 높이), SHA-256 hex)를 반환합니다. 형식이 다르면 None."""
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        return None
+    magic, version, mode, width, height, digest = _HEADER.unpack_from(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return mode.decode("ascii"), (width, height), digest.hex()
+
+
+def open_mapped(png_path, digest, raw_dir=None):
+    """
+    원시 파일을 메모리 매핑해 읽기 전용 이미지로 반환합니다 (픽셀 복사 없음).
+    파일이 없거나, 형식/크기가 맞지 않거나, 원본 PNG의 SHA-256(digest)이 헤더와 다르면 None을 반환합니다.
+    """
+    if digest is None:
+        return None
+    try:
+        f = open(raw_path(png_path, raw_dir), "rb")
+    except OSError:
+        return None
+
+    with f:
+        header = _read_header(f)
+        if header is None:
+            return None
+        mode, size, raw_digest = header
+        if raw_digest != digest or mode != MODE:
+            return None
+        if os.fstat(f.fileno()).st_size != HEADER_SIZE + size[0] * size[1] * len(mode):
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # 이미지가 memoryview를 통해 매핑을 참조하므로, 파일을 닫아도 이미지가 살아 있는 동안 매핑이 유지됩니다.
+    return Image.frombuffer(mode, size, memoryview(mapped)[HEADER_SIZE:], "raw", mode, 0, 1)
+
+
+def write(png_path, image, digest, raw_dir=None):
+    """디코딩한 템플릿 이미지를 원시 파일로 씁니다 (임시 파일에 쓴 뒤 교체). 쓴 경로를 반환합니다."""
+    image = image if image.mode == MODE else image.convert(MODE)
+    path = raw_path(png_path, raw_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, MODE.encode("ascii"), image.width, image.height,
+                          bytes.fromhex(digest))
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(image.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def is_current(png_path, digest, raw_dir=None):
+    """원시 파일이 있고 원본 PNG(digest)와 일치하는지 확인합니다."""
+    try:
+        with open(raw_path(png_path, raw_dir), "rb") as f:
+            header = _read_header(f)
+    except OSError:
+        return False
+    return header is not None and header[2] == digest
+
+
+def build(png_paths, raw_dir=None):
+    """
+    PNG 템플릿들의 원시 파일을 만듭니다. 원본과 일치하는 파일은 건너뜁니다.
+
+    Returns:
+        dict: {"built": 새로 쓴 수, "skipped": 최신이라 건너뛴 수, "bytes": 새로 쓴 용량}
+    """
+    # template_store가 이 모듈로 원시 파일을 열기 때문에, 순환 import를 피해 여기서 가져옵니다.
+    from rendering import template_store
+
+    result = {"built": 0, "skipped": 0, "bytes": 0}
+    for png_path in png_paths:
+        digest = template_store.file_digest(png_path)
+        if digest is None:
+            continue
+        if is_current(png_path, digest, raw_dir):
+            result["skipped"] += 1
+            continue
+        image = template_store.load_template(png_path)
+        if image is None:
+            continue
+        path = write(png_path, image, digest, raw_dir)
+        result["built"] += 1
+        result["bytes"] += path.stat().st_size
+    return result
+
+
+def template_pngs(templates_dir):
+    """템플릿 디렉토리(하위 posts 포함)의 모든 템플릿 경로 (레이어 템플릿 포함, 레이어 PNG 자체는 제외)."""
+    from rendering import template_store
+
+    return template_store.list_templates(templates_dir)
+
+
+if __name__ == "__main__":
+    from image_generator import ImageGenerator
+
+    templates_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else ImageGenerator().templates_dir
+    built = build(template_pngs(templates_dir))
+    print(f"✅ 원시 템플릿: 생성 {built['built']}개 ({built['bytes'] / (1024 * 1024):.1f}MB), "
+          f"최신이라 건너뜀 {built['skipped']}개 -> {RAW_TEMPLATE_DIR}")
@@ -0,0 +1,152 @@
+# rendering/render_cache.py
+# 렌더링 결과를 내용 기준으로 재사용하는 캐시입니다.
+# 키는 그릴 텍스트, 템플릿 파일, 레이아웃 설정, 폰트 파일, 출력 프로필의 해시로 만듭니다.
+# 입력이 모두 같으면 같은 픽셀이 나오므로 (재실행, Instagram 실패 후 재시도, CI 후 로컬 실행 등)
+# 다시 그리지 않고 이전에 저장한 이미지 경로를 돌려줍니다.
+# 항목은 RENDER_CACHE_DIR/{키}.json에 저장된 이미지 경로로 기록하며, prune()으로 개수/기간 기준 정리합니다.
+# 이미지는 캐시가 아니라 출력 폴더(게시한 결과물)의 파일이므로, 정리할 때는 항목(.json)만 지우고 이미지는 건드리지 않습니다.
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from config import RENDER_CACHE_DIR, RENDER_CACHE_ENABLED, RENDER_CACHE_MAX_AGE_DAYS, RENDER_CACHE_MAX_ENTRIES
+
+# 같은 입력이라도 그리는 코드가 바뀌면 결과가 달라지므로, 렌더링 방식을 바꿀 때 올립니다.
+RENDER_CACHE_VERSION = 1
+
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def make_key(*parts):
+    """렌더링 입력(JSON으로 표현 가능한 값들)으로 캐시 키를 만듭니다."""
+    raw = json.dumps([RENDER_CACHE_VERSION, *parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def derive_key(key, variant):
+    """다른 렌더링 결과에서 파생된 결과(예: 포스트 -> 스토리)의 키."""
+    return make_key(key, variant)
+
+
+def _entry_path(key):
+    return Path(RENDER_CACHE_DIR) / f"{key}.json"
+
+
+def get(key):
+    """캐시된 이미지 경로를 반환합니다. 항목이 없거나 이미지 파일이 지워졌으면 None."""
+    if not RENDER_CACHE_ENABLED or not key:
+        return None
+
+    try:
+        with open(_entry_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        _count("misses")
+        return None
+
+    path = Path(entry.get("path", ""))
+    if not path.is_file():
+        _count("misses")
+        return None
+
+    _count("hits")
+    return path
+
+
+def put(key, path, kind=None):
+    """렌더링 결과 이미지 경로를 기록합니다."""
+    if not RENDER_CACHE_ENABLED or not key or not path:
+        return
+
+    entry_path = _entry_path(key)
+    entry = {"path": str(Path(path).resolve()), "kind": kind, "stored_at": time.time()}
+    try:
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, entry_path)
+        _count("stores")
+    except OSError as e:
+        print(f"⚠️ 렌더 캐시 저장 실패: {e}")
+
+
+def _remove(entry_path):
+    try:
+        entry_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def prune(max_entries=None, max_age_days=None):
+    """
+    오래된 항목과 개수를 넘는 항목을 지웁니다. 항목(.json)만 지우며, 가리키던 출력 이미지는 그대로 둡니다.
+    max_age_days보다 오래된 항목을 지우고, 남은 항목이 max_entries를 넘으면 오래된 것부터 지웁니다.
+    이미지가 이미 없어진 항목도 지웁니다.
+
+    Returns:
+        dict: {"removed": 지운 항목 수, "kept": 남은 항목 수}
+    """
+    if max_entries is None:
+        max_entries = RENDER_CACHE_MAX_ENTRIES
+    if max_age_days is None:
+        max_age_days = RENDER_CACHE_MAX_AGE_DAYS
+
+    result = {"removed": 0, "kept": 0}
+    cache_dir = Path(RENDER_CACHE_DIR)
+    if not cache_dir.is_dir():
+        return result
+
+    entries = []
+    for entry_path in cache_dir.glob("*.json"):
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            image_path = Path(entry["path"])
+            stored_at = float(entry.get("stored_at", 0))
+        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError):
+            _remove(entry_path)
+            result["removed"] += 1
+            continue
+        entries.append((stored_at, entry_path, image_path))
+
+    cutoff = time.time() - max_age_days * 24 * 3600
+    for stored_at, entry_path, image_path in sorted(entries, reverse=True):
+        if stored_at < cutoff or result["kept"] >= max_entries or not image_path.is_file():
+            _remove(entry_path)
+            result["removed"] += 1
+        else:
+            result["kept"] += 1
+    return result
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    print(f" -> 렌더 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회, 저장 {stats['stores']}회 "
+          f"(적중률 {stats['hit_rate']:.0%})")
+
+
+def reset_stats():
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
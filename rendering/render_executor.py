@@ -0,0 +1,229 @@
+# rendering/render_executor.py
+# 언어/형식별 이미지 렌더링 작업을 여러 프로세스에서 나눠 실행합니다.
+# Pillow 렌더링은 CPU 작업이라 스레드로는 빨라지지 않으므로 프로세스 풀을 사용합니다.
+# 각 작업자 프로세스는 시작할 때 positions.json, 언어별 렌더링 계획(폰트 포함), 사용할 템플릿을 미리 읽어 둡니다.
+# 템플릿은 부모가 한 번 디코딩해 공유 메모리에 올리고 작업자는 복사 없이 붙여 쓰므로, 작업자가 늘어도 한 벌만 듭니다.
+# 작업은 (언어, 레이아웃, 템플릿 파일)이 같은 것끼리 묶어 같은 작업자에 넘기므로, 폰트/템플릿/토큰 폭 캐시와
+# 부분 렌더링의 바탕 이미지를 여러 변형(도시 등)이 이어서 씁니다.
+# render_batch는 결과를 끝나는 대로 내보내고, render_all은 작업을 넘긴 순서대로 모아 반환합니다.
+
+import concurrent.futures
+import os
+import time
+
+from config import RENDER_SHARED_TEMPLATES, RENDER_WORKERS
+from image_generator import ImageGenerator
+from rendering import shared_pool, template_store
+
+# post: 포스트 이미지, story: 포스트 이미지를 스토리 규격에 놓은 이미지, story_card: story_template으로 그린 스토리 이미지
+RENDER_FORMATS = ("post", "story", "story_card")
+
+# 작업자에 한 번에 넘기는 단위(같은 변형/언어의 post+story, 또는 story_card) 수
+BATCH_CHUNK_SIZE = 4
+
+_generator = None   # 작업자 프로세스마다 하나씩 만드는 ImageGenerator
+
+
+class RenderJob:
+    """
+    렌더링 작업 하나 (언어, 형식)와 그리는 데 필요한 데이터.
+    variant는 같은 언어/형식을 여러 벌 그릴 때(예: 도시별) 구분하는 이름으로, 출력 파일명에 붙습니다.
+    story 작업은 같은 변형/언어의 post 이미지(메모리)로 만들므로, 그 post 작업과 같은 작업자에서 이어서 실행됩니다.
+    """
+
+    __slots__ = ("language", "format", "data", "phrase", "activity_index_am", "activity_index_pm", "variant")
+
+    def __init__(self, language, format, data, phrase, activity_index_am, activity_index_pm, variant=None):
+        if format not in RENDER_FORMATS:
+            raise ValueError(f"지원하지 않는 렌더링 형식: {format} ({'/'.join(RENDER_FORMATS)} 중 하나)")
+        self.language = language
+        self.format = format
+        self.data = data
+        self.phrase = phrase
+        self.activity_index_am = activity_index_am
+        self.activity_index_pm = activity_index_pm
+        self.variant = variant
+
+    def __repr__(self):
+        if self.variant:
+            return f"RenderJob({self.language!r}, {self.format!r}, variant={self.variant!r})"
+        return f"RenderJob({self.language!r}, {self.format!r})"
+
+
+def _layout_template(format):
+    return 'story_template' if format == "story_card" else 'post_template'
+
+
+def _template_format(format):
+    return 'story' if format == "story_card" else 'post'
+
+
+def _init_worker(base_dir_name, plans, template_paths, shared_templates=()):
+    """
+    작업자 프로세스 초기화: 설정, (언어, 템플릿)별 렌더링 계획(폰트), 템플릿을 미리 로드합니다.
+    shared_templates(shared_pool.SharedTemplate 목록)에 있는 템플릿은 디코딩하지 않고 공유 메모리를 그대로 씁니다.
+    """
+    global _generator
+    shared_pool.attach(shared_templates)
+    _generator = ImageGenerator(base_dir_name)
+    _generator.setup()
+    for language, template in plans:
+        _generator.get_layout_plan(language, template)
+    for path in template_paths:
+        template_store.load_template(path)
+
+
+def _render_post(job):
+    """포스트 이미지를 그려 저장하고 (경로, 결과 딕셔너리: 메모리 이미지와 렌더 캐시 키)를 반환합니다."""
+    return _generator.create_post_image(job.data, job.phrase, job.activity_index_am, job.activity_index_pm,
+                                        language=job.language, variant=job.variant)
+
+
+def _render_unit(jobs):
+    """같은 변형/언어의 작업들을 순서대로 실행하고 작업별 결과 경로(실패 시 None)를 반환합니다."""
+    paths = []
+    post = None     # (경로, 결과 딕셔너리)
+    for job in jobs:
+        if job.format == "post":
+            post = _render_post(job)
+            paths.append(post[0])
+        elif job.format == "story":
+            # story는 같은 언어의 post 이미지를 메모리에서 바로 씁니다. post 작업이 없었다면 먼저 그립니다.
+            # post가 렌더 캐시에 적중해 메모리 이미지가 없으면 캐시된 PNG 경로를 씁니다.
+            if post is None and not any(j.format == "post" for j in jobs):
+                post = _render_post(job)
+            post_path, post_result = post or (None, {})
+            source = post_result.get("image") or post_path
+            paths.append(_generator.create_story_from_post(source, job.language,
+                                                           cache_key=post_result.get("cache_key"),
+                                                           variant=job.variant)
+                         if source else None)
+        else:
+            path, _ = _generator.create_story_image(job.data, job.phrase, language=job.language, variant=job.variant)
+            paths.append(path)
+    return paths
+
+
+def _render_chunk(units):
+    """작업 단위 목록을 차례로 실행합니다. 한 단위가 실패해도 나머지 단위는 계속 그립니다."""
+    results = []
+    for jobs in units:
+        try:
+            results.append(_render_unit(jobs))
+        except Exception as e:
+            print(f"❌ {jobs[0].language.upper()} 렌더링 작업 실패 ({', '.join(map(repr, jobs))}): {e}")
+            results.append([None] * len(jobs))
+    return results
+
+
+def _unit_key(job):
+    """같은 작업자에서 이어서 그려야 하는 작업 단위: post와 그 post로 만드는 story는 한 단위입니다."""
+    return (job.variant, job.language, "story_card" if job.format == "story_card" else "post")
+
+
+def _group_key(generator, job):
+    """템플릿과 폰트 묶음 (언어, 레이아웃 템플릿, 템플릿 파일 경로). 같은 묶음의 작업은 같은 자원을 씁니다."""
+    format = _template_format(job.format)
+    filename = generator._select_template_by_weather(job.data['weather_summary'], job.language, format,
+                                                     verbose=False)
+    return (job.language, _layout_template(job.format), str(generator._get_template_path(filename, format)))
+
+
+def _plan_chunks(generator, jobs, chunk_size):
+    """작업을 단위로 묶고, 단위를 템플릿/폰트 묶음별로 모아 chunk_size개씩 나눈 [[작업 번호 목록]] 목록을 반환합니다."""
+    units = {}
+    for index, job in enumerate(jobs):
+        units.setdefault(_unit_key(job), []).append(index)
+
+    groups = {}
+    for indices in units.values():
+        groups.setdefault(_group_key(generator, jobs[indices[0]]), []).append(indices)
+
+    chunks = []
+    for group_units in groups.values():
+        for start in range(0, len(group_units), chunk_size):
+            chunks.append(group_units[start:start + chunk_size])
+    return chunks, sorted(groups)
+
+
+def render_batch(jobs, base_dir_name="weather_service", max_workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    렌더링 작업 목록을 실행하고 (작업 번호, 작업, 결과 경로 또는 None)을 끝나는 대로 내보냅니다.
+
+    작업은 (언어, 레이아웃, 템플릿 파일)이 같은 것끼리 묶어 chunk_size 단위씩 작업자에 넘기므로,
+    같은 묶음의 변형들은 한 작업자에서 디코딩한 템플릿, 폰트, 토큰 폭 캐시와 부분 렌더링을 함께 씁니다.
+    max_workers(기본값 config.RENDER_WORKERS, 0이면 CPU 수)가 1 이하이거나 나눈 묶음이 하나면 현재 프로세스에서 실행합니다.
+    모두 끝나면 처리량(장/초)을 출력합니다.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    chunks, groups = _plan_chunks(ImageGenerator(base_dir_name), jobs, chunk_size)
+    plans = sorted({(language, template) for language, template, _ in groups})
+    template_paths = sorted({path for _, _, path in groups})
+
+    if max_workers is None:
+        max_workers = RENDER_WORKERS
+    if max_workers <= 0:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(chunks))
+
+    started = time.monotonic()
+    rendered = 0
+
+    def chunk_results(chunk, chunk_paths):
+        for indices, unit_paths in zip(chunk, chunk_paths):
+            for index, path in zip(indices, unit_paths):
+                yield index, jobs[index], path
+
+    def failed(chunk, error):
+        print(f"❌ 렌더링 작업 실패 ({len(chunk)}개 단위): {error}")
+        return [[None] * len(indices) for indices in chunk]
+
+    if max_workers <= 1:
+        _init_worker(base_dir_name, plans, template_paths)
+        for chunk in chunks:
+            try:
+                chunk_paths = _render_chunk([[jobs[i] for i in indices] for indices in chunk])
+            except Exception as e:
+                chunk_paths = failed(chunk, e)
+            for result in chunk_results(chunk, chunk_paths):
+                rendered += result[2] is not None
+                yield result
+    else:
+        shared_paths = template_paths if RENDER_SHARED_TEMPLATES else ()
+        # 풀을 먼저 닫고(작업자 종료) 공유 메모리를 해제하도록 with 순서를 둡니다.
+        with shared_pool.SharedTemplatePool(shared_paths) as shared_templates, \
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers, initializer=_init_worker,
+                    initargs=(base_dir_name, plans, template_paths, shared_templates.descriptors)) as executor:
+            futures = {
+                executor.submit(_render_chunk, [[jobs[i] for i in indices] for indices in chunk]): chunk
+                for chunk in chunks
+            }
+            for future in concurrent.futures.as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk_paths = future.result()
+                except Exception as e:
+                    chunk_paths = failed(chunk, e)
+                for result in chunk_results(chunk, chunk_paths):
+                    rendered += result[2] is not None
+                    yield result
+
+    elapsed = time.monotonic() - started
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    print(f" -> 렌더링 완료: 작업 {len(jobs)}개 중 {rendered}장, 템플릿 묶음 {len(groups)}개, 프로세스 {max_workers}개 "
+          f"({elapsed:.2f}초, {rate:.1f}장/초)")
+
+
+def render_all(jobs, base_dir_name="weather_service", max_workers=None):
+    """
+    렌더링 작업 목록을 실행하고 [(작업, 결과 경로 또는 None)]을 작업을 넘긴 순서대로 반환합니다 (render_batch 참고).
+    """
+    jobs = list(jobs)
+    paths = [None] * len(jobs)
+    for index, _, path in render_batch(jobs, base_dir_name, max_workers):
+        paths[index] = path
+    return list(zip(jobs, paths))
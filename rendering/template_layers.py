@@ -0,0 +1,121 @@
+# rendering/template_layers.py
+# 언어별 포스트 템플릿을 [공유 배경 + 작은 언어 레이어]로 나누는 도구입니다.
+# post_sunny.png와 post_sunny_ko.png는 같은 그림에 라벨 글자만 다르므로, 다른 픽셀만 담은 RGBA 레이어
+# (알파 0 = 배경 유지, 255 = 언어 픽셀)를 차이가 있는 사각형만큼 잘라 layers/ 폴더에 저장하고 layers.json에 등록합니다.
+# template_store는 layers.json에 있는 템플릿을 배경 위에 레이어를 붙여 합성하므로, 언어가 늘어도 레이어만 추가하면 됩니다.
+# 레이어는 원래 언어 템플릿과 픽셀 단위로 같은지 확인한 뒤에만 등록하며, --remove를 주면 원래 PNG를 지웁니다.
+#
+# 사용법 (템플릿 디렉토리, 언어 코드):
+#   python -m rendering.template_layers weather_service/templates/posts ko [--remove]
+
+import json
+import sys
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+from rendering import template_store
+
+
+def make_layer(base, variant):
+    """
+    variant가 base와 다른 픽셀만 담은 RGBA 레이어와 붙일 위치 (x, y)를 반환합니다. 같으면 (None, (0, 0)).
+    두 이미지의 크기가 다르면 ValueError.
+    """
+    if base.size != variant.size:
+        raise ValueError(f"배경과 크기가 다릅니다: {base.size} != {variant.size}")
+    base = base.convert("RGBA")
+    variant = variant.convert("RGBA")
+
+    # 채널 중 하나라도 다르면 255인 마스크
+    difference = ImageChops.difference(base, variant)
+    mask = Image.new("L", base.size, 0)
+    for channel in difference.split():
+        mask = ImageChops.lighter(mask, channel.point(lambda value: 255 if value else 0))
+    box = mask.getbbox()
+    if box is None:
+        return None, (0, 0)
+
+    # 투명한 픽셀은 색도 0으로 비워 둡니다 (붙일 때 쓰이지 않고, PNG 압축이 훨씬 잘 됨).
+    mask = mask.crop(box)
+    layer = Image.composite(variant.crop(box), Image.new("RGBA", mask.size, (0, 0, 0, 0)), mask)
+    layer.putalpha(mask)
+    return layer, box[:2]
+
+
+def compose(base, layer, offset):
+    """base 복사본에 레이어를 붙인 결과 (template_store의 합성과 같은 방식)."""
+    image = base.convert("RGBA")
+    if layer is not None:
+        image.paste(layer, offset, layer)
+    return image
+
+
+def split(base_path, variant_path):
+    """
+    variant_path 템플릿을 base_path 배경과 레이어로 나누어 layers/에 저장하고 layers.json에 등록합니다.
+    합성 결과가 원래 템플릿과 다르면 등록하지 않고 ValueError. 저장한 레이어의 바이트 수를 반환합니다.
+    """
+    base_path, variant_path = Path(base_path), Path(variant_path)
+    directory = variant_path.parent
+    with Image.open(base_path) as source:
+        base = source.convert("RGBA")
+    with Image.open(variant_path) as source:
+        variant = source.convert("RGBA")
+
+    layer, offset = make_layer(base, variant)
+    if compose(base, layer, offset).tobytes() != variant.tobytes():
+        raise ValueError(f"레이어 합성 결과가 원래 템플릿과 다릅니다: {variant_path}")
+
+    entry = {"base": base_path.name, "layers": []}
+    size = 0
+    if layer is not None:
+        layer_file = Path(template_store.LAYER_DIR) / variant_path.name
+        (directory / layer_file).parent.mkdir(parents=True, exist_ok=True)
+        layer.save(directory / layer_file, optimize=True)
+        entry["layers"].append({"file": layer_file.as_posix(), "offset": list(offset)})
+        size = (directory / layer_file).stat().st_size
+
+    manifest_path = directory / template_store.LAYER_MANIFEST
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    manifest[variant_path.name] = entry
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+                             encoding="utf-8")
+    return size
+
+
+def split_directory(directory, language, remove=False):
+    """
+    directory의 *_{language}.png 템플릿 중 같은 이름의 배경(*.png)이 있는 것을 모두 레이어로 나눕니다.
+    remove=True면 등록을 마친 원래 언어 PNG를 지웁니다.
+
+    Returns:
+        dict: {"split": 나눈 수, "original_bytes": 원래 PNG 용량, "layer_bytes": 레이어 용량}
+    """
+    directory = Path(directory)
+    suffix = f"_{language}"
+    result = {"split": 0, "original_bytes": 0, "layer_bytes": 0}
+    for variant_path in sorted(directory.glob(f"*{suffix}.png")):
+        base_path = variant_path.with_name(variant_path.stem[:-len(suffix)] + ".png")
+        if not base_path.exists():
+            print(f"⚠️ 배경 템플릿이 없어 건너뜁니다: {variant_path.name}")
+            continue
+        original_bytes = variant_path.stat().st_size
+        layer_bytes = split(base_path, variant_path)
+        print(f" -> {variant_path.name}: {original_bytes / 1024:.0f}KB -> 레이어 {layer_bytes / 1024:.0f}KB")
+        result["split"] += 1
+        result["original_bytes"] += original_bytes
+        result["layer_bytes"] += layer_bytes
+        if remove:
+            variant_path.unlink()
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("사용법: python -m rendering.template_layers <템플릿 디렉토리> <언어 코드> [--remove]")
+        sys.exit(1)
+
+    split_result = split_directory(sys.argv[1], sys.argv[2], remove="--remove" in sys.argv[3:])
+    print(f"✅ 레이어 템플릿: {split_result['split']}개, "
+          f"{split_result['original_bytes'] / 1024:.0f}KB -> {split_result['layer_bytes'] / 1024:.0f}KB")
@@ -0,0 +1,304 @@
+# rendering/template_store.py
+# 프로세스 전체에서 공유하는 템플릿 저장소입니다.
+# 템플릿 PNG는 경로마다 한 번만 디코딩(RGBA 변환 포함)해 보관하고, 렌더링할 때는 복사본을 넘깁니다.
+# 파일의 수정 시각(mtime)이나 크기가 바뀌면 다시 디코딩합니다. positions.json 같은 설정 파일과 파일 해시도 같은 방식으로 보관합니다.
+# 렌더링 작업자 프로세스는 부모가 공유 메모리에 올린 템플릿(rendering/shared_pool.py)을 adopt()로 등록해 디코딩 없이 씁니다.
+# 미리 디코딩한 원시 파일(rendering/raw_templates.py)이 원본 PNG와 일치하면 PNG 대신 메모리 매핑으로 엽니다.
+# 레이어 템플릿: 경로에 PNG가 없고 같은 폴더의 layers.json에 정의되어 있으면, 공유 배경 PNG 위에 언어 레이어를
+# 합성한 결과를 그 경로의 템플릿으로 씁니다 (합성은 한 번만 하고 보관). 레이어는 rendering/template_layers.py로 만듭니다.
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from config import RAW_TEMPLATES_ENABLED
+from rendering import raw_templates
+
+_templates = {}    # 경로 -> (파일 서명, 디코딩된 RGBA 이미지)
+_json_files = {}   # 경로 -> (파일 서명, 파싱된 객체)
+_digests = {}      # 경로 -> (파일 서명, SHA-256)
+_shared = set()    # 프로세스 힙이 아닌 메모리(공유 메모리, 메모리 매핑 파일)를 가리키는 템플릿 경로
+_layer_specs = {}  # 경로 -> (매니페스트 서명, 레이어 템플릿 정의 또는 None)
+_available = {}    # 디렉토리 -> ((디렉토리 서명, 매니페스트 서명), 템플릿 파일 이름 집합)
+_lock = threading.RLock()
+_stats = {"hits": 0, "misses": 0, "mapped": 0, "decode_seconds": 0.0}
+
+# 레이어 템플릿 정의 파일 이름과, 레이어 PNG를 두는 하위 폴더 이름 (템플릿 목록에서 제외)
+LAYER_MANIFEST = "layers.json"
+LAYER_DIR = "layers"
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _layer_spec(key):
+    """
+    레이어 템플릿 정의를 (매니페스트 경로, 배경 경로, [(레이어 경로, (x, y))])로 반환합니다. 정의가 없으면 None.
+    layers.json 형식: {"post_sunny_ko.png": {"base": "post_sunny.png",
+                                            "layers": [{"file": "layers/post_sunny_ko.png", "offset": [x, y]}]}}
+    """
+    path = Path(key)
+    manifest = path.parent / LAYER_MANIFEST
+    manifest_signature = _file_signature(manifest) if path.suffix == ".png" else None
+    if manifest_signature is None:
+        return None
+    with _lock:
+        cached = _layer_specs.get(key)
+        if cached is not None and cached[0] == manifest_signature:
+            return cached[1]
+
+    spec = None
+    try:
+        entry = _read_json(manifest).get(path.name)
+        if entry:
+            layers = [(manifest.parent / layer["file"], tuple(layer.get("offset", (0, 0))))
+                      for layer in entry.get("layers", ())]
+            spec = (manifest, manifest.parent / entry["base"], layers)
+    except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+        print(f"⚠️ 레이어 템플릿 정의 오류 ({manifest}, {path.name}): {e}")
+    with _lock:
+        _layer_specs[key] = (manifest_signature, spec)
+    return spec
+
+
+def signature(path):
+    """
+    템플릿/파일이 바뀌었는지 판단하는 값. 파일은 (mtime, 크기), 레이어 템플릿은 매니페스트, 배경, 레이어 파일 서명의 튜플.
+    파일도 레이어 정의도 없으면(또는 구성 파일이 빠졌으면) None.
+    """
+    file_signature = _file_signature(path)
+    if file_signature is not None:
+        return file_signature
+    spec = _layer_spec(str(path))
+    if spec is None:
+        return None
+    manifest, base, layers = spec
+    parts = (_file_signature(manifest), _file_signature(base)) + tuple(_file_signature(layer) for layer, _ in layers)
+    return None if None in parts else parts
+
+
+def available(directory):
+    """
+    디렉토리에 바로 들어 있는 템플릿 파일 이름 집합 (PNG 파일과 layers.json의 레이어 템플릿).
+    한 번 만든 집합은 디렉토리와 매니페스트의 서명이 그대로인 동안 재사용하므로, 확인할 때마다 stat 두 번만 합니다.
+    """
+    directory = Path(directory)
+    key = str(directory)
+    manifest = directory / LAYER_MANIFEST
+    directory_signature = (_file_signature(directory), _file_signature(manifest))
+    with _lock:
+        cached = _available.get(key)
+        if cached is not None and cached[0] == directory_signature:
+            return cached[1]
+
+    names = {path.name for path in directory.glob("*.png")}
+    if directory_signature[1] is not None:
+        names.update(_read_json(manifest))
+    names = frozenset(names)
+    with _lock:
+        _available[key] = (directory_signature, names)
+    return names
+
+
+def exists(path):
+    """path에 템플릿이 있는지 (PNG 파일 또는 레이어 템플릿). available()의 집합으로 확인합니다."""
+    path = Path(path)
+    return path.name in available(path.parent)
+
+
+def list_templates(directory):
+    """디렉토리(하위 폴더 포함)의 템플릿 경로 목록: PNG 파일과 레이어 템플릿. 레이어 PNG 자체는 빼고 반환합니다."""
+    directory = Path(directory)
+    paths = {path for path in directory.rglob("*.png") if LAYER_DIR not in path.relative_to(directory).parts[:-1]}
+    for manifest in directory.rglob(LAYER_MANIFEST):
+        paths.update(manifest.parent / name for name in _read_json(manifest))
+    return sorted(paths)
+
+
+def _compose(key):
+    """레이어 템플릿을 배경 템플릿 복사본 위에 레이어를 붙여 만듭니다. 구성 파일이 없으면 None."""
+    spec = _layer_spec(key)
+    if spec is None:
+        return None
+    _, base, layers = spec
+    base_image = load_template(base)
+    if base_image is None:
+        return None
+    image = base_image.copy()
+    for layer_path, offset in layers:
+        with Image.open(layer_path) as source:
+            layer = source.convert("RGBA")
+        # 레이어의 알파는 0(배경 유지) 또는 255(언어 픽셀)뿐이라, 마스크 붙여 넣기가 원래 언어 템플릿을 그대로 재현합니다.
+        image.paste(layer, offset, layer)
+    return image
+
+
+def _image_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+def load_template(path):
+    """
+    디코딩된 템플릿 원본을 반환합니다. 파일이 없으면 None을 반환합니다.
+    반환된 이미지는 다른 렌더링과 공유되므로 수정하지 마세요 (그릴 때는 get_template 사용).
+    """
+    key = str(path)
+    file_signature = signature(key)
+    with _lock:
+        if file_signature is None:
+            _templates.pop(key, None)
+            _shared.discard(key)
+            return None
+
+        cached = _templates.get(key)
+        if cached is not None and cached[0] == file_signature:
+            _stats["hits"] += 1
+            return cached[1]
+
+        started = time.perf_counter()
+        image = raw_templates.open_mapped(key, file_digest(key)) if RAW_TEMPLATES_ENABLED else None
+        if image is not None:
+            _stats["mapped"] += 1
+            _shared.add(key)
+        elif _file_signature(key) is not None:
+            with Image.open(key) as source:
+                image = source.convert("RGBA")
+            _shared.discard(key)
+        else:
+            image = _compose(key)
+            _shared.discard(key)
+            if image is None:
+                return None
+        _stats["decode_seconds"] += time.perf_counter() - started
+        _stats["misses"] += 1
+
+        _templates[key] = (file_signature, image)
+        return image
+
+
+def adopt(path, file_signature, image):
+    """
+    다른 곳에서 디코딩한 템플릿(예: 공유 메모리를 가리키는 이미지)을 path의 템플릿으로 등록합니다.
+    file_signature는 디코딩할 때의 signature(path)이며, 파일이 그 뒤에 바뀌었다면 다음 조회에서 다시 디코딩합니다.
+    """
+    key = str(path)
+    with _lock:
+        _templates[key] = (tuple(file_signature), image)
+        _shared.add(key)
+
+
+def is_shared(path):
+    """보관 중인 path 템플릿이 프로세스 힙이 아닌 메모리(공유 메모리, 메모리 매핑 파일)를 가리키는지."""
+    with _lock:
+        return str(path) in _shared
+
+
+def get_template(path):
+    """그림을 그려도 되는 템플릿 복사본을 반환합니다 (PNG 디코딩 없이 메모리 복사만 함). 파일이 없으면 None."""
+    image = load_template(path)
+    return image.copy() if image is not None else None
+
+
+def load_json(path):
+    """
+    JSON 파일을 파싱해 반환합니다. 파일이 바뀌지 않았다면 디스크를 다시 읽지 않습니다.
+    호출한 쪽에서 수정해도 캐시가 바뀌지 않도록 복사본을 반환합니다.
+    파일이 없으면 FileNotFoundError, 형식이 잘못되면 json.JSONDecodeError를 그대로 발생시킵니다.
+    """
+    return copy.deepcopy(_read_json(path))
+
+
+def _read_json(path):
+    """load_json과 같지만 보관 중인 객체를 그대로 반환합니다 (읽기만 하는 모듈 내부용)."""
+    key = str(path)
+    file_signature = _file_signature(key)
+    with _lock:
+        if file_signature is None:
+            _json_files.pop(key, None)
+            raise FileNotFoundError(key)
+
+        cached = _json_files.get(key)
+        if cached is None or cached[0] != file_signature:
+            with open(key, 'r', encoding='utf-8') as f:
+                cached = (file_signature, json.load(f))
+            _json_files[key] = cached
+        return cached[1]
+
+
+def file_digest(path):
+    """
+    파일 내용의 SHA-256(hex)을 반환합니다. 파일이 바뀌지 않았다면 다시 읽지 않습니다. 파일이 없으면 None.
+    레이어 템플릿은 배경과 레이어 파일의 해시, 레이어 위치로 만든 해시를 반환합니다.
+    """
+    key = str(path)
+    file_signature = signature(key)
+    if file_signature is None:
+        return None
+    with _lock:
+        cached = _digests.get(key)
+        if cached is not None and cached[0] == file_signature:
+            return cached[1]
+
+    digest = hashlib.sha256()
+    if _file_signature(key) is None:
+        _, base, layers = _layer_spec(key)
+        parts = [file_digest(base)] + [f"{file_digest(layer)}@{x},{y}" for layer, (x, y) in layers]
+        digest.update(json.dumps(parts).encode("utf-8"))
+    else:
+        with open(key, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    with _lock:
+        _digests[key] = (file_signature, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def get_stats():
+    """
+    템플릿 적중/로드 횟수(그중 원시 파일 매핑 횟수), 누적 로드 시간, 보관 중인 템플릿 수와 이 프로세스만 쓰는 메모리(바이트),
+    공유 메모리나 매핑 파일을 가리키는 템플릿 수를 반환합니다.
+    """
+    with _lock:
+        stats = dict(_stats)
+        stats["cached"] = len(_templates)
+        stats["shared"] = len(_shared)
+        stats["memory_bytes"] = sum(_image_bytes(image) for key, (_, image) in _templates.items() if key not in _shared)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    shared = f", 공유/매핑 {stats['shared']}개" if stats["shared"] else ""
+    mapped = f", 그중 매핑 {stats['mapped']}회" if stats["mapped"] else ""
+    print(f" -> 템플릿 캐시: 적중 {stats['hits']}회, 디코딩 {stats['misses']}회{mapped} ({stats['decode_seconds']:.3f}초), "
+          f"보관 {stats['cached']}개 ({stats['memory_bytes'] / (1024 * 1024):.1f}MB{shared})")
+
+
+def reset_stats():
+    with _lock:
+        _stats.update({"hits": 0, "misses": 0, "mapped": 0, "decode_seconds": 0.0})
+
+
+def clear():
+    """보관 중인 템플릿과 설정 파일을 모두 비웁니다."""
+    with _lock:
+        _templates.clear()
+        _shared.clear()
+        _json_files.clear()
+        _digests.clear()
+        _layer_specs.clear()
+        _available.clear()
@@ -0,0 +1,119 @@
+# rendering/text_layout.py
+# max_width 줄바꿈과 정렬에 쓰는 텍스트 배치 엔진입니다.
+# 텍스트를 토큰(영어 단어, 공백, 한글 글자)으로 나누고 토큰마다 폭을 한 번만 재서 (폰트, 토큰)별로 보관한 뒤,
+# 누적 폭으로 한 번에 줄을 나눕니다. 한글은 글자 단위로 줄을 바꿀 수 있습니다.
+# 계산한 줄 폭은 가운데/오른쪽 정렬에도 그대로 씁니다.
+
+import re
+import threading
+from collections import OrderedDict
+
+# 보관할 (폰트, 토큰) 폭 수
+ADVANCE_CACHE_SIZE = 4096
+
+# 한글 자모/호환 자모/음절
+HANGUL_CHARS = "ᄀ-ᇿ㄰-㆏가-힣"
+# 한글 글자 뒤에 붙어 다음 줄 맨 앞으로 넘어가지 않아야 하는 문장 부호
+CLOSING_PUNCTUATION = ".,!?…:;)\\]}'\"%~」』>·"
+
+_TOKEN_PATTERN = re.compile(
+    rf"\n|[^\S\n]+|[{HANGUL_CHARS}][{CLOSING_PUNCTUATION}]*|[^\s{HANGUL_CHARS}]+"
+)
+_HANGUL_PATTERN = re.compile(rf"[{HANGUL_CHARS}]")
+
+_SPACE, _WORD, _HANGUL = "space", "word", "hangul"
+
+_advances = OrderedDict()   # (폰트, 토큰) -> 폭(px)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def tokenize(text):
+    """텍스트를 줄바꿈, 공백 덩어리, 한글 글자(+뒤따르는 문장 부호), 그 밖의 단어 토큰으로 나눕니다."""
+    return _TOKEN_PATTERN.findall(str(text))
+
+
+def _kind(token):
+    if token.isspace():
+        return _SPACE
+    return _HANGUL if _HANGUL_PATTERN.match(token) else _WORD
+
+
+def advance(font, token):
+    """토큰의 가로 폭(px)을 반환합니다. 같은 (폰트, 토큰)은 한 번만 잽니다."""
+    key = (font, token)
+    with _lock:
+        width = _advances.get(key)
+        if width is not None:
+            _advances.move_to_end(key)
+            _stats["hits"] += 1
+            return width
+
+    width = font.getlength(token)
+    with _lock:
+        _stats["misses"] += 1
+        _advances[key] = width
+        if len(_advances) > ADVANCE_CACHE_SIZE:
+            _advances.popitem(last=False)
+    return width
+
+
+def layout_lines(text, font, max_width=None, break_hangul=True):
+    """
+    텍스트를 줄 목록 [(줄 텍스트, 폭)]으로 배치합니다.
+    max_width가 있으면 폭을 넘기 전에 줄을 바꿉니다. 줄은 공백 위치나 한글 글자 사이에서만 바뀌고,
+    바뀐 자리의 공백은 버립니다. 한 토큰이 max_width보다 길면 그 줄에 그대로 둡니다.
+    break_hangul=False이면 한글도 공백 위치에서만 줄을 바꿉니다 (좁은 칸의 짧은 단어용).
+    """
+    lines = []
+    line, width = [], 0.0
+    pending = ""        # 다음 토큰 앞에 붙일 공백
+    previous = None     # 직전 토큰 종류
+
+    for token in tokenize(text):
+        if token == "\n":
+            lines.append(("".join(line), width))
+            line, width, pending, previous = [], 0.0, "", None
+            continue
+
+        kind = _kind(token)
+        if kind == _SPACE:
+            pending += token
+            previous = _SPACE
+            continue
+
+        token_width = advance(font, token)
+        space_width = advance(font, pending) if pending else 0.0
+        breakable = previous == _SPACE or (break_hangul and kind == _HANGUL and previous == _HANGUL)
+
+        if max_width and line and breakable and width + space_width + token_width > max_width:
+            lines.append(("".join(line), width))
+            line, width = [token], token_width
+        else:
+            line.append(pending + token)
+            width += space_width + token_width
+        pending = ""
+        previous = kind
+
+    lines.append(("".join(line), width))
+    return lines
+
+
+def block_width(lines):
+    """layout_lines() 결과 중 가장 긴 줄의 폭 (여러 줄을 한 덩어리로 정렬할 때 사용)."""
+    return max((width for _, width in lines), default=0.0)
+
+
+def get_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["cached"] = len(_advances)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def clear():
+    with _lock:
+        _advances.clear()
+        _stats.update({"hits": 0, "misses": 0})
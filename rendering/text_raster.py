@@ -0,0 +1,100 @@
+# rendering/text_raster.py
+# 래스터화한 텍스트(알파 마스크)를 보관하는 프로세스 전체 LRU 캐시입니다.
+# "32°", "N/A", "06:12", "3.1 m/s"처럼 영어/한국어 포스트와 여러 렌더링에 되풀이되는 문자열을
+# (폰트, 텍스트)마다 한 번만 래스터화하고, 그릴 때는 요소 위치에 글자색을 마스크로 붙여 넣습니다.
+# 마스크는 글자색과 무관하므로 같은 폰트/텍스트라면 색이 달라도 같은 항목을 씁니다.
+# 붙여 넣기는 ImageDraw.text가 내부에서 하는 것과 같은 "마스크를 통한 색 채우기"라서 결과는 직접 그린 것과 같습니다.
+# 보관 용량(마스크 바이트 합)은 TEXT_RASTER_CACHE_MB로 제한하며, 넘으면 가장 오래 쓰지 않은 항목부터 버립니다.
+
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+from config import TEXT_RASTER_CACHE_MB
+
+_masks = OrderedDict()   # (폰트 객체, 텍스트) -> (L 마스크 또는 None, (x 오프셋, y 오프셋))
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def _rasterize(font, text):
+    """텍스트를 L 마스크로 그려 (마스크, 그리는 위치 기준 오프셋)을 반환합니다. 잉크가 없으면 마스크는 None."""
+    left, top, right, bottom = font.getbbox(text)
+    if right <= left or bottom <= top:
+        return None, (0, 0)
+    mask = Image.new("L", (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask, (left, top)
+
+
+def _mask_bytes(mask):
+    return mask.width * mask.height if mask is not None else 0
+
+
+def get_mask(font, text):
+    """(폰트, 텍스트)의 (마스크, 오프셋)을 캐시에서 반환하고, 없으면 래스터화해 보관합니다."""
+    key = (font, text)
+    with _lock:
+        cached = _masks.get(key)
+        if cached is not None:
+            _masks.move_to_end(key)
+            _stats["hits"] += 1
+            return cached
+
+    entry = _rasterize(font, text)
+    limit = TEXT_RASTER_CACHE_MB * 1024 * 1024
+    with _lock:
+        _stats["misses"] += 1
+        if key not in _masks:
+            _masks[key] = entry
+            _stats["bytes"] += _mask_bytes(entry[0])
+        while _stats["bytes"] > limit and len(_masks) > 1:
+            _, (mask, _) = _masks.popitem(last=False)
+            _stats["bytes"] -= _mask_bytes(mask)
+            _stats["evictions"] += 1
+    return entry
+
+
+def draw(image, xy, text, fill, font):
+    """
+    한 줄 텍스트를 image의 정수 좌표 xy(ImageDraw.text의 기본 기준점)에 fill 색으로 그립니다.
+    좌표가 정수가 아니면 글리프 위치가 소수점 단위로 달라지므로 캐시를 거치지 않고 바로 그립니다.
+    """
+    x, y = xy
+    if x != int(x) or y != int(y):
+        ImageDraw.Draw(image).text(xy, text, fill=fill, font=font)
+        return
+    mask, (dx, dy) = get_mask(font, text)
+    if mask is not None:
+        image.paste(fill, (int(x) + dx, int(y) + dy, int(x) + dx + mask.width, int(y) + dy + mask.height), mask)
+
+
+def get_stats():
+    """적중/미스/버린 횟수, 적중률, 보관 중인 마스크 수와 용량(바이트)을 반환합니다."""
+    with _lock:
+        stats = dict(_stats)
+        stats["cached"] = len(_masks)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def print_stats():
+    stats = get_stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    print(f" -> 텍스트 래스터 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회, 버림 {stats['evictions']}회, "
+          f"보관 {stats['cached']}개 ({stats['bytes'] / 1024:.0f}KB, 적중률 {stats['hit_rate']:.0%})")
+
+
+def reset_stats():
+    with _lock:
+        _stats.update({"hits": 0, "misses": 0, "evictions": 0})
+
+
+def clear():
+    """보관 중인 마스크를 모두 비웁니다."""
+    with _lock:
+        _masks.clear()
+        _stats["bytes"] = 0